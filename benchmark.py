@@ -0,0 +1,612 @@
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+import snapshots
+import spatial
+import strokes
+from storage import Database, DURABILITY_PROFILES
+
+LOG_PAGE_SIZE = 60  # work_tracker.LOG_PAGE_SIZE; importing the app pulls in tkinter
+CATEGORIES = ["Project Work", "Projects", "Job Applications", "Reading", "Exercise"]
+
+
+def create_database(path, durability="balanced"):
+    db = Database(path, durability)
+    db.logs.ensure_categories(CATEGORIES)
+    return db
+
+
+def fill_logs(db, count, rows_per_day=20):
+    rng = random.Random(count)
+    start = date.today()
+    batch = []
+    for i in range(count):
+        day = (start - timedelta(days=i // rows_per_day)).isoformat()
+        batch.append((rng.choice(CATEGORIES), day, rng.randint(60, 7200), rng.randint(0, 1), f"outcome {i}"))
+        if len(batch) == 10000:
+            db.logs.add_logs(batch)
+            batch.clear()
+    if batch:
+        db.logs.add_logs(batch)
+
+
+def legacy_log_grid(cursor):
+    # The per-date query pattern update_log_display used before LogRepository.grid.
+    cursor.execute("SELECT DISTINCT date FROM logs ORDER BY date DESC")
+    dates = [row[0] for row in cursor.fetchall()]
+    rows = []
+    outcomes = {}
+    for log_date in dates:
+        cursor.execute("""
+            SELECT c.name, SUM(l.time_spent), MAX(l.completed)
+            FROM logs l
+            JOIN categories c ON l.name = c.name
+            WHERE l.date = ?
+            GROUP BY c.name
+        """, (log_date,))
+        rows.append((log_date, {row[0]: (row[1], row[2]) for row in cursor.fetchall()}))
+        cursor.execute("""
+            SELECT c.name, l.outcome
+            FROM logs l
+            JOIN categories c ON l.name = c.name
+            WHERE l.date = ?
+            ORDER BY l.id
+        """, (log_date,))
+        for name, outcome in cursor.fetchall():
+            outcomes[(log_date, name)] = outcome or "No outcome"
+    return rows, outcomes
+
+
+def timed(func, *args, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def bench_log_grid(sizes=(10_000, 100_000, 1_000_000), legacy_limit=100_000):
+    # The legacy pattern issues two queries per date, so it is only timed on
+    # the smaller databases.
+    print("log grid refresh (best of 3)")
+    print(f"{'rows':>10} {'dates':>8} {'legacy':>10} {'single':>10} {'page':>10}")
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            db = create_database(os.path.join(tmp, "bench.db"))
+            fill_logs(db, size)
+            rows, _ = db.logs.grid()
+            legacy = f"{timed(legacy_log_grid, db.conn.cursor()) * 1000:.1f}ms" if size <= legacy_limit else "skipped"
+            single = timed(db.logs.grid)
+            page = timed(lambda: db.logs.grid(limit=LOG_PAGE_SIZE))
+            print(f"{size:>10} {len(rows):>8} {legacy:>10} {single * 1000:>8.1f}ms {page * 1000:>8.1f}ms")
+            db.close()
+
+
+def bench_write_latency(count=500):
+    # One committed insert per call, the way each pen stroke is saved.
+    print(f"write latency per committed insert ({count} inserts)")
+    print(f"{'profile':>10} {'mean':>10} {'p95':>10} {'max':>10}")
+    for profile in DURABILITY_PROFILES:
+        with tempfile.TemporaryDirectory() as tmp:
+            db = create_database(os.path.join(tmp, "bench.db"), profile)
+            today = date.today().isoformat()
+            samples = []
+            for i in range(count):
+                start = time.perf_counter()
+                db.playground.add_shape("pen", i, i, i + 10, i + 10, "black", 2.0, today)
+                samples.append(time.perf_counter() - start)
+            db.close()
+        samples.sort()
+        mean = sum(samples) / count
+        p95 = samples[int(count * 0.95)]
+        print(f"{profile:>10} {mean * 1000:>8.3f}ms {p95 * 1000:>8.3f}ms {samples[-1] * 1000:>8.3f}ms")
+
+
+def random_stroke(rng, length):
+    x, y = rng.uniform(0, 1000), rng.uniform(0, 1000)
+    points = []
+    for _ in range(length):
+        x += rng.uniform(-2, 2)
+        y += rng.uniform(-2, 2)
+        points.append((x, y))
+    return points
+
+
+def bench_strokes(count=5000, length=200):
+    rng = random.Random(count)
+    raw = [random_stroke(rng, length) for _ in range(count)]
+    simplified = [strokes.simplify(points) for points in raw]
+    json_size = sum(len(json.dumps(strokes.flatten(points))) for points in raw)
+    float32_size = sum(len(points) * 8 for points in raw)
+    encoded_size = sum(len(strokes.encode(points)) for points in raw)
+    simplified_size = sum(len(strokes.encode(points)) for points in simplified)
+    kept = sum(len(points) for points in simplified) / (count * length)
+    print(f"pen stroke storage ({count} strokes x {length} points)")
+    print(f"  json text        {json_size / 1024:>10.1f} KiB")
+    print(f"  float32          {float32_size / 1024:>10.1f} KiB")
+    print(f"  int16 deltas     {encoded_size / 1024:>10.1f} KiB")
+    print(f"  simplified       {simplified_size / 1024:>10.1f} KiB ({kept:.0%} of points kept)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = create_database(os.path.join(tmp, "bench.db"))
+        today = date.today().isoformat()
+        with db.transaction():
+            for points in simplified:
+                db.playground.add_stroke(points, "black", 2.0, today)
+
+        def reload():
+            return [strokes.decode(element.points) for element in db.playground.elements_for_date(today)]
+
+        print(f"  reload + decode  {timed(reload) * 1000:>10.1f} ms")
+        db.close()
+
+
+def bench_stroke_capture(length=10_000, events_per_frame=16):
+    # Replays one long synthetic drag against a real canvas: the legacy
+    # handler read back and rewrote the whole line on every motion event,
+    # StrokeBuilder appends and redraws the tail segment once per frame.
+    import tkinter as tk
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"stroke capture needs a display: {e}")
+        return
+    root.withdraw()
+    canvas = tk.Canvas(root, width=1000, height=1000)
+    points = random_stroke(random.Random(length), length)
+
+    def legacy():
+        samples = []
+        item = canvas.create_line(*points[0], *points[0])
+        for x, y in points:
+            start = time.perf_counter()
+            canvas.coords(item, canvas.coords(item) + [x, y])
+            samples.append(time.perf_counter() - start)
+        canvas.delete(item)
+        return samples
+
+    def builder():
+        samples = []
+        stroke = strokes.StrokeBuilder(canvas, *points[0])
+        for i, (x, y) in enumerate(points):
+            start = time.perf_counter()
+            stroke.add(x, y)
+            if i % events_per_frame == 0:
+                stroke.flush()
+            samples.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        item, _ = stroke.finish()
+        samples.append(time.perf_counter() - start)
+        canvas.delete(item)
+        return samples
+
+    print(f"pen stroke capture ({length} motion events, flush every {events_per_frame})")
+    print(f"{'handler':>10} {'total':>10} {'worst':>10}")
+    for name, run in (("legacy", legacy), ("builder", builder)):
+        samples = run()
+        print(f"{name:>10} {sum(samples) * 1000:>8.1f}ms {max(samples) * 1000:>8.3f}ms")
+    root.destroy()
+
+
+def bench_playground_load(sizes=(1_000, 10_000, 50_000), span=20_000, view=(1200, 800)):
+    # Strokes scattered over a span x span infinite canvas. "load" is what
+    # load_playground_elements now does up front (read, decode, index);
+    # canvas items are then only created for the padded view, counted
+    # with the same tile snapping as refresh_viewport.
+    tile, margin = 512, 256  # work_tracker.PLAYGROUND_TILE / PLAYGROUND_MARGIN
+    print(f"playground load ({span}x{span} canvas, {view[0]}x{view[1]} view)")
+    print(f"{'elements':>10} {'load':>10} {'memory':>10} {'on canvas':>10}")
+    for size in sizes:
+        rng = random.Random(size)
+        with tempfile.TemporaryDirectory() as tmp:
+            db = create_database(os.path.join(tmp, "bench.db"))
+            today = date.today().isoformat()
+            with db.transaction():
+                for _ in range(size):
+                    x, y = rng.uniform(0, span), rng.uniform(0, span)
+                    points = [(px + x, py + y) for px, py in random_stroke(rng, 50)]
+                    db.playground.add_stroke(points, "black", 2.0, today)
+
+            def load():
+                index, records = spatial.GridIndex(), {}
+                for element in db.playground.elements_for_date(today):
+                    geometry = spatial.element_geometry("pen", strokes.decode(element.points), element.width)
+                    index.insert(element.id, *geometry)
+                    records[element.id] = ("pen", geometry[1], element.color, element.width, None)
+                return index, records
+
+            elapsed = timed(load, repeat=1)
+            # tracemalloc slows allocation down, so memory is a separate pass.
+            tracemalloc.start()
+            index, records = load()
+            memory = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            box = ((0 - margin) // tile * tile, (0 - margin) // tile * tile,
+                   ((view[0] + margin) // tile + 1) * tile, ((view[1] + margin) // tile + 1) * tile)
+            shown = len(index.query_rect(box))
+            print(f"{size:>10} {elapsed * 1000:>8.1f}ms {memory / 2 ** 20:>7.1f}MiB {shown:>10}")
+            db.close()
+
+
+def bench_snapshots(sizes=(1_000, 10_000, 50_000)):
+    # Opening a day from its rows (decode every stroke) against opening it
+    # from a valid snapshot (hash check + display list).
+    print("playground day open (best of 3)")
+    print(f"{'elements':>10} {'rows':>10} {'snapshot':>10} {'build':>10} {'size':>10} {'thumb':>8}")
+    for size in sizes:
+        rng = random.Random(size)
+        with tempfile.TemporaryDirectory() as tmp:
+            db = create_database(os.path.join(tmp, "bench.db"))
+            today = date.today().isoformat()
+            with db.transaction():
+                for _ in range(size):
+                    x, y = rng.uniform(0, 5000), rng.uniform(0, 5000)
+                    db.playground.add_stroke([(px + x, py + y) for px, py in random_stroke(rng, 50)], "black", 2.0, today)
+
+            def from_rows():
+                return snapshots.records_from_rows(db.playground.elements_for_date(today))
+
+            def from_snapshot():
+                snapshot = db.playground.snapshot(today)
+                assert snapshot.content_hash == db.playground.content_hash(today)
+                return list(snapshots.read_display_list(snapshot.display_list))
+
+            start = time.perf_counter()
+            snapshot, _ = db.playground.current_snapshot(today)
+            build = time.perf_counter() - start
+            db.playground.save_snapshot(today, snapshot)
+            rows, cached = timed(from_rows), timed(from_snapshot)
+            print(f"{size:>10} {rows * 1000:>8.1f}ms {cached * 1000:>8.1f}ms {build * 1000:>8.1f}ms "
+                  f"{len(snapshot.display_list) / 1024:>7.1f}KiB {len(snapshot.thumbnail):>7}B")
+            db.close()
+
+
+def rss_bytes():
+    # Resident set size, from /proc where available.
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+class NullCardHandlers:
+    def edit_task(self, task_id, text):
+        pass
+
+    def toggle_task_completion(self, task_id, value):
+        pass
+
+    toggle_very_important = toggle_semi_important = toggle_task_completion
+
+    def start_task_drag(self, event, task_id):
+        pass
+
+    on_task_drag = stop_task_drag = start_task_drag
+
+
+def bench_task_cards(sizes=(100, 1_000, 5_000), frames=60):
+    # Builds a board of each size in both card modes, then times frames
+    # that drag one card and let Tk redraw.
+    import tkinter as tk
+    import task_cards
+    from storage import Task
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"task card benchmark needs a display: {e}")
+        return
+    root.geometry("1000x700")
+    print(f"task cards ({frames} drag frames)")
+    print(f"{'mode':>8} {'cards':>7} {'build':>10} {'frame':>10} {'memory':>10}")
+    for size in sizes:
+        tasks = [Task(i, f"Task {i} with a few words of text", "2024-01-01", (i % 40) * 25, (i // 40) * 30, 0, i % 3 == 0, i % 5 == 0)
+                 for i in range(size)]
+        for name, board_class in (("widget", task_cards.WidgetCardBoard), ("canvas", task_cards.CanvasCardBoard)):
+            canvas = tk.Canvas(root, bg="grey")
+            canvas.pack(fill=tk.BOTH, expand=True)
+            root.update()
+            before = rss_bytes()
+            start = time.perf_counter()
+            board = board_class(canvas, NullCardHandlers())
+            board.sync(tasks)
+            root.update()
+            build = time.perf_counter() - start
+            memory = rss_bytes()
+            start = time.perf_counter()
+            for _ in range(frames):
+                board.move(0, 1, 1)
+                root.update_idletasks()
+            frame = (time.perf_counter() - start) / frames
+            used = f"{(memory - before) / 2 ** 20:>7.1f}MiB" if memory and before else "n/a"
+            print(f"{name:>8} {size:>7} {build * 1000:>8.1f}ms {frame * 1000:>8.2f}ms {used:>10}")
+            board.clear()
+            canvas.destroy()
+    root.destroy()
+
+
+def stub_tk():
+    # Replaces every Tk module work_tracker and task_cards use with mocks,
+    # so the app can be constructed without a display and the timings are
+    # the Python and database work alone. Geometry queries return a fixed
+    # 1200x800 view.
+    from unittest import mock
+    tk = mock.MagicMock()
+    canvas = tk.Canvas.return_value
+    canvas.canvasx.side_effect = float
+    canvas.canvasy.side_effect = float
+    canvas.winfo_width.return_value = 1200
+    canvas.winfo_height.return_value = 800
+    tkfont = mock.MagicMock()
+    tkfont.Font.return_value.measure.return_value = 60
+    tkfont.Font.return_value.metrics.return_value = 15
+    return [mock.patch("work_tracker.tk", tk), mock.patch("work_tracker.ttk"), mock.patch("work_tracker.messagebox"),
+            mock.patch("work_tracker.simpledialog"), mock.patch("work_tracker.tkfont", tkfont), mock.patch("task_cards.tk", tk)]
+
+
+def bench_startup(logs=100_000, tasks=300, completed=2_000, elements=5_000, runs=5):
+    # Import time of the GUI module, then WorkTrackerApp construction with a
+    # stubbed Tk: "window" is the work done before mainloop can show the
+    # window, the rest is deferred or runs on first visit to each tab.
+    # "all up front" is a separate construction that runs every step at
+    # once, the way the app started before tabs were built lazily.
+    # Set WORK_TRACKER_EXE to a frozen build (see build.txt) to also time
+    # launching it: the GUI against the benchmark database, until it logs
+    # that startup finished (it is then terminated), and the command line
+    # ("status").
+    import subprocess
+    from unittest import mock
+    from read_executor import ReadExecutor
+    from write_behind import WriteBehind
+
+    imports = []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, "-c", "import time; s = time.perf_counter(); import work_tracker; print(time.perf_counter() - s)"],
+                             capture_output=True, text=True, check=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+        imports.append(float(out.stdout))
+    print(f"startup ({logs} log rows, {tasks} open tasks, {completed} completed, {elements} strokes)")
+    print(f"{'import work_tracker':>24} {sorted(imports)[runs // 2] * 1000:>8.1f}ms")
+
+    import work_tracker
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        db = create_database(path)
+        fill_logs(db, logs)
+        rng = random.Random(tasks)
+        today = date.today().isoformat()
+        done = (date.today() - timedelta(minutes=30)).isoformat()
+        with db.transaction():
+            for i in range(tasks + completed):
+                task_id = db.tasks.add(f"Task {i}", today, (i % 40) * 25, (i // 40) * 30)
+                if i >= tasks:
+                    db.tasks.set_completed(task_id, True, done)
+            for _ in range(elements):
+                x, y = rng.uniform(0, 3000), rng.uniform(0, 3000)
+                db.playground.add_stroke([(px + x, py + y) for px, py in random_stroke(rng, 50)], "black", 2.0, today)
+
+        def start_app(eager):
+            # Fresh mocks and background threads each time, so neither call
+            # history nor reads left over from an earlier run skew it.
+            patches = stub_tk()
+            for patch in patches:
+                patch.start()
+            writer = WriteBehind(path)
+            reader = ReadExecutor(path)
+            try:
+                start = time.perf_counter()
+                app = work_tracker.WorkTrackerApp(mock.MagicMock(), db, writer, reader)
+                timings = [("window", time.perf_counter() - start)]
+                for name, step in (("deferred", app.finish_startup), ("Notes tab", app.build_notes_tab),
+                                   ("Completed Tasks tab", app.build_completed_tab), ("Play Ground tab", app.build_playground_tab)):
+                    if not eager:
+                        start = time.perf_counter()
+                    step()
+                    if not eager:
+                        timings.append((name, time.perf_counter() - start))
+                return [("all up front", time.perf_counter() - start)] if eager else timings
+            finally:
+                reader.close()
+                writer.close()
+                for patch in patches:
+                    patch.stop()
+
+        steps = {}
+        for _ in range(runs):
+            for eager in (False, True):
+                for name, elapsed in start_app(eager):
+                    steps.setdefault(name, []).append(elapsed)
+        db.close()
+        for name, samples in steps.items():
+            print(f"{name:>24} {sorted(samples)[runs // 2] * 1000:>8.1f}ms")
+
+        exe = os.environ.get("WORK_TRACKER_EXE")
+        if exe:
+            env = dict(os.environ, WORK_TRACKER_DB=path)
+            for label, launch in (("frozen launch (GUI)", lambda: time_gui_launch(exe, env)),
+                                  ("frozen launch (status)", lambda: subprocess.run([exe, "status"], env=env, capture_output=True, check=True))):
+                launches = []
+                for _ in range(runs):
+                    start = time.perf_counter()
+                    launch()
+                    launches.append(time.perf_counter() - start)
+                print(f"{label:>24} {sorted(launches)[runs // 2] * 1000:>8.1f}ms")
+
+
+def time_gui_launch(exe, env, timeout=60):
+    # Starts the GUI and returns once its log (next to the executable) shows
+    # "Startup finished"; the process is then terminated from outside.
+    import subprocess
+    log_path = os.path.join(os.path.dirname(os.path.abspath(exe)), "work_tracker.log")
+    offset = os.path.getsize(log_path) if os.path.exists(log_path) else 0
+    process = subprocess.Popen([exe], env=env)
+    try:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if os.path.exists(log_path):
+                with open(log_path, "rb") as log:
+                    # A rollover starts the file again from the top.
+                    log.seek(offset if os.path.getsize(log_path) >= offset else 0)
+                    if b"Startup finished" in log.read():
+                        return
+            if process.poll() is not None:
+                raise RuntimeError(f"{exe} exited with status {process.returncode} before finishing startup")
+            time.sleep(0.005)
+        raise RuntimeError(f"{exe} did not finish startup within {timeout}s")
+    finally:
+        process.terminate()
+        process.wait()
+
+
+# Run in a child process by bench_session_recovery: starts a session in the
+# GUI, waits up to a second for its first checkpoint, then dies without any
+# cleanup, as a crash or power cut would.
+CRASH_AFTER_START = """
+import os, sys, time
+from unittest import mock
+import benchmark, work_tracker
+from read_executor import ReadExecutor
+from write_behind import WriteBehind
+path = sys.argv[1]
+for patch in benchmark.stub_tk():
+    patch.start()
+db = benchmark.create_database(path)
+writer, reader = WriteBehind(path), ReadExecutor(path)
+app = work_tracker.WorkTrackerApp(mock.MagicMock(), db, writer, reader)
+app.toggle_timer(benchmark.CATEGORIES[0])
+deadline = time.monotonic() + 1
+while time.monotonic() < deadline and (db.sessions.current() or (None,) * 5)[4] is None:
+    time.sleep(0.01)
+os._exit(9)
+"""
+
+
+def bench_session_recovery(downtime=3600):
+    # Restores a session whose GUI was killed right after starting it, as if
+    # `downtime` seconds later. Exits with status 1 if the restored timer is
+    # running or counts the time the app was down.
+    import subprocess
+    from unittest import mock
+    from read_executor import ReadExecutor
+    from write_behind import WriteBehind
+    import work_tracker
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        subprocess.run([sys.executable, "-c", CRASH_AFTER_START, path], capture_output=True,
+                       cwd=os.path.dirname(os.path.abspath(__file__)))
+        patches = stub_tk()
+        for patch in patches:
+            patch.start()
+        db = create_database(path)
+        writer, reader = WriteBehind(path), ReadExecutor(path)
+        try:
+            app = work_tracker.WorkTrackerApp(mock.MagicMock(), db, writer, reader)
+            now = time.time() + downtime
+            with mock.patch.object(work_tracker.time, "time", lambda: now):
+                app.restore_session()
+            restored, running = app.session_timer.seconds(), app.session_timer.running
+        finally:
+            reader.close()
+            writer.close()
+            db.close()
+            for patch in patches:
+                patch.stop()
+    state = "running" if running else "paused"
+    print(f"session recovery: killed right after start, restored {downtime}s later as {state} at {restored}s")
+    if running or restored >= downtime:
+        print("session recovery check failed: the restored timer counts time the app was down")
+        sys.exit(1)
+
+
+# Repository calls on hot paths and the index their SQL must use. The
+# statements are captured while the call runs, so the check follows the
+# code rather than a copy of its SQL. Calls that write come last.
+QUERY_PLANS = [
+    ("logs.grid", lambda db, day: db.logs.grid(limit=LOG_PAGE_SIZE), "SEARCH daily_rollup USING PRIMARY KEY"),
+    ("logs.grid before", lambda db, day: db.logs.grid(before=day, limit=LOG_PAGE_SIZE), "SEARCH daily_rollup USING PRIMARY KEY (date<?)"),
+    ("logs.grid search", lambda db, day: db.logs.grid(search_date=day), "SEARCH daily_rollup USING PRIMARY KEY (date=?)"),
+    ("logs.entries_for_date", lambda db, day: db.logs.entries_for_date(day), "idx_logs_date_name"),
+    ("logs.outcomes_for_date", lambda db, day: db.logs.outcomes_for_date(day), "idx_logs_date_name"),
+    ("logs.day_totals", lambda db, day: db.logs.day_totals(day), "SEARCH daily_rollup USING PRIMARY KEY"),
+    ("logs.outcomes_logged", lambda db, day: db.logs.outcomes_logged(day), "idx_logs_date_name"),
+    ("tasks.open_tasks", lambda db, day: db.tasks.open_tasks(day), "idx_tasks_created_completed"),
+    ("tasks.important_tasks", lambda db, day: db.tasks.important_tasks(day), "idx_tasks_created_completed"),
+    ("tasks.completed_tasks", lambda db, day: db.tasks.completed_tasks(), "idx_tasks_completed_time"),
+    ("tasks.completed_tasks after", lambda db, day: db.tasks.completed_tasks(after=(f"{day}T00:00:00", 1)),
+     "SEARCH task_archive USING INDEX idx_task_archive_completed_time"),
+    ("tasks.completion_times", lambda db, day: db.tasks.completion_times(), "COVERING INDEX idx_tasks_completed_time"),
+    ("playground.elements_for_date", lambda db, day: db.playground.elements_for_date(day), "idx_playground_fingerprint"),
+    ("playground.content_hash", lambda db, day: db.playground.content_hash(day), "COVERING INDEX idx_playground_fingerprint"),
+    ("playground.drawn_dates", lambda db, day: db.playground.drawn_dates(14), "COVERING INDEX idx_playground_fingerprint"),
+    ("playground.undo", lambda db, day: db.playground.undo(day), "idx_playground_journal_date"),
+    ("playground.redo", lambda db, day: db.playground.redo(day), "idx_playground_trash_journal"),
+    ("logs.delete_category", lambda db, day: db.logs.delete_category("Reading"), "idx_logs_name"),
+]
+
+
+def traced_statements(db, call):
+    statements = []
+    db.conn.set_trace_callback(statements.append)
+    try:
+        call()
+    finally:
+        db.conn.set_trace_callback(None)
+    # Trigger programs are reported as "-- TRIGGER ..." lines and repeat
+    # the statement that fired them once per row.
+    return [sql for sql in dict.fromkeys(statements)
+            if not sql.lstrip().startswith("--") and sql.split()[0].upper() not in ("BEGIN", "COMMIT", "ROLLBACK")]
+
+
+def check_query_plans(db, day):
+    failures = []
+    for name, call, index in QUERY_PLANS:
+        plans = [" | ".join(row[3] for row in db.conn.execute(f"EXPLAIN QUERY PLAN {sql}"))
+                 for sql in traced_statements(db, lambda: call(db, day))]
+        if not any(index in plan for plan in plans):
+            failures.append(f"{name}: expected {index}, got:\n    " + "\n    ".join(plans))
+    return failures
+
+
+def bench_query_plans(logs=10_000):
+    # Exits with status 1 if any hot query stopped using its index.
+    day = date.today().isoformat()
+    with tempfile.TemporaryDirectory() as tmp:
+        db = create_database(os.path.join(tmp, "bench.db"))
+        fill_logs(db, logs)
+        task_id = db.tasks.add("Task", day)
+        db.tasks.set_completed(task_id, True, f"{day}T00:00:00")
+        db.playground.add_stroke([(0, 0), (10, 10)], "black", 2.0, day)
+        failures = check_query_plans(db, day)
+        db.close()
+    for failure in failures:
+        print(f"query plan check failed: {failure}")
+    if failures:
+        sys.exit(1)
+    print(f"query plans: all {len(QUERY_PLANS)} repository calls use their index")
+
+
+BENCHMARKS = {
+    "query_plans": bench_query_plans,
+    "log_grid": bench_log_grid,
+    "write_latency": bench_write_latency,
+    "strokes": bench_strokes,
+    "stroke_capture": bench_stroke_capture,
+    "playground_load": bench_playground_load,
+    "snapshots": bench_snapshots,
+    "task_cards": bench_task_cards,
+    "startup": bench_startup,
+    "session_recovery": bench_session_recovery,
+}
+
+if __name__ == "__main__":
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        BENCHMARKS[name]()
@@ -0,0 +1,175 @@
+import argparse
+import csv
+import json
+import logging
+import sys
+import time
+from datetime import date, timedelta
+
+from config import LOG_LEVEL, LOG_LEVELS, configure_logging, get_db_path, open_database
+
+# Headless entry point for scripts and hotkeys:
+#
+#   python cli.py start "Projects"
+#   python cli.py stop --outcome "Sent two applications"
+#   python cli.py pause | resume | status
+#   python cli.py report [--date 2024-05-01 | --days 7]
+#   python cli.py export [--format csv|json] [--since 2024-01-01] [--output file]
+#   python cli.py rebuild-rollup
+#
+# It shares the database and the active_session row with the GUI but never
+# imports tkinter, so a command runs in tens of milliseconds.
+
+
+def format_duration(seconds):
+    return f"{seconds // 3600}h {seconds % 3600 // 60:02d}m" if seconds >= 3600 else f"{seconds // 60}m {seconds % 60:02d}s"
+
+
+def cmd_start(db, args):
+    if not db.logs.category_exists(args.category):
+        print(f"Unknown category '{args.category}'. Categories: {', '.join(db.logs.categories())}", file=sys.stderr)
+        return 1
+    now = time.time()
+    if db.sessions.current() is not None:
+        # Switching categories logs the running session, as the GUI does.
+        session, elapsed = db.sessions.stop(now, date.today().isoformat(), "")
+        print(f"Stopped '{session.category}' after {format_duration(elapsed)}")
+    db.sessions.start(args.category, now)
+    logging.info("Started timer for '%s' from the command line", args.category)
+    print(f"Tracking '{args.category}'")
+    return 0
+
+
+def cmd_stop(db, args):
+    stopped = db.sessions.stop(time.time(), date.today().isoformat(), (args.outcome or "").strip())
+    if stopped is None:
+        print("No timer is running", file=sys.stderr)
+        return 1
+    session, elapsed = stopped
+    logging.info("Logged time for '%s': %s seconds, outcome: %s", session.category, elapsed, args.outcome)
+    print(f"Logged {format_duration(elapsed)} for '{session.category}'")
+    return 0
+
+
+def cmd_pause(db, args):
+    if not db.sessions.pause(time.time()):
+        print("No running timer to pause", file=sys.stderr)
+        return 1
+    print("Paused")
+    return 0
+
+
+def cmd_resume(db, args):
+    if not db.sessions.resume(time.time()):
+        print("No paused timer to resume", file=sys.stderr)
+        return 1
+    print("Resumed")
+    return 0
+
+
+def cmd_status(db, args):
+    session = db.sessions.current()
+    if session is None:
+        print("Idle")
+        return 0
+    state = "Paused" if session.resumed_at is None else "Tracking"
+    print(f"{state} '{session.category}' for {format_duration(session.elapsed(time.time()))} (started {session.started_at})")
+    return 0
+
+
+def cmd_report(db, args):
+    if args.date:
+        rows, _ = db.logs.grid(args.date)
+    else:
+        since = (date.today() - timedelta(days=args.days - 1)).isoformat()
+        rows = [(log_date, cells) for log_date, cells in db.logs.grid(limit=args.days)[0] if log_date >= since]
+    if not rows:
+        print("No time logged")
+        return 0
+    total = 0
+    for log_date, cells in rows:
+        day_total = sum(time_spent for time_spent, _ in cells.values())
+        total += day_total
+        print(f"{log_date}  {format_duration(day_total)}")
+        for name, (time_spent, completed) in sorted(cells.items()):
+            print(f"  {'✓' if completed else '✗'} {name}: {format_duration(time_spent)}")
+    print(f"Total: {format_duration(total)}")
+    return 0
+
+
+def cmd_export(db, args):
+    columns = ("date", "category", "time_spent", "completed", "outcome")
+    if not args.output and sys.stdout is None:
+        # A --windowed build has no console; see build.txt for a console one.
+        logging.error("export needs --output when there is no console to write to")
+        return 2
+    rows = db.logs.export_rows(args.since)
+    out = open(args.output, "w", newline="", encoding="utf-8") if args.output else sys.stdout
+    try:
+        if args.format == "json":
+            json.dump([dict(zip(columns, row)) for row in rows], out, indent=2)
+            out.write("\n")
+        else:
+            writer = csv.writer(out)
+            writer.writerow(columns)
+            writer.writerows(rows)
+    finally:
+        if args.output:
+            out.close()
+    return 0
+
+
+def cmd_rebuild_rollup(db, args):
+    # Recomputes daily_rollup from logs, for a database edited behind the
+    # triggers' back (schema.py --rebuild-rollup does the same).
+    db.logs.rebuild_rollup()
+    logging.info("Rebuilt daily_rollup from the command line")
+    print("Rebuilt the daily totals from the log")
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="work_tracker", description="Work tracker without the window.")
+    parser.add_argument("--db", help="database path (default: the one the GUI uses)")
+    parser.add_argument("--log-level", default=LOG_LEVEL, type=str.upper, choices=LOG_LEVELS, help=f"(default {LOG_LEVEL})")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    start = commands.add_parser("start", help="start timing a category")
+    start.add_argument("category")
+    start.set_defaults(func=cmd_start)
+
+    stop = commands.add_parser("stop", help="stop the timer and log the time")
+    stop.add_argument("--outcome", default="")
+    stop.set_defaults(func=cmd_stop)
+
+    commands.add_parser("pause", help="pause the timer").set_defaults(func=cmd_pause)
+    commands.add_parser("resume", help="resume a paused timer").set_defaults(func=cmd_resume)
+    commands.add_parser("status", help="show the running timer").set_defaults(func=cmd_status)
+
+    report = commands.add_parser("report", help="time logged per day and category")
+    report.add_argument("--date", help="a single day, YYYY-MM-DD")
+    report.add_argument("--days", type=int, default=7, help="the last N days (default 7)")
+    report.set_defaults(func=cmd_report)
+
+    export = commands.add_parser("export", help="export log rows")
+    export.add_argument("--format", choices=("csv", "json"), default="csv")
+    export.add_argument("--since", help="first date to include, YYYY-MM-DD")
+    export.add_argument("--output", help="file to write (default: stdout)")
+    export.set_defaults(func=cmd_export)
+
+    commands.add_parser("rebuild-rollup", help="recompute the daily totals from the log").set_defaults(func=cmd_rebuild_rollup)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    configure_logging(args.log_level)
+    db = open_database(args.db or get_db_path())
+    try:
+        return args.func(db, args)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
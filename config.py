@@ -0,0 +1,116 @@
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import shutil
+import sqlite3
+import sys
+
+from storage import Database, DEFAULT_DURABILITY
+
+# Paths, logging and database setup shared by the GUI (work_tracker.py) and
+# the command line (cli.py). Nothing here imports tkinter or touches the
+# disk at import time.
+
+DEFAULT_CATEGORIES = ["Project Work", "Projects", "Job Applications"]
+# strict, balanced or fast; see storage.DURABILITY_PROFILES
+DURABILITY = os.environ.get("WORK_TRACKER_DURABILITY", DEFAULT_DURABILITY)
+# One of LOG_LEVELS; can be changed while running with set_log_level. An
+# unknown value falls back to INFO with a warning in the log.
+LOG_LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR")
+LOG_LEVEL = os.environ.get("WORK_TRACKER_LOG_LEVEL", "INFO").upper()
+# work_tracker.log rolls over to work_tracker.log.1 .. .3 at this size.
+LOG_MAX_BYTES = 1024 * 1024
+LOG_BACKUPS = 3
+# Database to open instead of the one get_db_path finds; benchmark.py uses
+# it to launch a frozen build against a scratch database.
+DB_PATH = os.environ.get("WORK_TRACKER_DB")
+
+
+def get_base_path():
+    if getattr(sys, 'frozen', False):
+        return os.path.dirname(sys.executable)
+    else:
+        return os.path.dirname(os.path.abspath(__file__))
+
+
+def get_db_path():
+    if DB_PATH:
+        return DB_PATH
+    base_path = get_base_path()
+    db_name = "work_tracker.db"
+    db_path = os.path.join(base_path, db_name)
+    
+    debug_db_path = r"D:\projects\work tracker\work_tracker.db"
+    if os.path.exists(debug_db_path) and not getattr(sys, 'frozen', False):
+        return debug_db_path
+    
+    if getattr(sys, 'frozen', False):
+        user_db_path = os.path.join(os.path.expanduser("~"), db_name)
+        if not os.path.exists(user_db_path) and os.path.exists(db_path):
+            try:
+                shutil.copy(db_path, user_db_path)
+                print(f"Copied database to {user_db_path}")
+                logging.info("Copied database to %s", user_db_path)
+            except Exception as e:
+                print(f"Failed to copy database to user directory: {e}")
+                logging.error("Failed to copy database to user directory: %s", e)
+        return user_db_path
+    
+    return db_path
+
+
+class LocalQueueHandler(logging.handlers.QueueHandler):
+    # The stock prepare() merges msg % args on the caller's thread so the
+    # record can be pickled. These records never leave the process, so they
+    # are queued as they are and the listener does the formatting. Log
+    # values rather than objects that are changed right after the call.
+
+    def prepare(self, record):
+        return record
+
+
+def configure_logging(level=LOG_LEVEL):
+    # Callers only put records on a queue; a listener thread formats them
+    # and does the file I/O. Records below the root level are dropped before
+    # their message is ever built, so debug calls cost a level check.
+    handler = logging.handlers.RotatingFileHandler(
+        os.path.join(get_base_path(), "work_tracker.log"), maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUPS,
+        encoding="utf-8", delay=True)
+    handler.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(message)s"))
+    records = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(records, handler)
+    listener.start()
+    # Stopping the listener writes out whatever is still queued.
+    atexit.register(listener.stop)
+    root = logging.getLogger()
+    root.addHandler(LocalQueueHandler(records))
+    if level not in LOG_LEVELS:
+        set_log_level("INFO")
+        logging.warning("Unknown log level %r, using INFO (expected one of %s)", level, ", ".join(LOG_LEVELS))
+    else:
+        set_log_level(level)
+    return listener
+
+
+def set_log_level(level):
+    logging.getLogger().setLevel(level.upper() if isinstance(level, str) else level)
+
+
+def open_database(db_path, durability=DURABILITY):
+    try:
+        db = Database(db_path, durability)
+    except (sqlite3.Error, ValueError) as e:
+        logging.error("Database setup error: %s", e)
+        print(f"Database setup error: {e}")
+        sys.exit(1)
+    
+    try:
+        if db.logs.ensure_categories(DEFAULT_CATEGORIES):
+            logging.info("Inserted default categories %s", DEFAULT_CATEGORIES)
+    except sqlite3.Error as e:
+        logging.error("Error inserting default categories: %s", e)
+        print(f"Error inserting default categories: {e}")
+        sys.exit(1)
+    return db
@@ -0,0 +1,80 @@
+import logging
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from storage import Database
+
+
+class ReadExecutor:
+    # Runs read queries on a small thread pool, each worker with its own
+    # read-only connection (WAL lets them read while the UI or the
+    # write-behind thread writes).
+    #
+    # Every request belongs to a channel such as "outcomes" or "log_grid".
+    # A new request on a channel supersedes the previous one: if the old one
+    # has not started it is cancelled, and if it has, its result is dropped
+    # by drain() instead of being shown. This way rapid day navigation or
+    # repeated searches only ever paint the latest answer. Like WriteBehind,
+    # callbacks run on the UI thread from drain().
+
+    def __init__(self, path, workers=2):
+        self.path = path
+        self.local = threading.local()
+        self.connections = []
+        self.lock = threading.Lock()
+        self.generations = {}
+        self.futures = {}
+        self.results = queue.SimpleQueue()
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="db-read",
+                                       initializer=self.open_connection)
+
+    def open_connection(self):
+        self.local.db = Database(self.path, read_only=True)
+        with self.lock:
+            self.connections.append(self.local.db)
+
+    def submit(self, channel, query, on_done, on_error=None):
+        with self.lock:
+            generation = self.generations.get(channel, 0) + 1
+            self.generations[channel] = generation
+            previous = self.futures.get(channel)
+            if previous:
+                previous.cancel()
+            self.futures[channel] = self.pool.submit(self.run, channel, generation, query, on_done, on_error)
+
+    def cancel(self, channel):
+        with self.lock:
+            self.generations[channel] = self.generations.get(channel, 0) + 1
+            previous = self.futures.pop(channel, None)
+            if previous:
+                previous.cancel()
+
+    def is_current(self, channel, generation):
+        with self.lock:
+            return self.generations.get(channel) == generation
+
+    def run(self, channel, generation, query, on_done, on_error):
+        if not self.is_current(channel, generation):
+            return
+        try:
+            result = query(self.local.db)
+        except Exception as e:
+            logging.error("Background read on %s failed: %s", channel, e)
+            self.results.put((channel, generation, on_error, e))
+        else:
+            self.results.put((channel, generation, on_done, result))
+
+    def drain(self):
+        while True:
+            try:
+                channel, generation, callback, value = self.results.get_nowait()
+            except queue.Empty:
+                return
+            if callback and self.is_current(channel, generation):
+                callback(value)
+
+    def close(self):
+        self.pool.shutdown(wait=True, cancel_futures=True)
+        for db in self.connections:
+            db.close()
@@ -0,0 +1,335 @@
+import logging
+import sqlite3
+import sys
+
+TABLES = {
+    "categories": """
+        CREATE TABLE categories (
+            name TEXT PRIMARY KEY
+        )
+    """,
+    "logs": """
+        CREATE TABLE logs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            date TEXT NOT NULL,
+            time_spent INTEGER,
+            completed INTEGER,
+            outcome TEXT,
+            FOREIGN KEY (name) REFERENCES categories(name)
+        )
+    """,
+    "tasks": """
+        CREATE TABLE tasks (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            task_text TEXT NOT NULL,
+            created_date TEXT NOT NULL,
+            x REAL NOT NULL DEFAULT 50,
+            y REAL NOT NULL DEFAULT 50,
+            completed INTEGER NOT NULL,
+            completed_time TEXT,
+            very_important INTEGER DEFAULT 0,
+            semi_important INTEGER DEFAULT 0
+        )
+    """,
+    "playground_elements": """
+        CREATE TABLE playground_elements (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            element_type TEXT NOT NULL,  -- 'line', 'square', 'circle', 'arrow', 'text'
+            x1 REAL NOT NULL,           -- Starting x-coordinate
+            y1 REAL NOT NULL,           -- Starting y-coordinate
+            x2 REAL,                    -- Ending x-coordinate (null for text)
+            y2 REAL,                    -- Ending y-coordinate (null for text)
+            color TEXT,                 -- Color of the element
+            width REAL,                 -- Line width or shape outline width
+            text TEXT,                  -- Text content for text elements
+            created_date TEXT NOT NULL  -- Date of creation
+        )
+    """,
+}
+
+
+def table_columns(conn, table):
+    return [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+
+
+def create_or_rebuild_table(conn, table, ddl):
+    existing = table_columns(conn, table)
+    if not existing:
+        conn.execute(ddl)
+        return
+    conn.execute(ddl.replace(f"CREATE TABLE {table}", f"CREATE TABLE {table}_new", 1))
+    expected = table_columns(conn, f"{table}_new")
+    if existing == expected:
+        conn.execute(f"DROP TABLE {table}_new")
+        return
+    shared = ", ".join(col for col in expected if col in existing)
+    conn.execute(f"INSERT INTO {table}_new ({shared}) SELECT {shared} FROM {table}")
+    conn.execute(f"DROP TABLE {table}")
+    conn.execute(f"ALTER TABLE {table}_new RENAME TO {table}")
+    logging.info("Rebuilt table %s from columns %s", table, existing)
+
+
+def migration_1_base_tables(conn):
+    # Databases created by earlier releases (or prepare_db.py) have no
+    # user_version; bring whatever layout they have up to the base schema.
+    for table, ddl in TABLES.items():
+        create_or_rebuild_table(conn, table, ddl)
+
+
+def migration_2_indexes(conn):
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_logs_date_name ON logs (date, name, time_spent, completed)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_logs_name ON logs (name)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_created_completed ON tasks (created_date, completed)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_completed_time ON tasks (completed, completed_time)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_playground_created_date ON playground_elements (created_date)")
+
+
+def migration_3_stroke_points(conn):
+    # Encoded polyline for pen strokes (see strokes.py); x1/y1/x2/y2 keep
+    # the first and last point.
+    conn.execute("ALTER TABLE playground_elements ADD COLUMN points BLOB")
+
+
+def migration_4_playground_journal(conn):
+    # Undo history for the playground. Rows taken out of playground_elements
+    # by an erase, a clear or an undone insert wait in playground_trash under
+    # their journal entry until it is undone, redone or pruned, so the main
+    # table only ever holds live elements.
+    conn.execute("""
+        CREATE TABLE playground_journal (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            created_date TEXT NOT NULL,
+            action TEXT NOT NULL,        -- 'insert', 'delete', 'move'
+            element_ids BLOB NOT NULL,   -- little-endian int64 element ids
+            dx REAL NOT NULL DEFAULT 0,  -- offset for 'move'
+            dy REAL NOT NULL DEFAULT 0,
+            undone INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+    conn.execute("CREATE INDEX idx_playground_journal_date ON playground_journal (created_date, undone, id)")
+    conn.execute("""
+        CREATE TABLE playground_trash (
+            id INTEGER PRIMARY KEY,
+            journal_id INTEGER NOT NULL,
+            element_type TEXT NOT NULL,
+            x1 REAL NOT NULL,
+            y1 REAL NOT NULL,
+            x2 REAL,
+            y2 REAL,
+            color TEXT,
+            width REAL,
+            text TEXT,
+            created_date TEXT NOT NULL,
+            points BLOB
+        )
+    """)
+    conn.execute("CREATE INDEX idx_playground_trash_journal ON playground_trash (journal_id)")
+
+
+def migration_5_playground_snapshots(conn):
+    # Cached display list and thumbnail per day (see snapshots.py).
+    conn.execute("""
+        CREATE TABLE playground_snapshots (
+            created_date TEXT PRIMARY KEY,
+            content_hash TEXT NOT NULL,
+            display_list BLOB NOT NULL,
+            thumbnail BLOB NOT NULL
+        )
+    """)
+    # Covers the content hash query so validating a snapshot never reads
+    # stroke blobs; it also serves every lookup by date, replacing
+    # idx_playground_created_date.
+    conn.execute("CREATE INDEX idx_playground_fingerprint ON playground_elements (created_date, id, x1, y1, x2, y2)")
+    conn.execute("DROP INDEX IF EXISTS idx_playground_created_date")
+
+
+def migration_6_task_archive(conn):
+    # Expired completed tasks are moved here instead of being deleted, so
+    # tasks only holds open and recently completed work. Rows keep their
+    # task id; the Completed Tasks tab pages through (completed_time, id).
+    conn.execute("""
+        CREATE TABLE task_archive (
+            id INTEGER PRIMARY KEY,
+            task_text TEXT NOT NULL,
+            created_date TEXT NOT NULL,
+            completed_time TEXT NOT NULL,
+            very_important INTEGER DEFAULT 0,
+            semi_important INTEGER DEFAULT 0
+        )
+    """)
+    conn.execute("CREATE INDEX idx_task_archive_completed_time ON task_archive (completed_time, id)")
+
+
+# daily_rollup holds one row per (date, category) with the totals the
+# tracker views used to aggregate from logs on every refresh. The triggers
+# below keep it current for any write to logs; rebuild_daily_rollup
+# recomputes it from scratch (python schema.py --rebuild-rollup).
+ROLLUP_TRIGGERS = {
+    "trg_logs_rollup_insert": """
+        CREATE TRIGGER trg_logs_rollup_insert AFTER INSERT ON logs BEGIN
+            INSERT INTO daily_rollup (date, name, time_spent, minutes, completed, entries, last_id)
+            VALUES (NEW.date, NEW.name, ifnull(NEW.time_spent, 0), ifnull(NEW.time_spent, 0) / 60,
+                    ifnull(NEW.completed, 0) != 0, 1, NEW.id)
+            ON CONFLICT (date, name) DO UPDATE SET
+                time_spent = time_spent + excluded.time_spent,
+                minutes = minutes + excluded.minutes,
+                completed = completed + excluded.completed,
+                entries = entries + 1,
+                last_id = max(last_id, excluded.last_id);
+        END
+    """,
+    "trg_logs_rollup_delete": """
+        CREATE TRIGGER trg_logs_rollup_delete AFTER DELETE ON logs BEGIN
+            UPDATE daily_rollup SET
+                time_spent = time_spent - ifnull(OLD.time_spent, 0),
+                minutes = minutes - ifnull(OLD.time_spent, 0) / 60,
+                completed = completed - (ifnull(OLD.completed, 0) != 0),
+                entries = entries - 1,
+                last_id = ifnull((SELECT MAX(id) FROM logs WHERE date = OLD.date AND name = OLD.name), 0)
+            WHERE date = OLD.date AND name = OLD.name;
+            DELETE FROM daily_rollup WHERE date = OLD.date AND name = OLD.name AND entries <= 0;
+        END
+    """,
+    "trg_logs_rollup_update": """
+        CREATE TRIGGER trg_logs_rollup_update AFTER UPDATE OF name, date, time_spent, completed ON logs BEGIN
+            UPDATE daily_rollup SET
+                time_spent = time_spent - ifnull(OLD.time_spent, 0),
+                minutes = minutes - ifnull(OLD.time_spent, 0) / 60,
+                completed = completed - (ifnull(OLD.completed, 0) != 0),
+                entries = entries - 1,
+                last_id = ifnull((SELECT MAX(id) FROM logs WHERE date = OLD.date AND name = OLD.name), 0)
+            WHERE date = OLD.date AND name = OLD.name;
+            DELETE FROM daily_rollup WHERE date = OLD.date AND name = OLD.name AND entries <= 0;
+            INSERT INTO daily_rollup (date, name, time_spent, minutes, completed, entries, last_id)
+            VALUES (NEW.date, NEW.name, ifnull(NEW.time_spent, 0), ifnull(NEW.time_spent, 0) / 60,
+                    ifnull(NEW.completed, 0) != 0, 1, NEW.id)
+            ON CONFLICT (date, name) DO UPDATE SET
+                time_spent = time_spent + excluded.time_spent,
+                minutes = minutes + excluded.minutes,
+                completed = completed + excluded.completed,
+                entries = entries + 1,
+                last_id = max(last_id, excluded.last_id);
+        END
+    """,
+}
+
+
+def rebuild_daily_rollup(conn):
+    conn.execute("DELETE FROM daily_rollup")
+    conn.execute("""
+        INSERT INTO daily_rollup (date, name, time_spent, minutes, completed, entries, last_id)
+        SELECT date, name, SUM(ifnull(time_spent, 0)), SUM(ifnull(time_spent, 0) / 60),
+               TOTAL(ifnull(completed, 0) != 0), COUNT(*), MAX(id)
+        FROM logs
+        GROUP BY date, name
+    """)
+
+
+def migration_7_daily_rollup(conn):
+    # minutes sums each entry's whole minutes, which is how the insights
+    # window scores time; completed counts completed entries, with a NULL
+    # logs.completed (legacy rows) counted as not completed.
+    conn.execute("""
+        CREATE TABLE daily_rollup (
+            date TEXT NOT NULL,
+            name TEXT NOT NULL,
+            time_spent INTEGER NOT NULL,
+            minutes INTEGER NOT NULL,
+            completed INTEGER NOT NULL,
+            entries INTEGER NOT NULL,
+            last_id INTEGER NOT NULL,  -- latest logs row, whose outcome the grid shows
+            PRIMARY KEY (date, name)
+        ) WITHOUT ROWID
+    """)
+    for ddl in ROLLUP_TRIGGERS.values():
+        conn.execute(ddl)
+    rebuild_daily_rollup(conn)
+
+
+def migration_8_active_session(conn):
+    # The running timer, at most one row. accumulated holds the seconds
+    # tracked before resumed_at (a Unix time, NULL while paused), so any
+    # process can work out the elapsed time and stop the session.
+    conn.execute("""
+        CREATE TABLE active_session (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            category TEXT NOT NULL,
+            started_at TEXT NOT NULL,
+            resumed_at REAL,
+            accumulated INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+
+
+def migration_9_session_checkpoints(conn):
+    # Set when the GUI checkpoints a running session (see session_timer.py).
+    # A running row with a checkpoint found at startup was left by a GUI
+    # that did not shut down, so only the checkpointed time is trusted.
+    conn.execute("ALTER TABLE active_session ADD COLUMN checkpointed_at REAL")
+
+
+# Each entry brings the database from user_version N-1 to N. Steps must
+# never drop user data; tables whose column layout changes are rebuilt by
+# copying the shared columns across.
+MIGRATIONS = [
+    migration_1_base_tables,
+    migration_2_indexes,
+    migration_3_stroke_points,
+    migration_4_playground_journal,
+    migration_5_playground_snapshots,
+    migration_6_task_archive,
+    migration_7_daily_rollup,
+    migration_8_active_session,
+    migration_9_session_checkpoints,
+]
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def get_version(conn):
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn):
+    version = get_version(conn)
+    if version > SCHEMA_VERSION:
+        raise sqlite3.DatabaseError(f"Database schema version {version} is newer than this application ({SCHEMA_VERSION})")
+    if version == SCHEMA_VERSION:
+        return version
+    # Table rebuilds would trip the categories foreign key, and the pragma
+    # is a no-op inside a transaction, so it is switched off around the run.
+    conn.commit()
+    conn.execute("PRAGMA foreign_keys = OFF")
+    try:
+        for number, step in enumerate(MIGRATIONS[version:], version + 1):
+            try:
+                conn.execute("BEGIN")
+                step(conn)
+                conn.execute(f"PRAGMA user_version = {number}")
+                conn.commit()
+            except sqlite3.Error:
+                conn.rollback()
+                raise
+            logging.info("Migrated database to schema version %s (%s)", number, step.__name__)
+    finally:
+        conn.execute("PRAGMA foreign_keys = ON")
+    return get_version(conn)
+
+
+if __name__ == "__main__":
+    # python schema.py [--rebuild-rollup] [path/to/work_tracker.db]
+    # (python benchmark.py query_plans checks that hot queries use their index.)
+    args = sys.argv[1:]
+    rebuild = "--rebuild-rollup" in args
+    args = [arg for arg in args if arg != "--rebuild-rollup"]
+    db_path = args[0] if args else "work_tracker.db"
+    conn = sqlite3.connect(db_path)
+    try:
+        print(f"{db_path}: schema version {migrate(conn)}")
+        if rebuild:
+            with conn:
+                rebuild_daily_rollup(conn)
+            print(f"Rebuilt daily_rollup ({conn.execute('SELECT COUNT(*) FROM daily_rollup').fetchone()[0]} rows)")
+    finally:
+        conn.close()
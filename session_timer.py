@@ -0,0 +1,100 @@
+import time
+
+# A running session is checkpointed at least this often (seconds), so a
+# crash loses at most this much tracked time.
+CHECKPOINT_INTERVAL = 30
+
+
+class SessionTimer:
+    # Elapsed time of the tracked session, measured with time.monotonic so
+    # changing the system clock can neither stretch nor shrink it.
+    #
+    # Ticks are scheduled with `widget.after` only while the timer runs;
+    # idle and paused timers have nothing pending. Each tick is aimed just
+    # past the next whole second of elapsed time rather than 1000ms after
+    # the previous one, so late callbacks never accumulate into drift and
+    # the display never skips or repeats a second.
+    #
+    # on_tick(seconds) redraws the display. on_checkpoint(seconds, running)
+    # persists the session; it is called on start, pause and resume and
+    # every `checkpoint_interval` seconds while running, so a session is
+    # never without a checkpoint to recover from.
+
+    def __init__(self, widget, on_tick, on_checkpoint, checkpoint_interval=CHECKPOINT_INTERVAL):
+        self.widget = widget
+        self.on_tick = on_tick
+        self.on_checkpoint = on_checkpoint
+        self.checkpoint_interval = checkpoint_interval
+        self.active = False
+        self.accumulated = 0.0  # seconds tracked before run_start
+        self.run_start = None  # monotonic time the current run began; None while paused
+        self.last_checkpoint = 0.0
+        self.job = None
+
+    @property
+    def running(self):
+        return self.run_start is not None
+
+    def elapsed(self):
+        if self.run_start is None:
+            return self.accumulated
+        return self.accumulated + time.monotonic() - self.run_start
+
+    def seconds(self):
+        return int(self.elapsed())
+
+    def start(self, elapsed=0, running=True):
+        self.cancel()
+        self.active = True
+        self.accumulated = float(elapsed)
+        self.run_start = time.monotonic() if running else None
+        self.on_tick(self.seconds())
+        self.checkpoint()
+        self.schedule()
+
+    def pause(self):
+        if not self.running:
+            return
+        self.accumulated = self.elapsed()
+        self.run_start = None
+        self.cancel()
+        self.on_tick(self.seconds())
+        self.checkpoint()
+
+    def resume(self):
+        if not self.active or self.running:
+            return
+        self.run_start = time.monotonic()
+        self.checkpoint()
+        self.schedule()
+
+    def stop(self):
+        # Returns the whole seconds tracked.
+        seconds = self.seconds()
+        self.cancel()
+        self.active = False
+        self.accumulated = 0.0
+        self.run_start = None
+        return seconds
+
+    def checkpoint(self):
+        if self.active:
+            self.last_checkpoint = time.monotonic()
+            self.on_checkpoint(self.seconds(), self.running)
+
+    def schedule(self):
+        if self.running:
+            delay = 1000 - int(self.elapsed() * 1000) % 1000
+            self.job = self.widget.after(delay + 1, self.tick)
+
+    def tick(self):
+        self.job = None
+        self.on_tick(self.seconds())
+        if time.monotonic() - self.last_checkpoint >= self.checkpoint_interval:
+            self.checkpoint()
+        self.schedule()
+
+    def cancel(self):
+        if self.job is not None:
+            self.widget.after_cancel(self.job)
+            self.job = None
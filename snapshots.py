@@ -0,0 +1,126 @@
+import hashlib
+import json
+import struct
+import zlib
+from array import array
+from itertools import chain
+from typing import NamedTuple
+
+import spatial
+import strokes
+
+# A day's playground is cached as a display list: a JSON list of
+# (id, type, color, width, text, coordinate count) followed by every
+# coordinate as float32, zlib-compressed. Reading it back is a json.loads
+# and one array.frombytes instead of decoding each stroke in Python.
+# The snapshot is valid while its content hash matches the day's rows.
+LENGTH = struct.Struct("<I")
+THUMBNAIL_SIZE = (96, 72)
+# Thumbnails sample at most this many points across all strokes.
+THUMBNAIL_POINTS = 20_000
+THUMBNAIL_COLORS = {
+    "black": (0, 0, 0),
+    "red": (220, 0, 0),
+    "blue": (0, 0, 220),
+    "green": (0, 150, 0),
+}
+
+
+class Snapshot(NamedTuple):
+    content_hash: str
+    display_list: bytes
+    thumbnail: bytes
+
+
+def content_hash(rows):
+    # rows: (id, x1, y1, x2, y2) in id order, NULLs as 0. Elements are never
+    # edited in place, only added, removed or moved, and each of those
+    # changes one of these columns.
+    values = array("d", chain.from_iterable(rows))
+    return hashlib.blake2b(values.tobytes(), digest_size=16).hexdigest()
+
+
+def elements_hash(elements):
+    return content_hash((element.id, element.x1, element.y1, element.x2 or 0, element.y2 or 0)
+                        for element in sorted(elements))
+
+
+def element_coords(element):
+    if element.element_type == "pen" and element.points:
+        return strokes.decode(element.points)
+    if element.element_type == "text":
+        return (element.x1, element.y1)
+    return (element.x1, element.y1, element.x2, element.y2)
+
+
+def records_from_rows(elements):
+    return {element.id: (element.element_type, element_coords(element), element.color, element.width, element.text)
+            for element in elements}
+
+
+def build_display_list(records):
+    # records: database ID -> (type, coords, color, width, text), the
+    # layout WorkTrackerApp.playground_records uses.
+    meta = []
+    coords = array("f")
+    for db_id, (element_type, element_coords, color, width, text) in records.items():
+        meta.append((db_id, element_type, color, width, text, len(element_coords)))
+        coords.extend(element_coords)
+    header = json.dumps(meta, separators=(",", ":")).encode()
+    return zlib.compress(LENGTH.pack(len(header)) + header + strokes.to_little_endian(coords))
+
+
+def read_display_list(blob):
+    # Yields (id, type, coords, color, width, text).
+    data = zlib.decompress(blob)
+    (size,) = LENGTH.unpack_from(data)
+    meta = json.loads(data[LENGTH.size:LENGTH.size + size])
+    coords = strokes.from_little_endian("f", data[LENGTH.size + size:])
+    offset = 0
+    for db_id, element_type, color, width, text, count in meta:
+        yield db_id, element_type, coords[offset:offset + count], color, width, text
+        offset += count
+
+
+def render_thumbnail(records, size=THUMBNAIL_SIZE):
+    # A small PPM (which tk.PhotoImage reads directly) of the whole drawing,
+    # scaled to fit. Text is shown as a grey bar.
+    width, height = size
+    pixels = bytearray(b"\xff" * (width * height * 3))
+    shapes = []
+    for element_type, coords, color, line_width, text in records.values():
+        if element_type == "text":
+            x, y = coords
+            shapes.append(([x, y + 6, x + 7 * len(text or ""), y + 6], (160, 160, 160)))
+        else:
+            shapes.append((spatial.element_geometry(element_type, coords, line_width)[1], THUMBNAIL_COLORS.get(color, (0, 0, 0))))
+    if shapes:
+        total = sum(len(polyline) for polyline, _ in shapes) // 2
+        stride = max(1, total // THUMBNAIL_POINTS)
+        left, top, right, bottom = spatial.bounds([value for polyline, _ in shapes for value in spatial.bounds(polyline)])
+        scale = min((width - 4) / max(right - left, 1), (height - 4) / max(bottom - top, 1))
+        for polyline, rgb in shapes:
+            last = None
+            # Always include the final point so short strokes keep their length.
+            for i in (*range(0, len(polyline) - 2, 2 * stride), len(polyline) - 2):
+                px = int((polyline[i] - left) * scale) + 2
+                py = int((polyline[i + 1] - top) * scale) + 2
+                if last is None:
+                    last = (px, py)
+                steps = max(abs(px - last[0]), abs(py - last[1]), 1)
+                for step in range(steps + 1):
+                    sx = last[0] + (px - last[0]) * step // steps
+                    sy = last[1] + (py - last[1]) * step // steps
+                    if 0 <= sx < width and 0 <= sy < height:
+                        offset = (sy * width + sx) * 3
+                        pixels[offset:offset + 3] = bytes(rgb)
+                last = (px, py)
+    return zlib.compress(b"P6 %d %d 255\n" % (width, height) + bytes(pixels))
+
+
+def thumbnail_ppm(thumbnail):
+    return zlib.decompress(thumbnail)
+
+
+def build_snapshot(hash_value, records):
+    return Snapshot(hash_value, build_display_list(records), render_thumbnail(records))
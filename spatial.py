@@ -0,0 +1,170 @@
+import math
+from array import array
+from collections import defaultdict
+
+# Uniform grid over element bounding boxes. Every element is registered in
+# each cell its box touches, so a query only looks at the cells under the
+# probe and its cost follows local density, not the number of elements.
+# Elements spanning more than MAX_CELLS cells are kept in a separate list
+# that every query checks, so one huge shape cannot flood the grid.
+CELL_SIZE = 64
+MAX_CELLS = 1024
+
+
+def bounds(coords, pad=0.0):
+    xs, ys = coords[0::2], coords[1::2]
+    return (min(xs) - pad, min(ys) - pad, max(xs) + pad, max(ys) + pad)
+
+
+def rectangle_outline(x1, y1, x2, y2):
+    return [x1, y1, x2, y1, x2, y2, x1, y2, x1, y1]
+
+
+def oval_outline(x1, y1, x2, y2, steps=32):
+    # Polygon approximation, close enough for hit-testing an outline.
+    cx, cy, rx, ry = (x1 + x2) / 2, (y1 + y2) / 2, abs(x2 - x1) / 2, abs(y2 - y1) / 2
+    coords = []
+    for i in range(steps + 1):
+        angle = 2 * math.pi * i / steps
+        coords += [cx + rx * math.cos(angle), cy + ry * math.sin(angle)]
+    return coords
+
+
+def element_geometry(element_type, coords, width):
+    # Arguments for GridIndex.insert. Text has no outline to hit, so its
+    # coords are the box measured from the font.
+    reach = (width or 0) / 2
+    if element_type == "text":
+        return bounds(coords), None, 0.0
+    if element_type == "square":
+        coords = rectangle_outline(*coords)
+    elif element_type == "circle":
+        coords = oval_outline(*coords)
+    # float32 keeps tens of thousands of strokes at 4 bytes per value.
+    coords = array("f", coords)
+    return bounds(coords, reach), coords, reach
+
+
+def box_distance_sq(x, y, box):
+    x1, y1, x2, y2 = box
+    dx = max(x1 - x, 0.0, x - x2)
+    dy = max(y1 - y, 0.0, y - y2)
+    return dx * dx + dy * dy
+
+
+def polyline_distance_sq(x, y, coords):
+    best = (x - coords[0]) ** 2 + (y - coords[1]) ** 2
+    for i in range(0, len(coords) - 3, 2):
+        x1, y1, x2, y2 = coords[i:i + 4]
+        dx, dy = x2 - x1, y2 - y1
+        length = dx * dx + dy * dy
+        t = 0.0 if not length else max(0.0, min(1.0, ((x - x1) * dx + (y - y1) * dy) / length))
+        px, py = x1 + t * dx - x, y1 + t * dy - y
+        best = min(best, px * px + py * py)
+    return best
+
+
+class GridIndex:
+    def __init__(self, cell_size=CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = defaultdict(set)
+        self.large = set()
+        # key -> (box, polyline, reach). Elements with a polyline (strokes
+        # and shape outlines) are hit-tested against their segments widened
+        # by `reach`; everything else (text) against its box.
+        self.entries = {}
+        # Union of every box ever inserted; not shrunk on remove.
+        self.extent = None
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def cell_range(self, box):
+        x1, y1, x2, y2 = box
+        size = self.cell_size
+        return int(x1 // size), int(y1 // size), int(x2 // size), int(y2 // size)
+
+    def cell_count(self, box):
+        cx1, cy1, cx2, cy2 = self.cell_range(box)
+        return (cx2 - cx1 + 1) * (cy2 - cy1 + 1)
+
+    def cells_for(self, box):
+        cx1, cy1, cx2, cy2 = self.cell_range(box)
+        for cx in range(cx1, cx2 + 1):
+            for cy in range(cy1, cy2 + 1):
+                yield cx, cy
+
+    def insert(self, key, box, polyline=None, reach=0.0):
+        if key in self.entries:
+            self.remove(key)
+        self.entries[key] = (box, polyline, reach)
+        if self.extent is None:
+            self.extent = box
+        else:
+            self.extent = (min(self.extent[0], box[0]), min(self.extent[1], box[1]),
+                           max(self.extent[2], box[2]), max(self.extent[3], box[3]))
+        if self.cell_count(box) > MAX_CELLS:
+            self.large.add(key)
+            return
+        for cell in self.cells_for(box):
+            self.cells[cell].add(key)
+
+    def remove(self, key):
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return
+        if key in self.large:
+            self.large.discard(key)
+            return
+        for cell in self.cells_for(entry[0]):
+            bucket = self.cells.get(cell)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self.cells[cell]
+
+    def clear(self):
+        self.cells.clear()
+        self.large.clear()
+        self.entries.clear()
+        self.extent = None
+
+    def query_rect(self, box):
+        # Keys whose bounding box intersects `box`.
+        x1, y1, x2, y2 = box
+        found = set()
+        if self.cell_count(box) > len(self.cells):
+            candidates = [key for bucket in self.cells.values() for key in bucket]
+        else:
+            candidates = [key for cell in self.cells_for(box) for key in self.cells.get(cell, ())]
+        for key in (*candidates, *self.large):
+            ex1, ey1, ex2, ey2 = self.entries[key][0]
+            if ex1 <= x2 and ex2 >= x1 and ey1 <= y2 and ey2 >= y1:
+                found.add(key)
+        return found
+
+    def distance_sq(self, key, x, y):
+        box, polyline, reach = self.entries[key]
+        if polyline is None:
+            return box_distance_sq(x, y, box)
+        distance = max(polyline_distance_sq(x, y, polyline) ** 0.5 - reach, 0.0)
+        return distance * distance
+
+    def within(self, x, y, radius):
+        # Brush erase: every element the circle around (x, y) touches.
+        limit = radius * radius
+        return [key for key in self.query_rect((x - radius, y - radius, x + radius, y + radius))
+                if self.distance_sq(key, x, y) <= limit]
+
+    def at_point(self, x, y, halo=0.0):
+        # Point erase: the closest element within `halo`, preferring the
+        # newest (highest key) on ties since it is drawn on top.
+        best = None
+        for key in self.within(x, y, halo):
+            rank = (self.distance_sq(key, x, y), -key)
+            if best is None or rank < best[0]:
+                best = (rank, key)
+        return None if best is None else best[1]
@@ -0,0 +1,616 @@
+import logging
+import sqlite3
+from array import array
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+import snapshots
+import strokes
+from schema import get_version, migrate, rebuild_daily_rollup
+
+# sqlite3 keeps prepared statements in a per-connection LRU keyed by the SQL
+# text. The repositories below only ever issue a fixed set of statements, so
+# a cache comfortably larger than that set means nothing is re-prepared.
+STATEMENT_CACHE_SIZE = 256
+
+# All profiles use WAL so readers never block the writer and a commit is an
+# append to the log instead of a rollback-journal rewrite. They differ in
+# when SQLite fsyncs: strict on every commit, balanced only at checkpoints
+# (a power cut may lose the last commits but never corrupts the file), fast
+# never. Negative cache_size values are in KiB.
+DURABILITY_PROFILES = {
+    "strict": {
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "cache_size": -8000,
+        "mmap_size": 0,
+        "temp_store": "DEFAULT",
+    },
+    "balanced": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -16000,
+        "mmap_size": 64 * 1024 * 1024,
+        "temp_store": "MEMORY",
+    },
+    "fast": {
+        "journal_mode": "WAL",
+        "synchronous": "OFF",
+        "cache_size": -32000,
+        "mmap_size": 256 * 1024 * 1024,
+        "temp_store": "MEMORY",
+    },
+}
+DEFAULT_DURABILITY = "balanced"
+
+# Undo entries kept per day. Older entries are dropped along with any rows
+# they were holding in playground_trash.
+JOURNAL_LIMIT = 200
+ELEMENT_COLUMNS = "id, element_type, x1, y1, x2, y2, color, width, text, created_date, points"
+
+
+class LogEntry(NamedTuple):
+    name: str
+    time_spent: int
+    completed: int
+    outcome: Optional[str]
+
+
+class Task(NamedTuple):
+    id: int
+    task_text: str
+    created_date: str
+    x: float
+    y: float
+    completed: int
+    very_important: int
+    semi_important: int
+
+
+class CompletedTask(NamedTuple):
+    id: int
+    task_text: str
+    created_date: str
+    completed_time: str
+
+
+class PlaygroundElement(NamedTuple):
+    id: int
+    element_type: str
+    x1: float
+    y1: float
+    x2: Optional[float]
+    y2: Optional[float]
+    color: Optional[str]
+    width: Optional[float]
+    text: Optional[str]
+    points: Optional[bytes]
+
+
+class ActiveSession(NamedTuple):
+    category: str
+    started_at: str
+    resumed_at: Optional[float]
+    accumulated: int
+    checkpointed_at: Optional[float]
+
+    def elapsed(self, now):
+        if self.resumed_at is None:
+            return self.accumulated
+        return self.accumulated + int(now - self.resumed_at)
+
+
+class JournalReplay(NamedTuple):
+    # What an undo or redo did, for the UI to mirror on the canvas.
+    removed: list
+    restored: list
+    moved: list
+    dx: float
+    dy: float
+
+
+def pack_ids(ids):
+    return strokes.to_little_endian(array("q", ids))
+
+
+def unpack_ids(blob):
+    return strokes.from_little_endian("q", blob).tolist()
+
+
+def apply_durability(conn, profile):
+    if profile not in DURABILITY_PROFILES:
+        raise ValueError(f"Unknown durability profile '{profile}', expected one of {sorted(DURABILITY_PROFILES)}")
+    for pragma, value in DURABILITY_PROFILES[profile].items():
+        conn.execute(f"PRAGMA {pragma} = {value}")
+
+
+class Database:
+    # Owns the single connection every repository shares.
+
+    def __init__(self, path, durability=DEFAULT_DURABILITY, read_only=False):
+        self.path = path
+        self.durability = durability
+        self.read_only = read_only
+        if read_only:
+            # Background readers can neither migrate nor write by accident.
+            uri = f"{Path(path).resolve().as_uri()}?mode=ro"
+            self.conn = sqlite3.connect(uri, uri=True, cached_statements=STATEMENT_CACHE_SIZE, check_same_thread=False)
+            self.schema_version = get_version(self.conn)
+        else:
+            self.conn = sqlite3.connect(path, cached_statements=STATEMENT_CACHE_SIZE)
+            self.conn.execute("PRAGMA foreign_keys = ON")
+            apply_durability(self.conn, durability)
+            self.schema_version = migrate(self.conn)
+        self.transaction_depth = 0
+        self.logs = LogRepository(self)
+        self.tasks = TaskRepository(self)
+        self.playground = PlaygroundRepository(self)
+        self.sessions = SessionRepository(self)
+        logging.info("Connected to database at %s (schema version %s, %s)", path, self.schema_version, 'read-only' if read_only else durability)
+
+    @contextmanager
+    def transaction(self):
+        # Repository writes nest: only the outermost block commits, so a
+        # caller can group any number of them into one transaction.
+        if self.transaction_depth:
+            self.transaction_depth += 1
+            try:
+                yield
+            finally:
+                self.transaction_depth -= 1
+            return
+        self.transaction_depth = 1
+        try:
+            with self.conn:
+                yield
+        finally:
+            self.transaction_depth = 0
+
+    def close(self):
+        self.conn.close()
+
+
+class Repository:
+    def __init__(self, db):
+        self.conn = db.conn
+        self.transaction = db.transaction
+
+
+class LogRepository(Repository):
+
+    def categories(self):
+        return [row[0] for row in self.conn.execute("SELECT name FROM categories ORDER BY name")]
+
+    def ensure_categories(self, names):
+        with self.transaction():
+            if self.conn.execute("SELECT COUNT(*) FROM categories").fetchone()[0] == 0:
+                self.conn.executemany("INSERT INTO categories (name) VALUES (?)", [(name,) for name in names])
+                return True
+        return False
+
+    def category_exists(self, name):
+        return self.conn.execute("SELECT 1 FROM categories WHERE name = ?", (name,)).fetchone() is not None
+
+    def add_category(self, name):
+        with self.transaction():
+            self.conn.execute("INSERT INTO categories (name) VALUES (?)", (name,))
+
+    def rename_category(self, old_name, new_name):
+        # logs.name references categories without ON UPDATE CASCADE, so the
+        # new name has to exist before the logs can be moved over to it.
+        with self.transaction():
+            self.conn.execute("INSERT INTO categories (name) VALUES (?)", (new_name,))
+            self.conn.execute("UPDATE logs SET name = ? WHERE name = ?", (new_name, old_name))
+            self.conn.execute("UPDATE active_session SET category = ? WHERE category = ?", (new_name, old_name))
+            self.conn.execute("DELETE FROM categories WHERE name = ?", (old_name,))
+
+    def delete_category(self, name):
+        with self.transaction():
+            self.conn.execute("DELETE FROM logs WHERE name = ?", (name,))
+            self.conn.execute("DELETE FROM active_session WHERE category = ?", (name,))
+            self.conn.execute("DELETE FROM categories WHERE name = ?", (name,))
+
+    def add_log(self, name, log_date, time_spent, completed, outcome):
+        with self.transaction():
+            cursor = self.conn.execute(
+                "INSERT INTO logs (name, date, time_spent, completed, outcome) VALUES (?, ?, ?, ?, ?)",
+                (name, log_date, time_spent, completed, outcome))
+        return cursor.lastrowid
+
+    def add_logs(self, entries):
+        # entries: iterable of (name, date, time_spent, completed, outcome)
+        with self.transaction():
+            self.conn.executemany(
+                "INSERT INTO logs (name, date, time_spent, completed, outcome) VALUES (?, ?, ?, ?, ?)",
+                entries)
+
+    def entries_for_date(self, log_date):
+        cursor = self.conn.execute("""
+            SELECT c.name, l.time_spent, l.completed, l.outcome
+            FROM logs l
+            JOIN categories c ON l.name = c.name
+            WHERE l.date = ?
+            ORDER BY c.name, l.id
+        """, (log_date,))
+        return [LogEntry._make(row) for row in cursor]
+
+    def outcomes_for_date(self, log_date, limit=5):
+        cursor = self.conn.execute("SELECT name, outcome FROM logs WHERE date = ? ORDER BY id LIMIT ?", (log_date, limit))
+        return cursor.fetchall()
+
+    def day_totals(self, log_date):
+        # (name, minutes, completed entries) per category from daily_rollup.
+        cursor = self.conn.execute("SELECT name, minutes, completed FROM daily_rollup WHERE date = ? ORDER BY name", (log_date,))
+        return cursor.fetchall()
+
+    def outcomes_logged(self, log_date):
+        cursor = self.conn.execute(
+            "SELECT name, outcome FROM logs WHERE date = ? AND outcome IS NOT NULL AND outcome != 'No outcome' ORDER BY name, id",
+            (log_date,))
+        return cursor.fetchall()
+
+    def export_rows(self, since=None):
+        # Every log row in date order, as (date, name, time_spent, completed,
+        # outcome); a cursor, so large exports are streamed.
+        where, params = ("WHERE date >= ?", (since,)) if since else ("", ())
+        return self.conn.execute(
+            f"SELECT date, name, time_spent, completed, outcome FROM logs {where} ORDER BY date, id", params)
+
+    def rebuild_rollup(self):
+        with self.transaction():
+            rebuild_daily_rollup(self.conn)
+
+    def grid(self, search_date=None, before=None, limit=None):
+        # The date x category pivot, read from daily_rollup so the cost
+        # follows the number of days shown rather than the number of log
+        # rows. The outcome shown for a cell is the one from the latest log
+        # row of that category on that date, joined through last_id. With a
+        # limit only the newest `limit` dates older than `before` are read,
+        # which lets the grid page through history by date.
+        conditions = []
+        params = []
+        if search_date:
+            conditions.append("date = ?")
+            params.append(search_date)
+        if before:
+            conditions.append("date < ?")
+            params.append(before)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        if limit:
+            where = f"WHERE date IN (SELECT DISTINCT date FROM daily_rollup {where} ORDER BY date DESC LIMIT ?)"
+            params.append(limit)
+        cursor = self.conn.execute(f"""
+            SELECT g.date, g.name, g.time_spent, g.completed > 0, o.outcome
+            FROM (SELECT * FROM daily_rollup {where}) g
+            JOIN logs o ON o.id = g.last_id
+            ORDER BY g.date DESC
+        """, params)
+
+        rows = {}
+        outcomes = {}
+        for log_date, name, time_spent, completed, outcome in cursor:
+            cells = rows.setdefault(log_date, {})
+            cells[name] = (time_spent or 0, completed)
+            outcomes[(log_date, name)] = outcome or "No outcome"
+        return list(rows.items()), outcomes
+
+
+class SessionRepository(Repository):
+    # The timer shared by the GUI and the command line (see cli.py).
+    # Times are Unix timestamps so they mean the same in every process.
+    # Pausing or resuming here re-bases the row on the wall clock, so it
+    # clears any GUI checkpoint.
+
+    def current(self):
+        row = self.conn.execute(
+            "SELECT category, started_at, resumed_at, accumulated, checkpointed_at FROM active_session WHERE id = 1").fetchone()
+        return ActiveSession._make(row) if row else None
+
+    def start(self, category, now):
+        with self.transaction():
+            self.conn.execute(
+                "INSERT OR REPLACE INTO active_session (id, category, started_at, resumed_at, accumulated) VALUES (1, ?, ?, ?, 0)",
+                (category, datetime.fromtimestamp(now).isoformat(timespec="seconds"), now))
+
+    def pause(self, now):
+        with self.transaction():
+            cursor = self.conn.execute(
+                "UPDATE active_session SET accumulated = accumulated + CAST(? - resumed_at AS INTEGER), resumed_at = NULL, checkpointed_at = NULL "
+                "WHERE id = 1 AND resumed_at IS NOT NULL",
+                (now,))
+        return cursor.rowcount > 0
+
+    def resume(self, now):
+        with self.transaction():
+            cursor = self.conn.execute("UPDATE active_session SET resumed_at = ?, checkpointed_at = NULL WHERE id = 1 AND resumed_at IS NULL", (now,))
+        return cursor.rowcount > 0
+
+    def checkpoint(self, category, elapsed, running, now):
+        # Re-bases the session on `now`, so only the time since the last
+        # checkpoint depends on the wall clock.
+        with self.transaction():
+            self.conn.execute(
+                "UPDATE active_session SET accumulated = ?, resumed_at = ?, checkpointed_at = ? WHERE id = 1 AND category = ?",
+                (elapsed, now if running else None, now, category))
+
+    def finish(self, category, log_date, elapsed, outcome):
+        # Logs a session timed by the caller and clears it. Returns False,
+        # logging nothing, if the session was already stopped or replaced
+        # by another process, which logged it then.
+        with self.transaction():
+            cursor = self.conn.execute("DELETE FROM active_session WHERE id = 1 AND category = ?", (category,))
+            if cursor.rowcount != 1:
+                return False
+            self.conn.execute("INSERT INTO logs (name, date, time_spent, completed, outcome) VALUES (?, ?, ?, 1, ?)",
+                              (category, log_date, elapsed, outcome))
+        return True
+
+    def stop(self, now, log_date, outcome):
+        # Logs the session and clears it in one transaction. Returns the
+        # stopped session and its elapsed seconds, or None if none was running.
+        with self.transaction():
+            session = self.current()
+            if session is None:
+                return None
+            elapsed = session.elapsed(now)
+            self.conn.execute("INSERT INTO logs (name, date, time_spent, completed, outcome) VALUES (?, ?, ?, 1, ?)",
+                              (session.category, log_date, elapsed, outcome))
+            self.conn.execute("DELETE FROM active_session WHERE id = 1")
+        return session, elapsed
+
+
+class TaskRepository(Repository):
+
+    def add(self, task_text, created_date, x=50, y=50):
+        with self.transaction():
+            cursor = self.conn.execute(
+                "INSERT INTO tasks (task_text, created_date, x, y, completed, very_important, semi_important) VALUES (?, ?, ?, ?, 0, 0, 0)",
+                (task_text, created_date, x, y))
+        return cursor.lastrowid
+
+    def open_tasks(self, created_date):
+        cursor = self.conn.execute(
+            "SELECT id, task_text, created_date, x, y, completed, very_important, semi_important FROM tasks WHERE created_date = ? AND completed = 0 ORDER BY id",
+            (created_date,))
+        return [Task._make(row) for row in cursor]
+
+    def important_tasks(self, created_date, limit=3):
+        cursor = self.conn.execute(
+            "SELECT task_text FROM tasks WHERE created_date = ? AND very_important = 1 AND completed = 0 ORDER BY id DESC LIMIT ?",
+            (created_date, limit))
+        return [row[0] for row in cursor]
+
+    def completed_tasks(self, after=None, limit=100):
+        # Newest first. The first page (after=None) starts with the tasks
+        # still waiting to expire, then both it and later pages continue
+        # through the archive below the (completed_time, id) key `after`.
+        if after is None:
+            rows = self.conn.execute(
+                "SELECT id, task_text, created_date, completed_time FROM tasks WHERE completed = 1 ORDER BY completed_time DESC, id DESC").fetchall()
+            where, params = "", [limit]
+        else:
+            rows = []
+            where, params = "WHERE (completed_time, id) < (?, ?)", [*after, limit]
+        rows += self.conn.execute(
+            f"SELECT id, task_text, created_date, completed_time FROM task_archive {where} ORDER BY completed_time DESC, id DESC LIMIT ?",
+            params).fetchall()
+        return [CompletedTask._make(row) for row in rows]
+
+    def completion_times(self):
+        return self.conn.execute("SELECT id, completed_time FROM tasks WHERE completed = 1").fetchall()
+
+    def update_text(self, task_id, task_text):
+        with self.transaction():
+            self.conn.execute("UPDATE tasks SET task_text = ? WHERE id = ?", (task_text, task_id))
+
+    def set_completed(self, task_id, completed, completed_time):
+        with self.transaction():
+            self.conn.execute("UPDATE tasks SET completed = ?, completed_time = ? WHERE id = ?",
+                              (completed, completed_time, task_id))
+
+    def set_very_important(self, task_id, very_important):
+        with self.transaction():
+            self.conn.execute("UPDATE tasks SET very_important = ? WHERE id = ?", (very_important, task_id))
+
+    def set_semi_important(self, task_id, semi_important):
+        with self.transaction():
+            self.conn.execute("UPDATE tasks SET semi_important = ? WHERE id = ?", (semi_important, task_id))
+
+    def move_many(self, positions):
+        # positions: iterable of (task_id, x, y)
+        with self.transaction():
+            self.conn.executemany("UPDATE tasks SET x = ?, y = ? WHERE id = ?",
+                                  [(x, y, task_id) for task_id, x, y in positions])
+
+    def archive_expired(self, task_ids, cutoff):
+        # Moves tasks that are still completed, and were completed at or
+        # before `cutoff`, into task_archive.
+        params = [(task_id, cutoff) for task_id in task_ids]
+        with self.transaction():
+            self.conn.executemany("""
+                INSERT OR REPLACE INTO task_archive (id, task_text, created_date, completed_time, very_important, semi_important)
+                SELECT id, task_text, created_date, completed_time, very_important, semi_important
+                FROM tasks WHERE id = ? AND completed = 1 AND completed_time <= ?
+            """, params)
+            self.conn.executemany("DELETE FROM tasks WHERE id = ? AND completed = 1 AND completed_time <= ?", params)
+
+
+class PlaygroundRepository(Repository):
+
+    def elements_for_date(self, created_date):
+        cursor = self.conn.execute(
+            "SELECT id, element_type, x1, y1, x2, y2, color, width, text, points FROM playground_elements WHERE created_date = ?",
+            (created_date,))
+        return [PlaygroundElement._make(row) for row in cursor]
+
+    def content_hash(self, created_date):
+        cursor = self.conn.execute(
+            "SELECT id, x1, y1, ifnull(x2, 0), ifnull(y2, 0) FROM playground_elements WHERE created_date = ? ORDER BY id", (created_date,))
+        return snapshots.content_hash(cursor)
+
+    def snapshot(self, created_date):
+        row = self.conn.execute(
+            "SELECT content_hash, display_list, thumbnail FROM playground_snapshots WHERE created_date = ?",
+            (created_date,)).fetchone()
+        return snapshots.Snapshot._make(row) if row else None
+
+    def save_snapshot(self, created_date, snapshot):
+        with self.transaction():
+            self.conn.execute("""
+                INSERT OR REPLACE INTO playground_snapshots (created_date, content_hash, display_list, thumbnail)
+                VALUES (?, ?, ?, ?)
+            """, (created_date, *snapshot))
+
+    def drawn_dates(self, limit):
+        cursor = self.conn.execute(
+            "SELECT DISTINCT created_date FROM playground_elements ORDER BY created_date DESC LIMIT ?", (limit,))
+        return [row[0] for row in cursor]
+
+    def current_snapshot(self, created_date):
+        # (snapshot, fresh): the stored snapshot if it still matches the
+        # day's content, otherwise a rebuilt one the caller should save.
+        snapshot = self.snapshot(created_date)
+        if snapshot and snapshot.content_hash == self.content_hash(created_date):
+            return snapshot, False
+        elements = self.elements_for_date(created_date)
+        return snapshots.build_snapshot(snapshots.elements_hash(elements), snapshots.records_from_rows(elements)), True
+
+    def add_text(self, x, y, color, text, created_date):
+        with self.transaction():
+            cursor = self.conn.execute("""
+                INSERT INTO playground_elements (element_type, x1, y1, color, text, created_date)
+                VALUES ('text', ?, ?, ?, ?, ?)
+            """, (x, y, color, text, created_date))
+            self.record(created_date, "insert", [cursor.lastrowid])
+        return cursor.lastrowid
+
+    def add_shape(self, element_type, x1, y1, x2, y2, color, width, created_date):
+        with self.transaction():
+            cursor = self.conn.execute("""
+                INSERT INTO playground_elements (element_type, x1, y1, x2, y2, color, width, created_date)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, (element_type, x1, y1, x2, y2, color, width, created_date))
+            self.record(created_date, "insert", [cursor.lastrowid])
+        return cursor.lastrowid
+
+    def add_stroke(self, points, color, width, created_date):
+        # points: (x, y) pairs. They are stored encoded, with the endpoints
+        # also in x1/y1/x2/y2 so the row stays readable without decoding.
+        (x1, y1), (x2, y2) = points[0], points[-1]
+        with self.transaction():
+            cursor = self.conn.execute("""
+                INSERT INTO playground_elements (element_type, x1, y1, x2, y2, color, width, created_date, points)
+                VALUES ('pen', ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (x1, y1, x2, y2, color, width, created_date, strokes.encode(points)))
+            self.record(created_date, "insert", [cursor.lastrowid])
+        return cursor.lastrowid
+
+    def delete_many(self, element_ids, created_date):
+        with self.transaction():
+            journal_id = self.record(created_date, "delete", element_ids)
+            self.stash(journal_id, element_ids)
+
+    def clear_date(self, created_date):
+        element_ids = [row[0] for row in self.conn.execute(
+            "SELECT id FROM playground_elements WHERE created_date = ?", (created_date,))]
+        if element_ids:
+            self.delete_many(element_ids, created_date)
+
+    def move_many(self, element_ids, dx, dy, created_date):
+        with self.transaction():
+            self.translate(element_ids, dx, dy)
+            self.record(created_date, "move", element_ids, dx, dy)
+
+    # Journal. Every change above records one entry in the same transaction.
+    # A row lives in playground_trash exactly while its entry has it out of
+    # playground_elements, so undo and redo just move rows between the two.
+
+    def record(self, created_date, action, element_ids, dx=0.0, dy=0.0):
+        # A new change discards the redo history.
+        if self.conn.execute("SELECT 1 FROM playground_journal WHERE created_date = ? AND undone = 1 LIMIT 1",
+                             (created_date,)).fetchone():
+            self.conn.execute("""
+                DELETE FROM playground_trash WHERE journal_id IN
+                    (SELECT id FROM playground_journal WHERE created_date = ? AND undone = 1)
+            """, (created_date,))
+            self.conn.execute("DELETE FROM playground_journal WHERE created_date = ? AND undone = 1", (created_date,))
+        cursor = self.conn.execute(
+            "INSERT INTO playground_journal (created_date, action, element_ids, dx, dy) VALUES (?, ?, ?, ?, ?)",
+            (created_date, action, pack_ids(element_ids), dx, dy))
+        cutoff = self.conn.execute(
+            "SELECT id FROM playground_journal WHERE created_date = ? AND undone = 0 ORDER BY id DESC LIMIT 1 OFFSET ?",
+            (created_date, JOURNAL_LIMIT)).fetchone()
+        if cutoff:
+            self.conn.execute("""
+                DELETE FROM playground_trash WHERE journal_id IN
+                    (SELECT id FROM playground_journal WHERE created_date = ? AND undone = 0 AND id <= ?)
+            """, (created_date, cutoff[0]))
+            self.conn.execute("DELETE FROM playground_journal WHERE created_date = ? AND undone = 0 AND id <= ?",
+                              (created_date, cutoff[0]))
+        return cursor.lastrowid
+
+    def stash(self, journal_id, element_ids):
+        self.conn.executemany(
+            f"INSERT INTO playground_trash (journal_id, {ELEMENT_COLUMNS}) SELECT ?, {ELEMENT_COLUMNS} FROM playground_elements WHERE id = ?",
+            [(journal_id, element_id) for element_id in element_ids])
+        self.conn.executemany("DELETE FROM playground_elements WHERE id = ?", [(element_id,) for element_id in element_ids])
+
+    def unstash(self, journal_id):
+        cursor = self.conn.execute(
+            "SELECT id, element_type, x1, y1, x2, y2, color, width, text, points FROM playground_trash WHERE journal_id = ?",
+            (journal_id,))
+        restored = [PlaygroundElement._make(row) for row in cursor]
+        self.conn.execute(
+            f"INSERT INTO playground_elements ({ELEMENT_COLUMNS}) SELECT {ELEMENT_COLUMNS} FROM playground_trash WHERE journal_id = ?",
+            (journal_id,))
+        self.conn.execute("DELETE FROM playground_trash WHERE journal_id = ?", (journal_id,))
+        return restored
+
+    def translate(self, element_ids, dx, dy):
+        params = [(dx, dy, dx, dy, element_id) for element_id in element_ids]
+        self.conn.executemany(
+            "UPDATE playground_elements SET x1 = x1 + ?, y1 = y1 + ?, x2 = x2 + ?, y2 = y2 + ? WHERE id = ?", params)
+        stroke_points = []
+        for element_id in element_ids:
+            row = self.conn.execute(
+                "SELECT points FROM playground_elements WHERE id = ? AND points IS NOT NULL", (element_id,)).fetchone()
+            if row:
+                stroke_points.append((strokes.translate(row[0], dx, dy), element_id))
+        self.conn.executemany("UPDATE playground_elements SET points = ? WHERE id = ?", stroke_points)
+
+    def undo(self, created_date):
+        with self.transaction():
+            entry = self.conn.execute("""
+                SELECT id, action, element_ids, dx, dy FROM playground_journal
+                WHERE created_date = ? AND undone = 0 ORDER BY id DESC LIMIT 1
+            """, (created_date,)).fetchone()
+            if entry is None:
+                return None
+            self.conn.execute("UPDATE playground_journal SET undone = 1 WHERE id = ?", (entry[0],))
+            return self.replay(*entry, forward=False)
+
+    def redo(self, created_date):
+        with self.transaction():
+            entry = self.conn.execute("""
+                SELECT id, action, element_ids, dx, dy FROM playground_journal
+                WHERE created_date = ? AND undone = 1 ORDER BY id LIMIT 1
+            """, (created_date,)).fetchone()
+            if entry is None:
+                return None
+            self.conn.execute("UPDATE playground_journal SET undone = 0 WHERE id = ?", (entry[0],))
+            return self.replay(*entry, forward=True)
+
+    def replay(self, journal_id, action, element_ids, dx, dy, forward):
+        element_ids = unpack_ids(element_ids)
+        if action == "move":
+            if not forward:
+                dx, dy = -dx, -dy
+            self.translate(element_ids, dx, dy)
+            return JournalReplay([], [], element_ids, dx, dy)
+        # Redoing an insert or undoing a delete brings the rows back.
+        if (action == "insert") == forward:
+            return JournalReplay([], self.unstash(journal_id), [], 0.0, 0.0)
+        self.stash(journal_id, element_ids)
+        return JournalReplay(element_ids, [], [], 0.0, 0.0)
@@ -0,0 +1,187 @@
+import struct
+import sys
+from array import array
+
+# Pen strokes are stored as a blob: one format byte, a little-endian uint32
+# point count, then the points. FORMAT_DELTA keeps the first point as two
+# float32 values and every following point as int16 deltas in 1/DELTA_SCALE
+# pixel steps, half the size of storing float32 coordinates. Strokes with a
+# jump too large for int16 fall back to FORMAT_FLOAT32.
+FORMAT_FLOAT32 = 1
+FORMAT_DELTA = 2
+DELTA_SCALE = 8
+HEADER = struct.Struct("<BI")
+ORIGIN = struct.Struct("<ff")
+
+# Simplification keeps points that deviate more than this from the line
+# through their neighbours; a stroke that still has more than MAX_POINTS
+# keeps the MAX_POINTS most significant of them.
+SIMPLIFY_TOLERANCE = 0.75
+MAX_POINTS = 2048
+
+
+def pairs(coords):
+    return list(zip(coords[0::2], coords[1::2]))
+
+
+def flatten(points):
+    return [value for point in points for value in point]
+
+
+def simplify(points, tolerance=SIMPLIFY_TOLERANCE, max_points=MAX_POINTS):
+    # Ramer-Douglas-Peucker with an explicit stack so long strokes cannot hit
+    # the recursion limit. Each kept point records the smallest split
+    # distance on its way down, which is the largest tolerance that would
+    # still keep it. Cutting at the max_points-th of those gives what RDP
+    # returns at the smallest tolerance that fits, in a single pass.
+    if len(points) <= 2:
+        return list(points)
+    significance = {}  # point index -> squared distance
+    stack = [(0, len(points) - 1, float("inf"))]
+    limit = tolerance * tolerance
+    while stack:
+        first, last, bound = stack.pop()
+        (x1, y1), (x2, y2) = points[first], points[last]
+        dx, dy = x2 - x1, y2 - y1
+        length = dx * dx + dy * dy
+        worst, worst_index = -1.0, None
+        for index in range(first + 1, last):
+            px, py = points[index]
+            if length:
+                cross = dx * (py - y1) - dy * (px - x1)
+                distance = cross * cross / length
+            else:
+                distance = (px - x1) ** 2 + (py - y1) ** 2
+            if distance > worst:
+                worst, worst_index = distance, index
+        if worst_index is not None and worst > limit:
+            kept = min(worst, bound)
+            significance[worst_index] = kept
+            stack.append((first, worst_index, kept))
+            stack.append((worst_index, last, kept))
+    if len(significance) + 2 > max_points:
+        cutoff = sorted(significance.values(), reverse=True)[max(max_points - 2, 0)]
+        significance = {index: kept for index, kept in significance.items() if kept > cutoff}
+    return [points[0]] + [points[index] for index in sorted(significance)] + [points[-1]]
+
+
+def to_little_endian(values):
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values.tobytes()
+
+
+def from_little_endian(typecode, data):
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+def encode(points):
+    if not points:
+        return HEADER.pack(FORMAT_FLOAT32, 0)
+    x0, y0 = points[0]
+    deltas = array("h")
+    # Deltas are taken against the quantized running position so rounding
+    # error does not accumulate along the stroke.
+    qx, qy = round(x0 * DELTA_SCALE), round(y0 * DELTA_SCALE)
+    origin = ORIGIN.pack(qx / DELTA_SCALE, qy / DELTA_SCALE)
+    try:
+        for x, y in points[1:]:
+            nx, ny = round(x * DELTA_SCALE), round(y * DELTA_SCALE)
+            deltas.append(nx - qx)
+            deltas.append(ny - qy)
+            qx, qy = nx, ny
+    except OverflowError:
+        return HEADER.pack(FORMAT_FLOAT32, len(points)) + to_little_endian(array("f", flatten(points)))
+    return HEADER.pack(FORMAT_DELTA, len(points)) + origin + to_little_endian(deltas)
+
+
+def decode(blob):
+    # Returns the flat [x0, y0, x1, y1, ...] list canvas.create_line takes.
+    kind, count = HEADER.unpack_from(blob)
+    body = blob[HEADER.size:]
+    if kind == FORMAT_FLOAT32:
+        return from_little_endian("f", body).tolist()
+    if kind != FORMAT_DELTA:
+        raise ValueError(f"Unknown stroke format {kind}")
+    x, y = ORIGIN.unpack_from(body)
+    qx, qy = round(x * DELTA_SCALE), round(y * DELTA_SCALE)
+    deltas = from_little_endian("h", body[ORIGIN.size:])
+    coords = [x, y]
+    for i in range(0, len(deltas), 2):
+        qx += deltas[i]
+        qy += deltas[i + 1]
+        coords.append(qx / DELTA_SCALE)
+        coords.append(qy / DELTA_SCALE)
+    return coords
+
+
+def translate(blob, dx, dy):
+    # Delta-encoded strokes only store absolute coordinates in the origin,
+    # so moving one rewrites 8 bytes.
+    kind, count = HEADER.unpack_from(blob)
+    if kind == FORMAT_DELTA:
+        x, y = ORIGIN.unpack_from(blob, HEADER.size)
+        origin = ORIGIN.pack(round((x + dx) * DELTA_SCALE) / DELTA_SCALE, round((y + dy) * DELTA_SCALE) / DELTA_SCALE)
+        return blob[:HEADER.size] + origin + blob[HEADER.size + ORIGIN.size:]
+    return encode([(x + dx, y + dy) for x, y in pairs(decode(blob))])
+
+
+# Live stroke capture. Motion events only append to a Python list; the
+# canvas is updated at most once per FRAME_MS. The stroke is drawn as a
+# chain of line items of at most SEGMENT_POINTS points each, so one update
+# only rewrites the tail segment and never the whole stroke. finish()
+# swaps the chain for a single line item.
+FRAME_MS = 16
+SEGMENT_POINTS = 128
+MIN_STEP = 1.0
+
+
+class StrokeBuilder:
+    def __init__(self, canvas, x, y, frame_ms=FRAME_MS, **line_options):
+        self.canvas = canvas
+        self.frame_ms = frame_ms
+        self.line_options = line_options
+        self.points = [(x, y)]
+        self.segment_start = 0
+        self.segments = [canvas.create_line(x, y, x, y, **line_options)]
+        self.flush_job = None
+
+    def add(self, x, y):
+        last_x, last_y = self.points[-1]
+        if abs(x - last_x) + abs(y - last_y) < MIN_STEP:
+            return
+        self.points.append((x, y))
+        if self.flush_job is None:
+            self.flush_job = self.canvas.after(self.frame_ms, self.flush)
+
+    def segment_coords(self, start, end):
+        coords = flatten(self.points[start:end])
+        return coords if len(coords) >= 4 else coords * 2
+
+    def flush(self):
+        if self.flush_job is not None:
+            self.canvas.after_cancel(self.flush_job)
+            self.flush_job = None
+        while len(self.points) - self.segment_start > SEGMENT_POINTS:
+            end = self.segment_start + SEGMENT_POINTS
+            self.canvas.coords(self.segments[-1], *self.segment_coords(self.segment_start, end))
+            # Segments share their boundary point so the chain has no gaps.
+            self.segment_start = end - 1
+            self.segments.append(self.canvas.create_line(*self.segment_coords(self.segment_start, end), **self.line_options))
+        self.canvas.coords(self.segments[-1], *self.segment_coords(self.segment_start, len(self.points)))
+
+    def finish(self, x=None, y=None):
+        if x is not None:
+            self.add(x, y)
+        if self.flush_job is not None:
+            self.canvas.after_cancel(self.flush_job)
+            self.flush_job = None
+        for segment in self.segments:
+            self.canvas.delete(segment)
+        self.segments = []
+        canvas_id = self.canvas.create_line(*self.segment_coords(0, len(self.points)), **self.line_options)
+        return canvas_id, self.points
@@ -0,0 +1,298 @@
+import tkinter as tk
+
+CARD_COLOR = "#FFFF99"
+SELECTED_COLOR = "#3366FF"
+# Idle cards kept for reuse; beyond this they are destroyed.
+POOL_LIMIT = 50
+
+
+class WidgetCardBoard:
+    # Task cards as Tk widget trees embedded in the whiteboard canvas.
+    #
+    # Building a card is a Frame, a Text, three Checkbuttons, a Label and 21
+    # bindings. Cards whose task leaves the board are hidden and pooled, and
+    # the next task to appear re-fills one instead of building a new tree.
+    # sync() and show() only touch the fields that differ from what the card
+    # last rendered, so refreshing an unchanged board does no widget work.
+    #
+    # `app` provides the handlers: edit_task(task_id, text),
+    # toggle_task_completion / toggle_very_important /
+    # toggle_semi_important(task_id, value) and start_task_drag /
+    # on_task_drag / stop_task_drag(event, task_id).
+
+    def __init__(self, canvas, app):
+        self.canvas = canvas
+        self.app = app
+        self.cards = {}  # task ID -> card
+        self.pool = []
+
+    def __contains__(self, task_id):
+        return task_id in self.cards
+
+    def __iter__(self):
+        return iter(list(self.cards))
+
+    def create_card(self):
+        card = {"task_id": None, "task": None}
+        frame = tk.Frame(self.canvas, bg=CARD_COLOR, bd=2, relief="raised", highlightthickness=2, highlightbackground=CARD_COLOR)
+        card["frame"] = frame
+        card["window"] = self.canvas.create_window(0, 0, window=frame, anchor="nw")
+
+        text = tk.Text(frame, wrap=tk.WORD, width=20, height=3, bg=CARD_COLOR, font=("Helvetica", 10), bd=0)
+        text.pack(padx=5, pady=5)
+        text.bind("<Double-1>", lambda e: self.app.edit_task(card["task_id"], text.get("1.0", tk.END).strip()))
+        card["text"] = text
+
+        check_frame = tk.Frame(frame, bg=CARD_COLOR)
+        check_frame.pack(anchor="w", padx=5)
+        checks = []
+        for flag, handler, selectcolor in (
+            ("completed", self.app.toggle_task_completion, None),
+            ("very_important", self.app.toggle_very_important, "red"),
+            ("semi_important", self.app.toggle_semi_important, "green"),
+        ):
+            var = tk.BooleanVar()
+            options = {"selectcolor": selectcolor} if selectcolor else {}
+            check = tk.Checkbutton(check_frame, variable=var, bg=CARD_COLOR,
+                                   command=lambda handler=handler, var=var: handler(card["task_id"], var.get()), **options)
+            check.pack(side=tk.LEFT, padx=2)
+            card[f"{flag}_var"] = var
+            checks.append(check)
+
+        date_label = tk.Label(frame, font=("Helvetica", 8), bg=CARD_COLOR)
+        date_label.pack(anchor="w", padx=5, pady=2)
+        card["date_label"] = date_label
+
+        for widget in (frame, text, check_frame, *checks, date_label):
+            widget.bind("<Button-1>", lambda e: self.app.start_task_drag(e, card["task_id"]))
+            widget.bind("<B1-Motion>", lambda e: self.app.on_task_drag(e, card["task_id"]))
+            widget.bind("<ButtonRelease-1>", lambda e: self.app.stop_task_drag(e, card["task_id"]))
+        return card
+
+    def sync(self, tasks):
+        shown = set()
+        for task in tasks:
+            self.show(task)
+            shown.add(task.id)
+        for task_id in [task_id for task_id in self.cards if task_id not in shown]:
+            self.remove(task_id)
+
+    def show(self, task):
+        card = self.cards.get(task.id)
+        if card is None:
+            card = self.pool.pop() if self.pool else self.create_card()
+            card["task_id"] = task.id
+            card["task"] = None
+            self.cards[task.id] = card
+            self.set_selected(task.id, False)
+            self.canvas.itemconfigure(card["window"], state="normal")
+        old = card["task"]
+        # Text is only replaced when the stored text changed, so a sync
+        # never clobbers unsaved typing in the card.
+        if old is None or old.task_text != task.task_text:
+            card["text"].delete("1.0", tk.END)
+            card["text"].insert(tk.END, task.task_text)
+        if old is None or (old.x, old.y) != (task.x, task.y):
+            self.canvas.coords(card["window"], task.x, task.y)
+        for flag in ("completed", "very_important", "semi_important"):
+            if old is None or getattr(old, flag) != getattr(task, flag):
+                card[f"{flag}_var"].set(bool(getattr(task, flag)))
+        if old is None or old.created_date != task.created_date:
+            card["date_label"].config(text=f"Created: {task.created_date}")
+        card["task"] = task
+
+    def remove(self, task_id):
+        card = self.cards.pop(task_id, None)
+        if card is None:
+            return
+        if len(self.pool) < POOL_LIMIT:
+            self.canvas.itemconfigure(card["window"], state="hidden")
+            card["task_id"] = None
+            self.pool.append(card)
+        else:
+            self.canvas.delete(card["window"])
+            card["frame"].destroy()
+
+    def position(self, task_id):
+        return self.canvas.coords(self.cards[task_id]["window"])
+
+    def set_selected(self, task_id, selected):
+        self.cards[task_id]["frame"].config(highlightbackground=SELECTED_COLOR if selected else CARD_COLOR)
+
+    def move(self, task_id, dx, dy):
+        card = self.cards[task_id]
+        self.canvas.move(card["window"], dx, dy)
+        task = card["task"]
+        card["task"] = task._replace(x=task.x + dx, y=task.y + dy)
+
+    def clear(self):
+        for task_id in list(self.cards):
+            self.remove(task_id)
+        for card in self.pool:
+            self.canvas.delete(card["window"])
+            card["frame"].destroy()
+        self.pool.clear()
+
+
+# Layout of a lightweight card, relative to its top-left corner.
+CARD_WIDTH = 170
+CARD_HEIGHT = 104
+FLAG_SIZE = 14
+CARD_OUTLINE = "#B8B860"
+FLAGS = (
+    # flag, x offset, fill when set
+    ("completed", 8, "white"),
+    ("very_important", 30, "red"),
+    ("semi_important", 52, "green"),
+)
+
+
+class CanvasCardBoard:
+    # Task cards drawn as plain canvas items: a rectangle, a text item, three
+    # checkbox squares and a date line per card, all tagged "card<id>".
+    # There are no widgets, so a card costs a handful of canvas items and
+    # thousands of cards stay cheap to draw and scroll. Clicks are resolved
+    # through canvas tag bindings; double-clicking the text opens a Text
+    # editor over the card until it loses focus.
+
+    def __init__(self, canvas, app):
+        self.canvas = canvas
+        self.app = app
+        self.cards = {}  # task ID -> {"task": Task, "items": {...}}
+        self.item_tasks = {}  # canvas item ID -> task ID
+        self.editor = None
+        canvas.tag_bind("card", "<Button-1>", lambda e: self.dispatch(self.app.start_task_drag, e))
+        canvas.tag_bind("card", "<B1-Motion>", lambda e: self.dispatch(self.app.on_task_drag, e))
+        canvas.tag_bind("card", "<ButtonRelease-1>", lambda e: self.dispatch(self.app.stop_task_drag, e))
+        canvas.tag_bind("card_text", "<Double-1>", self.open_editor)
+        for flag, _, _ in FLAGS:
+            canvas.tag_bind(f"flag_{flag}", "<ButtonRelease-1>", lambda e, flag=flag: self.toggle_flag(flag))
+
+    def __contains__(self, task_id):
+        return task_id in self.cards
+
+    def __iter__(self):
+        return iter(list(self.cards))
+
+    def current_task(self):
+        items = self.canvas.find_withtag("current")
+        return self.item_tasks.get(items[0]) if items else None
+
+    def dispatch(self, handler, event):
+        task_id = self.current_task()
+        if task_id is not None:
+            handler(event, task_id)
+
+    def toggle_flag(self, flag):
+        # Flag items carry the "card" tag too, so the release that ends a
+        # drag started on a checkbox arrives here after stop_task_drag.
+        task_id = self.current_task()
+        if task_id is None or self.app.task_drag_moved:
+            return
+        task = self.cards[task_id]["task"]
+        value = not getattr(task, flag)
+        self.show(task._replace(**{flag: int(value)}))
+        handler = {
+            "completed": self.app.toggle_task_completion,
+            "very_important": self.app.toggle_very_important,
+            "semi_important": self.app.toggle_semi_important,
+        }[flag]
+        handler(task_id, value)
+
+    def create_card(self, task):
+        tag = f"card{task.id}"
+        x, y = task.x, task.y
+        tags = ("card", tag)
+        items = {
+            "body": self.canvas.create_rectangle(x, y, x + CARD_WIDTH, y + CARD_HEIGHT, fill=CARD_COLOR, outline=CARD_OUTLINE, width=2, tags=tags),
+            "text": self.canvas.create_text(x + 8, y + 6, anchor="nw", width=CARD_WIDTH - 16, font=("Helvetica", 10), tags=(*tags, "card_text")),
+            "date": self.canvas.create_text(x + 8, y + CARD_HEIGHT - 18, anchor="nw", font=("Helvetica", 8), tags=tags),
+        }
+        for flag, offset, _ in FLAGS:
+            items[flag] = self.canvas.create_rectangle(
+                x + offset, y + 62, x + offset + FLAG_SIZE, y + 62 + FLAG_SIZE, fill="white", outline="black",
+                tags=(*tags, f"flag_{flag}"))
+        items["check"] = self.canvas.create_text(x + 8 + FLAG_SIZE / 2, y + 62 + FLAG_SIZE / 2, text="✓", state="hidden",
+                                                 font=("Helvetica", 10, "bold"), tags=(*tags, "flag_completed"))
+        for item in items.values():
+            self.item_tasks[item] = task.id
+        return {"task": None, "items": items}
+
+    def sync(self, tasks):
+        shown = set()
+        for task in tasks:
+            self.show(task)
+            shown.add(task.id)
+        for task_id in [task_id for task_id in self.cards if task_id not in shown]:
+            self.remove(task_id)
+
+    def show(self, task):
+        card = self.cards.get(task.id)
+        if card is None:
+            card = self.cards[task.id] = self.create_card(task)
+        old, items = card["task"], card["items"]
+        if old is None or old.task_text != task.task_text:
+            self.canvas.itemconfigure(items["text"], text=task.task_text)
+        if old is not None and (old.x, old.y) != (task.x, task.y):
+            self.canvas.move(f"card{task.id}", task.x - old.x, task.y - old.y)
+        for flag, _, fill in FLAGS:
+            if old is None or getattr(old, flag) != getattr(task, flag):
+                self.canvas.itemconfigure(items[flag], fill=fill if getattr(task, flag) else "white")
+        if old is None or old.completed != task.completed:
+            self.canvas.itemconfigure(items["check"], state="normal" if task.completed else "hidden")
+        if old is None or old.created_date != task.created_date:
+            self.canvas.itemconfigure(items["date"], text=f"Created: {task.created_date}")
+        card["task"] = task
+
+    def remove(self, task_id):
+        card = self.cards.pop(task_id, None)
+        if card is None:
+            return
+        for item in card["items"].values():
+            del self.item_tasks[item]
+        self.canvas.delete(f"card{task_id}")
+
+    def clear(self):
+        self.close_editor()
+        for task_id in list(self.cards):
+            self.remove(task_id)
+
+    def position(self, task_id):
+        task = self.cards[task_id]["task"]
+        return task.x, task.y
+
+    def set_selected(self, task_id, selected):
+        self.canvas.itemconfigure(self.cards[task_id]["items"]["body"],
+                                  outline=SELECTED_COLOR if selected else CARD_OUTLINE, width=3 if selected else 2)
+
+    def move(self, task_id, dx, dy):
+        card = self.cards[task_id]
+        self.canvas.move(f"card{task_id}", dx, dy)
+        task = card["task"]
+        card["task"] = task._replace(x=task.x + dx, y=task.y + dy)
+
+    def open_editor(self, event):
+        task_id = self.current_task()
+        if task_id is None:
+            return
+        self.close_editor()
+        task = self.cards[task_id]["task"]
+        text = tk.Text(self.canvas, wrap=tk.WORD, width=20, height=3, bg=CARD_COLOR, font=("Helvetica", 10), bd=0)
+        text.insert(tk.END, task.task_text)
+        window = self.canvas.create_window(task.x + 4, task.y + 4, window=text, anchor="nw")
+        self.editor = (task_id, text, window)
+        text.bind("<FocusOut>", lambda e: self.close_editor())
+        text.bind("<Escape>", lambda e: self.close_editor(save=False))
+        text.focus_set()
+
+    def close_editor(self, save=True):
+        if self.editor is None:
+            return
+        task_id, text, window = self.editor
+        self.editor = None
+        new_text = text.get("1.0", tk.END).strip()
+        self.canvas.delete(window)
+        text.destroy()
+        if save and task_id in self.cards and new_text != self.cards[task_id]["task"].task_text:
+            self.show(self.cards[task_id]["task"]._replace(task_text=new_text))
+            self.app.edit_task(task_id, new_text)
@@ -0,0 +1,98 @@
+import tkinter as tk
+
+# The tip appears once the pointer has rested on a cell this long; moving
+# on to another cell with a tip while one is shown updates it at once.
+HOVER_DELAY_MS = 400
+
+
+class CellTooltip:
+    # Hover tips for a ttk.Treeview, one per (row, column) cell.
+    #
+    # A single borderless Toplevel is created on first use and then only
+    # withdrawn and re-shown. <Motion> is cheap while the pointer stays in
+    # the current cell: its bounding box is cached, so nothing is asked of
+    # Tk until the pointer leaves it. On a cell change `summary(item,
+    # column)` is called once and should only look up precomputed text;
+    # None means the cell has no tip. Call reset() whenever rows move under
+    # a still pointer (scrolling, reloading, expanding). The tree's own
+    # <Button-1> handler must be bound with add="+" to keep the reset.
+
+    def __init__(self, tree, summary, delay_ms=HOVER_DELAY_MS):
+        self.tree = tree
+        self.summary = summary
+        self.delay_ms = delay_ms
+        self.window = None
+        self.label = None
+        self.cell = None  # (item, column) under the pointer
+        self.cell_box = None  # its bounding box in tree coordinates
+        self.text = None
+        self.pointer = (0, 0)
+        self.visible = False
+        self.job = None
+        tree.bind("<Motion>", self.on_motion, add="+")
+        tree.bind("<Leave>", lambda e: self.reset(), add="+")
+        # Tk runs only the most specific binding per tag, so a <Button-1>
+        # bound by the owner would hide <ButtonPress>; both are bound.
+        tree.bind("<ButtonPress>", lambda e: self.reset(), add="+")
+        tree.bind("<Button-1>", lambda e: self.reset(), add="+")
+
+    def on_motion(self, event):
+        self.pointer = (event.x_root, event.y_root)
+        box = self.cell_box
+        if box and box[0] <= event.x < box[2] and box[1] <= event.y < box[3]:
+            return
+        item = self.tree.identify_row(event.y)
+        column = self.tree.identify_column(event.x) if item else ""
+        cell = (item, column) if item and column else None
+        if cell == self.cell:
+            return
+        self.cell = cell
+        bbox = self.tree.bbox(item, column) if cell else ""
+        if bbox:
+            x, y, width, height = bbox
+            self.cell_box = (x, y, x + width, y + height)
+        else:
+            self.cell_box = None
+        text = self.summary(item, column) if cell else None
+        if text is None:
+            self.hide()
+        elif self.visible:
+            self.show(text)
+        else:
+            self.cancel()
+            self.job = self.tree.after(self.delay_ms, lambda: self.show(text))
+
+    def show(self, text):
+        self.job = None
+        if self.window is None:
+            self.window = tk.Toplevel(self.tree)
+            self.window.wm_overrideredirect(True)
+            self.window.withdraw()
+            self.label = tk.Label(self.window, bg="lightyellow", fg="black", borderwidth=1, relief="solid",
+                                  padx=5, pady=5, justify=tk.LEFT)
+            self.label.pack()
+        if text != self.text:
+            self.text = text
+            self.label.config(text=text)
+        x, y = self.pointer
+        self.window.wm_geometry(f"+{x + 10}+{y + 10}")
+        if not self.visible:
+            self.window.deiconify()
+            self.window.lift()
+            self.visible = True
+
+    def cancel(self):
+        if self.job is not None:
+            self.tree.after_cancel(self.job)
+            self.job = None
+
+    def hide(self):
+        self.cancel()
+        if self.visible:
+            self.window.withdraw()
+            self.visible = False
+
+    def reset(self):
+        self.cell = None
+        self.cell_box = None
+        self.hide()
@@ -1,187 +1,98 @@
+import sys
+
+if __name__ == "__main__" and len(sys.argv) > 1:
+    # Command-line use (work_tracker.py start <category>, ...); see cli.py.
+    # Dispatched before the GUI imports, so it never loads tkinter.
+    import cli
+    sys.exit(cli.main())
+
 import tkinter as tk
-from tkinter import ttk, messagebox, simpledialog
+from tkinter import ttk, messagebox, simpledialog, font as tkfont
 import sqlite3
 from datetime import datetime, date, timedelta
+import bisect
+import heapq
 import time
 import os
-import sys
 import uuid
-import shutil
 import logging
 
-def get_base_path():
-    if getattr(sys, 'frozen', False):
-        return os.path.dirname(sys.executable)
-    else:
-        return os.path.dirname(os.path.abspath(__file__))
-
-def get_db_path():
-    base_path = get_base_path()
-    db_name = "work_tracker.db"
-    db_path = os.path.join(base_path, db_name)
-    
-    debug_db_path = r"D:\projects\work tracker\work_tracker.db"
-    if os.path.exists(debug_db_path) and not getattr(sys, 'frozen', False):
-        return debug_db_path
-    
-    if getattr(sys, 'frozen', False):
-        user_db_path = os.path.join(os.path.expanduser("~"), db_name)
-        if not os.path.exists(user_db_path) and os.path.exists(db_path):
-            try:
-                shutil.copy(db_path, user_db_path)
-                print(f"Copied database to {user_db_path}")
-                logging.info(f"Copied database to {user_db_path}")
-            except Exception as e:
-                print(f"Failed to copy database to user directory: {e}")
-                logging.error(f"Failed to copy database to user directory: {e}")
-        return user_db_path
-    
-    return db_path
-
-logging.basicConfig(
-    filename=os.path.join(get_base_path(), "work_tracker.log"),
-    level=logging.DEBUG,
-    format="%(asctime)s - %(levelname)s - %(message)s"
-)
-
-BASE_PATH = get_base_path()
-DB_PATH = get_db_path()
-
-try:
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute("PRAGMA foreign_keys = ON")
-    logging.info(f"Connected to database at {DB_PATH}")
-except sqlite3.Error as e:
-    logging.error(f"Database connection error: {e}")
-    print(f"Database connection error: {e}")
-    sys.exit(1)
-
-try:
-    cursor.execute("PRAGMA table_info(categories)")
-    cat_columns = [col[1] for col in cursor.fetchall()]
-    if cat_columns != ["name"]:
-        cursor.execute("DROP TABLE IF EXISTS categories")
-        cursor.execute("CREATE TABLE categories (name TEXT PRIMARY KEY)")
-
-    cursor.execute("PRAGMA table_info(logs)")
-    log_columns = [col[1] for col in cursor.fetchall()]
-    expected_log_columns = ["id", "name", "date", "time_spent", "completed", "outcome"]
-    if log_columns != expected_log_columns:
-        cursor.execute("DROP TABLE IF EXISTS logs")
-        cursor.execute("""
-            CREATE TABLE logs (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL,
-                date TEXT NOT NULL,
-                time_spent INTEGER,
-                completed INTEGER,
-                outcome TEXT,
-                FOREIGN KEY (name) REFERENCES categories(name)
-            )
-        """)
-
-    cursor.execute("PRAGMA table_info(tasks)")
-    task_columns = [col[1] for col in cursor.fetchall()]
-    expected_task_columns = ["id", "task_text", "created_date", "x", "y", "completed", "completed_time", "very_important", "semi_important"]
-    if task_columns != expected_task_columns:
-        cursor.execute("DROP TABLE IF EXISTS tasks")
-        cursor.execute("""
-            CREATE TABLE tasks (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                task_text TEXT NOT NULL,
-                created_date TEXT NOT NULL,
-                x REAL NOT NULL DEFAULT 50,
-                y REAL NOT NULL DEFAULT 50,
-                completed INTEGER NOT NULL,
-                completed_time TEXT,
-                very_important INTEGER DEFAULT 0,
-                semi_important INTEGER DEFAULT 0
-            )
-        """)
-
-    cursor.execute("PRAGMA table_info(playground_elements)")
-    playground_columns = [col[1] for col in cursor.fetchall()]
-    expected_playground_columns = ["id", "element_type", "x1", "y1", "x2", "y2", "color", "width", "text", "created_date"]
-    if playground_columns != expected_playground_columns:
-        cursor.execute("DROP TABLE IF EXISTS playground_elements")
-        cursor.execute("""
-            CREATE TABLE playground_elements (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                element_type TEXT NOT NULL,  -- 'line', 'square', 'circle', 'arrow', 'text'
-                x1 REAL NOT NULL,           -- Starting x-coordinate
-                y1 REAL NOT NULL,           -- Starting y-coordinate
-                x2 REAL,                    -- Ending x-coordinate (null for text)
-                y2 REAL,                    -- Ending y-coordinate (null for text)
-                color TEXT,                 -- Color of the element
-                width REAL,                 -- Line width or shape outline width
-                text TEXT,                  -- Text content for text elements
-                created_date TEXT NOT NULL  -- Date of creation
-            )
-        """)
-
-    try:
-        cursor.execute("ALTER TABLE logs ADD COLUMN outcome TEXT")
-    except sqlite3.OperationalError as e:
-        if "duplicate column name" not in str(e).lower():
-            logging.error(f"Migration error: {e}")
-            print(f"Migration error: {e}")
-
-    cursor.execute("PRAGMA table_info(categories)")
-    logging.info("Categories table schema: " + str(cursor.fetchall()))
-    cursor.execute("PRAGMA table_info(logs)")
-    logging.info("Logs table schema: " + str(cursor.fetchall()))
-    cursor.execute("PRAGMA table_info(tasks)")
-    logging.info("Tasks table schema: " + str(cursor.fetchall()))
-    cursor.execute("PRAGMA table_info(playground_elements)")
-    logging.info("Playground elements table schema: " + str(cursor.fetchall()))
-    conn.commit()
-except sqlite3.Error as e:
-    logging.error(f"Database setup error: {e}")
-    print(f"Database setup error: {e}")
-    sys.exit(1)
-
-try:
-    cursor.execute("SELECT COUNT(*) FROM categories")
-    if cursor.fetchone()[0] == 0:
-        default_categories = ["Project Work", "Projects", "Job Applications"]
-        for cat in default_categories:
-            cursor.execute("INSERT INTO categories (name) VALUES (?)", (cat,))
-            logging.info(f"Inserted default category '{cat}'")
-    conn.commit()
-except sqlite3.Error as e:
-    logging.error(f"Error inserting default categories: {e}")
-    print(f"Error inserting default categories: {e}")
-    sys.exit(1)
-
-try:
-    cursor.execute("SELECT name FROM categories")
-    categories = cursor.fetchall()
-    logging.info(f"Current categories: {categories}")
-except sqlite3.Error as e:
-    logging.error(f"Error fetching categories: {e}")
+import snapshots
+import spatial
+import strokes
+import task_cards
+import tooltips
+from config import DURABILITY, configure_logging, get_db_path, open_database, set_log_level
+from read_executor import ReadExecutor
+from session_timer import SessionTimer
+from storage import Task
+from write_behind import WriteBehind
+
+LOG_PAGE_SIZE = 60
+COMPLETED_PAGE_SIZE = 100
+BACKGROUND_PUMP_INTERVAL_MS = 50
+# A click erases the closest element within ERASER_HALO pixels; dragging
+# erases everything within ERASER_BRUSH_SCALE * line width.
+ERASER_HALO = 10
+ERASER_BRUSH_SCALE = 4
+# Only elements within PLAYGROUND_MARGIN pixels of the visible area have
+# canvas items. The padded view is snapped out to PLAYGROUND_TILE squares,
+# so scrolling within the same tiles creates or destroys nothing.
+PLAYGROUND_REGION = (0, 0, 1000, 1000)
+PLAYGROUND_TILE = 512
+PLAYGROUND_MARGIN = 256
+# Elements brought back by an undo are added this many per event-loop turn.
+REPLAY_BATCH = 500
+# Past days with drawings shown as thumbnails under the playground.
+HISTORY_DAYS = 14
+# Card drags are applied at most once per frame, and the resulting positions
+# are written together once no drag has ended for POSITION_DEBOUNCE_MS.
+DRAG_FRAME_MS = 16
+POSITION_DEBOUNCE_MS = 400
+CONTROL_MASK = 0x0004
+# Completed tasks are removed this long after completion.
+COMPLETED_TASK_TTL = timedelta(hours=1)
 
 class WorkTrackerApp:
-    def __init__(self, root):
+    def __init__(self, root, db, writer, reader):
+        startup_began = time.perf_counter()
         self.root = root
+        self.db = db
+        self.writer = writer
+        self.reader = reader
         self.root.title("Task Tracker Application")
         self.root.geometry("800x600")
         
         self.active_category = ""
-        self.start_time = None
-        self.paused_time = 0
-        self.paused = False
+        self.session_timer = SessionTimer(root, self.show_elapsed, self.checkpoint_session)
         self.category_frames = {}
         self.category_buttons = {}
-        self.stopwatch_running = False
-        self.tooltip = None
-        self.outcomes = {}
+        self.cell_summaries = {}  # (date, category) -> hover text for the log grid
+        self.log_row_dates = {}  # log grid item -> date
         self.overlay = None
+        self.overlay_visible = False
         self.drag_data = {"x": 0, "y": 0, "widget": None}
         self.expanded_rows = {}
+        self.log_rows = {}
+        self.log_search_date = None
+        self.log_oldest_date = None
+        self.log_exhausted = True
+        self.log_loading = False
+        self.log_grid_pending = False
+        self.log_refreshed_dates = set()
         self.categories = []
-        self.task_cards = {}
         self.dragging_task = None
+        self.selected_tasks = set()
+        self.task_drag_delta = [0, 0]
+        self.task_drag_moved = False
+        self.task_drag_job = None
+        self.pending_positions = {}
+        self.position_job = None
+        self.expiry_heap = []  # (deadline, task ID) of completed tasks
+        self.expiry_job = None
+        self.completed_last_key = None  # (completed_time, id) of the last row shown
+        self.completed_exhausted = True
+        self.completed_loading = False
         
         # Create notebook for tabbed interface
         self.notebook = ttk.Notebook(root)
@@ -267,9 +178,9 @@ class WorkTrackerApp:
         self.log_frame.pack(pady=10, fill=tk.BOTH, expand=True)
         self.log_tree = ttk.Treeview(self.log_frame, show="headings")
         self.log_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar = ttk.Scrollbar(self.log_frame, orient=tk.VERTICAL, command=self.log_tree.yview)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        self.log_tree.configure(yscrollcommand=scrollbar.set)
+        self.log_scrollbar = ttk.Scrollbar(self.log_frame, orient=tk.VERTICAL, command=self.log_tree.yview)
+        self.log_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.log_tree.configure(yscrollcommand=self.on_log_scroll)
         
         style = ttk.Style()
         style.configure("Treeview", font=("Helvetica", 8))
@@ -277,10 +188,9 @@ class WorkTrackerApp:
         style.configure("Completed.Treeview", foreground="green")
         style.configure("NotCompleted.Treeview", foreground="red")
         
-        self.log_tree.bind("<Motion>", self.show_tooltip)
-        self.log_tree.bind("<Leave>", self.hide_tooltip)
+        self.log_tooltip = tooltips.CellTooltip(self.log_tree, self.log_cell_summary)
         self.log_tree.bind("<Double-1>", self.show_row_details)
-        self.log_tree.bind("<Button-1>", self.toggle_expand)
+        self.log_tree.bind("<Button-1>", self.toggle_expand, add="+")
         
         self.status_label = tk.Label(self.tracker_frame, text="Status: Idle")
         self.status_label.pack(pady=5)
@@ -289,20 +199,85 @@ class WorkTrackerApp:
         self.date_label = tk.Label(self.tracker_frame, text=f"Date: {date.today()}")
         self.date_label.pack(pady=5)
         
-        # Setup notes frame (whiteboard)
+        # Tool variables
+        self.current_tool = tk.StringVar(value="pen")
+        self.current_color = tk.StringVar(value="black")
+        self.line_width = tk.DoubleVar(value=2.0)
+        self.start_x = None
+        self.start_y = None
+        self.current_element = None
+        self.current_stroke = None
+        self.moving_element = None
+        self.erased_elements = []  # database IDs the current eraser stroke has passed over
+        self.playground_elements = {}  # database ID -> canvas element ID, for items on the canvas
+        self.playground_records = {}  # database ID -> (type, coords, color, width, text), for every element of the day
+        self.playground_index = spatial.GridIndex()  # keyed by database ID
+        self.playground_tiles = None
+        self.playground_region = None
+        self.viewport_job = None
+        self.infinite_canvas = tk.BooleanVar(value=False)
+        self.playground_font = tkfont.Font(family="Helvetica", size=12)
+        self.history_images = []  # PhotoImages must outlive their buttons
+        self.day_id = date.today()
+
+        # Notes, Completed Tasks and Play Ground are built and loaded the
+        # first time they are selected; until then these stay None.
+        self.lightweight_cards = tk.BooleanVar(value=os.environ.get("WORK_TRACKER_LIGHTWEIGHT_CARDS") == "1")
+        self.task_board = None
+        self.completed_tree = None
+        self.playground_canvas = None
+        self.tab_builders = {
+            str(self.notes_frame): self.build_notes_tab,
+            str(self.completed_frame): self.build_completed_tab,
+            str(self.playground_frame): self.build_playground_tab,
+        }
+        self.notebook.bind("<<NotebookTabChanged>>", self.on_tab_changed)
+        self.root.bind_all("<Control-Alt-d>", self.toggle_debug_logging)
+
+        # load_categories also fills the log grid (on the read pool); the
+        # rest of the Tracker tab is filled once the window is up.
+        self.load_categories()
+        self.pump_background()
+        self.root.after_idle(lambda: self.finish_startup(startup_began))
+
+    def toggle_debug_logging(self, event=None):
+        level = logging.INFO if logging.getLogger().isEnabledFor(logging.DEBUG) else logging.DEBUG
+        set_log_level(level)
+        logging.warning("Log level set to %s", logging.getLevelName(level))
+
+    def finish_startup(self, startup_began=None):
+        self.restore_session()
+        self.load_important_tasks()
+        self.load_expiry_schedule()
+        if startup_began is not None:
+            logging.info("Startup finished in %.1fms", (time.perf_counter() - startup_began) * 1000)
+
+    def on_tab_changed(self, event):
+        tab = self.notebook.select()
+        builder = self.tab_builders.pop(tab, None)
+        if builder:
+            start = time.perf_counter()
+            builder()
+            logging.info("Built %s tab in %.1fms", self.notebook.tab(tab, 'text'), (time.perf_counter() - start) * 1000)
+
+    def build_notes_tab(self):
         self.task_input_frame = tk.Frame(self.notes_frame)
         self.task_input_frame.pack(fill=tk.X, padx=5, pady=5)
         self.task_input = tk.Entry(self.task_input_frame)
         self.task_input.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
         tk.Button(self.task_input_frame, text="Add Task", command=self.add_task).pack(side=tk.LEFT, padx=5)
+        tk.Checkbutton(self.task_input_frame, text="Lightweight cards", variable=self.lightweight_cards,
+                       command=self.switch_card_mode).pack(side=tk.LEFT, padx=5)
         
         self.whiteboard = tk.Canvas(self.notes_frame, bg="grey", scrollregion=(0, 0, 800, 600))
         self.whiteboard.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         scrollbar = ttk.Scrollbar(self.notes_frame, orient=tk.VERTICAL, command=self.whiteboard.yview)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         self.whiteboard.configure(yscrollcommand=scrollbar.set)
-        
-        # Setup completed tasks frame
+        self.task_board = self.create_task_board()
+        self.load_tasks()
+
+    def build_completed_tab(self):
         self.completed_tree = ttk.Treeview(self.completed_frame, columns=("Task", "Created", "Completed"), show="headings")
         self.completed_tree.heading("Task", text="Task")
         self.completed_tree.heading("Created", text="Created Date")
@@ -311,23 +286,16 @@ class WorkTrackerApp:
         self.completed_tree.column("Created", width=150)
         self.completed_tree.column("Completed", width=150)
         self.completed_tree.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
-        completed_scrollbar = ttk.Scrollbar(self.completed_frame, orient=tk.VERTICAL, command=self.completed_tree.yview)
-        completed_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        self.completed_tree.configure(yscrollcommand=completed_scrollbar.set)
-        
+        self.completed_scrollbar = ttk.Scrollbar(self.completed_frame, orient=tk.VERTICAL, command=self.completed_tree.yview)
+        self.completed_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.completed_tree.configure(yscrollcommand=self.on_completed_scroll)
+        self.load_completed_tasks()
+
+    def build_playground_tab(self):
         # Toolbar for playground tools
         self.toolbar = tk.Frame(self.playground_frame, bd=1, relief="raised")
         self.toolbar.pack(side=tk.TOP, fill=tk.X, padx=5, pady=5)
 
-        # Tool variables
-        self.current_tool = tk.StringVar(value="pen")
-        self.current_color = tk.StringVar(value="black")
-        self.line_width = tk.DoubleVar(value=2.0)
-        self.start_x = None
-        self.start_y = None
-        self.current_element = None
-        self.playground_elements = {}  # Store canvas element IDs
-
         # Tool buttons
         tools = [
             ("Pen", "pen"),
@@ -335,7 +303,8 @@ class WorkTrackerApp:
             ("Text", "text"),
             ("Square", "square"),
             ("Circle", "circle"),
-            ("Arrow", "arrow")
+            ("Arrow", "arrow"),
+            ("Move", "move")
         ]
         for text, tool in tools:
             tk.Radiobutton(self.toolbar, text=text, variable=self.current_tool, value=tool, command=self.select_tool).pack(side=tk.LEFT, padx=5)
@@ -351,55 +320,209 @@ class WorkTrackerApp:
 
         # Clear canvas button
         tk.Button(self.toolbar, text="Clear All", command=self.clear_canvas).pack(side=tk.RIGHT, padx=5)
+        tk.Button(self.toolbar, text="Redo", command=self.redo_playground).pack(side=tk.RIGHT, padx=5)
+        tk.Button(self.toolbar, text="Undo", command=self.undo_playground).pack(side=tk.RIGHT, padx=5)
+        tk.Checkbutton(self.toolbar, text="Infinite", variable=self.infinite_canvas, command=self.toggle_infinite_canvas).pack(side=tk.RIGHT, padx=5)
+
+        # History strip
+        self.history_strip = tk.Frame(self.playground_frame)
+        self.history_strip.pack(side=tk.BOTTOM, fill=tk.X, padx=5)
 
         # Playground canvas
-        self.playground_canvas = tk.Canvas(self.playground_frame, bg="white", scrollregion=(0, 0, 1000, 1000))
-        self.playground_canvas.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        self.playground_canvas = tk.Canvas(self.playground_frame, bg="white", scrollregion=PLAYGROUND_REGION)
         scrollbar = ttk.Scrollbar(self.playground_frame, orient=tk.VERTICAL, command=self.playground_canvas.yview)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        self.playground_canvas.configure(yscrollcommand=scrollbar.set)
+        x_scrollbar = ttk.Scrollbar(self.playground_frame, orient=tk.HORIZONTAL, command=self.playground_canvas.xview)
+        x_scrollbar.pack(side=tk.BOTTOM, fill=tk.X)
+        self.playground_canvas.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        # Tk calls the scroll commands whenever the view moves or resizes.
+        self.playground_canvas.configure(
+            yscrollcommand=lambda first, last: self.on_playground_scroll(scrollbar, first, last),
+            xscrollcommand=lambda first, last: self.on_playground_scroll(x_scrollbar, first, last),
+        )
 
         # Bind mouse events for drawing
         self.playground_canvas.bind("<Button-1>", self.start_drawing)
         self.playground_canvas.bind("<B1-Motion>", self.draw_drawing)
         self.playground_canvas.bind("<ButtonRelease-1>", self.stop_drawing)
+        self.playground_canvas.bind("<Control-z>", lambda e: self.undo_playground())
+        self.playground_canvas.bind("<Control-y>", lambda e: self.redo_playground())
+        self.playground_canvas.bind("<Control-Z>", lambda e: self.redo_playground())
 
-        self.load_categories()
-        self.load_tasks()
-        self.load_completed_tasks()
-        self.load_important_tasks()
-        self.update_log_display()
         self.load_playground_elements()
-        self.update_countdown()
+        self.load_history_strip()
+
+    def write(self, op, on_done=None, error_message="Failed to save changes", key=None):
+        def failed(e):
+            logging.error("%s: %s", error_message, e)
+            messagebox.showerror("Error", f"{error_message}: {e}")
+        self.writer.submit(op, on_done, failed, key)
+
+    def pump_background(self):
+        # Runs callbacks posted by the write-behind and read threads.
+        self.writer.drain()
+        self.reader.drain()
+        self.root.after(BACKGROUND_PUMP_INTERVAL_MS, self.pump_background)
 
     def load_playground_elements(self):
         for db_id, canvas_id in list(self.playground_elements.items()):
             self.playground_canvas.delete(canvas_id)
         self.playground_elements.clear()
+        self.playground_records.clear()
+        self.playground_index.clear()
+        self.playground_tiles = None
 
+        day = self.day_id.isoformat()
         try:
-            cursor.execute("SELECT id, element_type, x1, y1, x2, y2, color, width, text FROM playground_elements WHERE created_date = ?",
-                           (self.day_id.isoformat(),))
-            elements = cursor.fetchall()
-            for element in elements:
-                db_id, element_type, x1, y1, x2, y2, color, width, text = element
-                if element_type == "text":
-                    canvas_id = self.playground_canvas.create_text(x1, y1, text=text, fill=color, anchor="nw", font=("Helvetica", 12))
-                elif element_type == "square":
-                    canvas_id = self.playground_canvas.create_rectangle(x1, y1, x2, y2, outline=color, width=width)
-                elif element_type == "circle":
-                    canvas_id = self.playground_canvas.create_oval(x1, y1, x2, y2, outline=color, width=width)
-                elif element_type == "arrow":
-                    canvas_id = self.playground_canvas.create_line(x1, y1, x2, y2, fill=color, width=width, arrow=tk.LAST)
-                elif element_type == "pen":
-                    canvas_id = self.playground_canvas.create_line(x1, y1, x2, y2, fill=color, width=width, capstyle=tk.ROUND)
-                self.playground_elements[db_id] = canvas_id
-            logging.info(f"Loaded {len(elements)} playground elements for {self.day_id}")
+            snapshot = self.db.playground.snapshot(day)
+            if snapshot and snapshot.content_hash == self.db.playground.content_hash(day):
+                for record in snapshots.read_display_list(snapshot.display_list):
+                    self.register_element(*record)
+                logging.info("Loaded %s playground elements for %s from snapshot", len(self.playground_records), day)
+            else:
+                elements = self.db.playground.elements_for_date(day)
+                for element in elements:
+                    self.register_row(element)
+                # Built off the UI thread from exactly the rows just loaded,
+                # so later edits cannot slip into a snapshot that claims to
+                # match them.
+                records = dict(self.playground_records)
+                self.reader.submit(("snapshot", day),
+                                   lambda db: snapshots.build_snapshot(snapshots.elements_hash(elements), records),
+                                   lambda snapshot: self.write(lambda db: db.playground.save_snapshot(day, snapshot),
+                                                               error_message="Failed to save playground snapshot"),
+                                   lambda e: logging.error("Failed to build playground snapshot: %s", e))
+                logging.info("Loaded %s playground elements for %s", len(elements), day)
         except sqlite3.Error as e:
-            logging.error(f"Failed to load playground elements: {e}")
+            logging.error("Failed to load playground elements: %s", e)
             messagebox.showerror("Error", f"Failed to load playground elements: {e}")
+        self.refresh_viewport()
+
+    def register_row(self, element):
+        self.register_element(element.id, element.element_type, snapshots.element_coords(element),
+                              element.color, element.width, element.text)
+
+    def load_history_strip(self):
+        today = date.today().isoformat()
+        def query(db):
+            return [(day, *db.playground.current_snapshot(day))
+                    for day in db.playground.drawn_dates(HISTORY_DAYS + 1) if day != today][:HISTORY_DAYS]
+        self.reader.submit("history", query, self.show_history_strip,
+                           lambda e: logging.error("Failed to load playground history: %s", e))
+
+    def show_history_strip(self, days):
+        for widget in self.history_strip.winfo_children():
+            widget.destroy()
+        self.history_images.clear()
+        today = date.today()
+        tk.Button(self.history_strip, text="Today", relief=tk.SUNKEN if self.day_id == today else tk.RAISED,
+                  command=lambda: self.show_playground_day(today)).pack(side=tk.LEFT, padx=2, pady=2)
+        for day, snapshot, fresh in days:
+            if fresh:
+                self.write(lambda db, day=day, snapshot=snapshot: db.playground.save_snapshot(day, snapshot),
+                           error_message="Failed to save playground snapshot")
+            image = tk.PhotoImage(data=snapshots.thumbnail_ppm(snapshot.thumbnail), format="ppm")
+            self.history_images.append(image)
+            day = date.fromisoformat(day)
+            tk.Button(self.history_strip, text=day.strftime("%b %d"), image=image, compound=tk.TOP,
+                      relief=tk.SUNKEN if self.day_id == day else tk.RAISED,
+                      command=lambda day=day: self.show_playground_day(day)).pack(side=tk.LEFT, padx=2, pady=2)
+
+    def show_playground_day(self, day):
+        if day == self.day_id:
+            return
+        self.day_id = day
+        self.load_playground_elements()
+        self.load_history_strip()
+
+    def register_element(self, db_id, element_type, coords, color, width, text=None):
+        # Records a saved element in the index; refresh_viewport decides
+        # whether it gets a canvas item.
+        if element_type == "text":
+            x, y = coords
+            box = (x, y, x + self.playground_font.measure(text), y + self.playground_font.metrics("linespace"))
+            geometry = spatial.element_geometry("text", box, width)
+        else:
+            geometry = spatial.element_geometry(element_type, coords, width)
+            if element_type == "pen":
+                coords = geometry[1]
+        self.playground_index.insert(db_id, *geometry)
+        self.playground_records[db_id] = (element_type, coords, color, width, text)
+
+    def materialize_element(self, db_id):
+        element_type, coords, color, width, text = self.playground_records[db_id]
+        if element_type == "text":
+            canvas_id = self.playground_canvas.create_text(*coords, text=text, fill=color, anchor="nw", font=self.playground_font)
+        elif element_type == "square":
+            canvas_id = self.playground_canvas.create_rectangle(*coords, outline=color, width=width)
+        elif element_type == "circle":
+            canvas_id = self.playground_canvas.create_oval(*coords, outline=color, width=width)
+        elif element_type == "arrow":
+            canvas_id = self.playground_canvas.create_line(*coords, fill=color, width=width, arrow=tk.LAST)
+        else:
+            canvas_id = self.playground_canvas.create_line(*coords, fill=color, width=width, capstyle=tk.ROUND, joinstyle=tk.ROUND)
+        self.playground_elements[db_id] = canvas_id
+        return canvas_id
+
+    def dematerialize_element(self, db_id):
+        canvas_id = self.playground_elements.pop(db_id, None)
+        if canvas_id is not None:
+            self.playground_canvas.delete(canvas_id)
+
+    def on_playground_scroll(self, scrollbar, first, last):
+        scrollbar.set(first, last)
+        if self.viewport_job is None:
+            self.viewport_job = self.root.after_idle(self.refresh_viewport)
+
+    def toggle_infinite_canvas(self):
+        self.playground_tiles = None
+        self.refresh_viewport()
+
+    def refresh_viewport(self):
+        self.viewport_job = None
+        canvas = self.playground_canvas
+        left, top = canvas.canvasx(0), canvas.canvasy(0)
+        right, bottom = canvas.canvasx(canvas.winfo_width()), canvas.canvasy(canvas.winfo_height())
+
+        if self.infinite_canvas.get():
+            # Keep a screen of room past the view in every direction, so the
+            # region grows as far as the user scrolls.
+            width, height = right - left, bottom - top
+            region = [left - width, top - height, right + width, bottom + height]
+            extent = self.playground_index.extent or PLAYGROUND_REGION
+            region = (min(region[0], extent[0], PLAYGROUND_REGION[0]), min(region[1], extent[1], PLAYGROUND_REGION[1]),
+                      max(region[2], extent[2], PLAYGROUND_REGION[2]), max(region[3], extent[3], PLAYGROUND_REGION[3]))
+        else:
+            region = PLAYGROUND_REGION
+        region = tuple(int(value) for value in region)
+        # Setting the region triggers the scroll commands again, so only do
+        # it when it actually changes.
+        if region != self.playground_region:
+            self.playground_region = region
+            canvas.configure(scrollregion=region)
+
+        tiles = (int((left - PLAYGROUND_MARGIN) // PLAYGROUND_TILE), int((top - PLAYGROUND_MARGIN) // PLAYGROUND_TILE),
+                 int((right + PLAYGROUND_MARGIN) // PLAYGROUND_TILE), int((bottom + PLAYGROUND_MARGIN) // PLAYGROUND_TILE))
+        if tiles == self.playground_tiles:
+            return
+        self.playground_tiles = tiles
+        box = (tiles[0] * PLAYGROUND_TILE, tiles[1] * PLAYGROUND_TILE,
+               (tiles[2] + 1) * PLAYGROUND_TILE, (tiles[3] + 1) * PLAYGROUND_TILE)
+        wanted = self.playground_index.query_rect(box)
+        for db_id in [db_id for db_id in self.playground_elements if db_id not in wanted]:
+            self.dematerialize_element(db_id)
+        shown = sorted(self.playground_elements)
+        for db_id in sorted(wanted.difference(shown)):
+            canvas_id = self.materialize_element(db_id)
+            # Stack by database ID so newer elements stay on top of older
+            # ones that scroll back into view.
+            above = bisect.bisect(shown, db_id)
+            if above < len(shown):
+                canvas.tag_lower(canvas_id, self.playground_elements[shown[above]])
+        logging.debug("Playground viewport %s: %s of %s elements on canvas", box, len(self.playground_elements), len(self.playground_records))
 
     def start_drawing(self, event):
+        self.playground_canvas.focus_set()
         self.start_x = self.playground_canvas.canvasx(event.x)
         self.start_y = self.playground_canvas.canvasy(event.y)
         tool = self.current_tool.get()
@@ -409,34 +532,19 @@ class WorkTrackerApp:
         if tool == "text":
             text = simpledialog.askstring("Text Input", "Enter text:", parent=self.root)
             if text:
-                element_id = self.playground_canvas.create_text(self.start_x, self.start_y, text=text, fill=color, anchor="nw", font=("Helvetica", 12))
-                try:
-                    cursor.execute("""
-                        INSERT INTO playground_elements (element_type, x1, y1, color, text, created_date)
-                        VALUES (?, ?, ?, ?, ?, ?)
-                    """, ("text", self.start_x, self.start_y, color, text, date.today().isoformat()))
-                    db_id = cursor.lastrowid
-                    conn.commit()
-                    self.playground_elements[db_id] = element_id
-                    logging.info(f"Added text element: {text} at ({self.start_x}, {self.start_y})")
-                except sqlite3.Error as e:
-                    logging.error(f"Failed to save text element: {e}")
-                    messagebox.showerror("Error", f"Failed to save text element: {e}")
+                element_id = self.playground_canvas.create_text(self.start_x, self.start_y, text=text, fill=color, anchor="nw", font=self.playground_font)
+                x, y, today = self.start_x, self.start_y, self.day_id.isoformat()
+                self.write(lambda db: db.playground.add_text(x, y, color, text, today),
+                           on_done=lambda db_id: self.element_saved(db_id, element_id, "text", (x, y), color, None, text),
+                           error_message="Failed to save text element")
         elif tool == "eraser":
-            items = self.playground_canvas.find_closest(self.start_x, self.start_y, halo=10)
-            for item in items:
-                for db_id, canvas_id in list(self.playground_items.items()):
-                    if canvas_id == item:
-                        try:
-                            cursor.execute("DELETE FROM playground_elements WHERE id = ?", (db_id,))
-                            conn.commit()
-                            self.playground_canvas.delete(item)
-                            del self.playground_elements[db_id]
-                            logging.info(f"Erased element ID {db_id}")
-                        except sqlite3.Error as e:
-                            logging.error(f"Failed to erase element ID {db_id}: {e}")
-                            messagebox.showerror("Error", f"Failed to erase element: {e}")
-                        break
+            db_id = self.playground_index.at_point(self.start_x, self.start_y, ERASER_HALO)
+            if db_id is not None:
+                self.erase_local_elements([db_id])
+        elif tool == "move":
+            db_id = self.playground_index.at_point(self.start_x, self.start_y, ERASER_HALO)
+            if db_id in self.playground_elements:
+                self.moving_element = (db_id, self.start_x, self.start_y)
         else:
             if tool == "square":
                 self.current_element = self.playground_canvas.create_rectangle(
@@ -451,263 +559,403 @@ class WorkTrackerApp:
                     self.start_x, self.start_y, self.start_x, self.start_y, fill=color, width=width, arrow=tk.LAST
                 )
             elif tool == "pen":
-                self.current_element = self.playground_canvas.create_line(
-                    self.start_x, self.start_y, self.start_x, self.start_y, fill=color, width=width, capstyle=tk.ROUND
+                self.current_stroke = strokes.StrokeBuilder(
+                    self.playground_canvas, self.start_x, self.start_y, fill=color, width=width, capstyle=tk.ROUND, joinstyle=tk.ROUND
                 )
 
     def select_tool(self):
         if self.current_tool.get() == "eraser":
             self.playground_canvas.config(cursor="dotbox")
+        elif self.current_tool.get() == "move":
+            self.playground_canvas.config(cursor="fleur")
         elif self.current_tool.get() == "text":
             self.playground_canvas.config(cursor="xterm")
         else:
             self.playground_canvas.config(cursor="crosshair")
 
     def draw_drawing(self, event):
-        if self.current_tool.get() in ["pen", "square", "circle", "arrow"] and self.current_element:
-            current_x = self.playground_canvas.canvasx(event.x)
-            current_y = self.playground_canvas.canvasy(event.y)
-            tool = self.current_tool.get()
-            if tool == "square":
-                self.playground_canvas.coords(self.current_element, self.start_x, self.start_y, current_x, current_y)
-            elif tool == "circle":
-                self.playground_canvas.coords(self.current_element, self.start_x, self.start_y, current_x, current_y)
-            elif tool in ["pen", "arrow"]:
-                coords = self.playground_canvas.coords(self.current_element)
-                self.playground_canvas.coords(self.current_element, coords + [current_x, current_y])
+        current_x = self.playground_canvas.canvasx(event.x)
+        current_y = self.playground_canvas.canvasy(event.y)
+        if self.current_tool.get() == "eraser":
+            radius = self.line_width.get() * ERASER_BRUSH_SCALE
+            self.erase_local_elements(self.playground_index.within(current_x, current_y, radius))
+        elif self.moving_element:
+            db_id, last_x, last_y = self.moving_element
+            self.playground_canvas.move(self.playground_elements[db_id], current_x - last_x, current_y - last_y)
+            self.moving_element = (db_id, current_x, current_y)
+        elif self.current_stroke:
+            # Buffered; the canvas catches up once per frame.
+            self.current_stroke.add(current_x, current_y)
+        elif self.current_tool.get() in ["square", "circle", "arrow"] and self.current_element:
+            # Arrows are saved as a straight start-to-end line, so they are
+            # drawn as one too.
+            self.playground_canvas.coords(self.current_element, self.start_x, self.start_y, current_x, current_y)
 
     def stop_drawing(self, event):
-        if self.current_tool.get() in ["pen", "square", "circle", "arrow"] and self.current_element:
+        if self.erased_elements:
+            self.erase_elements(self.erased_elements)
+            self.erased_elements = []
+        elif self.moving_element:
+            db_id, last_x, last_y = self.moving_element
+            self.moving_element = None
+            dx, dy = last_x - self.start_x, last_y - self.start_y
+            if dx or dy:
+                # The canvas item already sits at its new place.
+                self.move_local_element(db_id, dx, dy, move_item=False)
+                today = self.day_id.isoformat()
+                self.write(lambda db: db.playground.move_many([db_id], dx, dy, today),
+                           error_message="Failed to move element")
+        elif self.current_stroke or (self.current_tool.get() in ["square", "circle", "arrow"] and self.current_element):
             current_x = self.playground_canvas.canvasx(event.x)
             current_y = self.playground_canvas.canvasy(event.y)
             tool = self.current_tool.get()
-            try:
-                cursor.execute("""
-                    INSERT INTO playground_elements (element_type, x1, y1, x2, y2, color, width, created_date)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """, (tool, self.start_x, self.start_y, current_x, current_y, self.current_color.get(), self.line_width.get(), date.today().isoformat()))
-                db_id = cursor.lastrowid
-                conn.commit()
-                self.playground_elements[db_id] = self.current_element
-                logging.info(f"Added {tool} element from ({self.start_x}, {self.start_y}) to ({current_x}, {current_y})")
-            except sqlite3.Error as e:
-                logging.error(f"Failed to save {tool} element: {e}")
-                messagebox.showerror("Error", f"Failed to save element: {e}")
+            start_x, start_y = self.start_x, self.start_y
+            color, width, today = self.current_color.get(), self.line_width.get(), self.day_id.isoformat()
+            if self.current_stroke:
+                element_id, points = self.current_stroke.finish(current_x, current_y)
+                self.current_stroke = None
+                coords = strokes.flatten(points)
+                op = lambda db: db.playground.add_stroke(strokes.simplify(points), color, width, today)
+            else:
+                element_id = self.current_element
+                coords = (start_x, start_y, current_x, current_y)
+                op = lambda db: db.playground.add_shape(tool, start_x, start_y, current_x, current_y, color, width, today)
+            self.write(op, on_done=lambda db_id: self.element_saved(db_id, element_id, tool, coords, color, width),
+                       error_message="Failed to save element")
+            logging.debug("Added %s element from (%s, %s) to (%s, %s)", tool, start_x, start_y, current_x, current_y)
             self.current_element = None
             self.start_x = None
             self.start_y = None
 
+    def element_saved(self, db_id, canvas_id, element_type, coords, color, width, text=None):
+        # Until the insert commits the element is on the canvas but not yet
+        # erasable, since there is no row id to delete.
+        if not self.playground_canvas.type(canvas_id):
+            return
+        self.register_element(db_id, element_type, coords, color, width, text)
+        self.playground_elements[db_id] = canvas_id
+
+    def erase_local_elements(self, db_ids):
+        # Takes elements off the canvas and out of the index as the eraser
+        # passes; the whole stroke is written by erase_elements on release,
+        # so it is one delete and one undo step.
+        if db_ids:
+            self.remove_local_elements(db_ids)
+            self.erased_elements.extend(db_ids)
+
+    def erase_elements(self, db_ids):
+        today = self.day_id.isoformat()
+        self.write(lambda db: db.playground.delete_many(db_ids, today),
+                   error_message="Failed to erase element")
+        logging.debug("Erased element IDs %s", db_ids)
+
+    def remove_local_elements(self, db_ids):
+        for db_id in db_ids:
+            self.dematerialize_element(db_id)
+            self.playground_index.remove(db_id)
+            self.playground_records.pop(db_id, None)
+
+    def move_local_element(self, db_id, dx, dy, move_item=True):
+        element_type, coords, color, width, text = self.playground_records[db_id]
+        coords = [value + (dx if i % 2 == 0 else dy) for i, value in enumerate(coords)]
+        self.register_element(db_id, element_type, coords, color, width, text)
+        if move_item and db_id in self.playground_elements:
+            self.playground_canvas.move(self.playground_elements[db_id], dx, dy)
+
+    def undo_playground(self):
+        today = self.day_id.isoformat()
+        self.write(lambda db: db.playground.undo(today), on_done=lambda change: self.replay_journal(change, today),
+                   error_message="Failed to undo")
+
+    def redo_playground(self):
+        today = self.day_id.isoformat()
+        self.write(lambda db: db.playground.redo(today), on_done=lambda change: self.replay_journal(change, today),
+                   error_message="Failed to redo")
+
+    def replay_journal(self, change, day):
+        # Mirrors a committed undo/redo on the canvas, unless the user has
+        # since switched to another day.
+        if change is None or day != self.day_id.isoformat():
+            return
+        self.remove_local_elements(change.removed)
+        for db_id in change.moved:
+            if db_id in self.playground_records:
+                self.move_local_element(db_id, change.dx, change.dy)
+        self.restore_elements(change.restored, day)
+        logging.debug("Replayed journal: %s removed, %s restored, %s moved", len(change.removed), len(change.restored), len(change.moved))
+
+    def restore_elements(self, elements, day, start=0):
+        # Undoing a Clear All can bring back thousands of elements, so they
+        # are indexed a batch at a time to keep the UI responsive.
+        if start >= len(elements) or day != self.day_id.isoformat():
+            return
+        for element in elements[start:start + REPLAY_BATCH]:
+            self.register_row(element)
+        self.playground_tiles = None
+        self.refresh_viewport()
+        self.root.after(1, lambda: self.restore_elements(elements, day, start + REPLAY_BATCH))
+
     def clear_canvas(self):
         if messagebox.askyesno("Confirm", "Clear all elements from the playground?"):
-            try:
-                cursor.execute("DELETE FROM playground_elements WHERE created_date = ?", (date.today().isoformat(),))
-                conn.commit()
-                self.playground_canvas.delete("all")
-                self.playground_elements.clear()
-                logging.info("Cleared all playground elements")
-            except Exception as e:
-                logging.error(f"Failed to clear playground elements: {e}")
-                messagebox.showerror("Error", f"Failed to clear playground elements: {e}")
+            today = self.day_id.isoformat()
+            self.write(lambda db: db.playground.clear_date(today),
+                       error_message="Failed to clear playground elements")
+            self.playground_canvas.delete("all")
+            self.playground_elements.clear()
+            self.playground_records.clear()
+            self.playground_index.clear()
+            self.playground_tiles = None
+            logging.info("Cleared all playground elements")
 
     def add_task(self):
         task_text = self.task_input.get().strip()
         if not task_text:
             messagebox.showerror("Error", "Task description cannot be empty!")
             return
-        try:
-            cursor.execute("INSERT INTO tasks (task_text, created_date, x, y, completed, very_important, semi_important) VALUES (?, ?, ?, ?, ?, ?, ?)",
-                         (task_text, date.today().isoformat(), 50, 50, 0, 0, 0))
-            conn.commit()
-            logging.info(f"Added task: {task_text}")
-            self.task_input.delete(0, tk.END)
-            self.load_tasks()
-            self.load_important_tasks()
-        except sqlite3.Error as e:
-            logging.error(f"Failed to add task: {e}")
-            messagebox.showerror("Error", f"Failed to add task: {e}")
-
-    def edit_task(self, task_id, text_widget):
-        new_text = text_widget.get("1.0", tk.END).strip()
-        try:
-            cursor.execute("UPDATE tasks SET task_text = ? WHERE id = ?", (new_text, task_id))
-            conn.commit()
-            logging.info(f"Edited task ID {task_id} to: {new_text}")
-            self.load_important()
-        except sqlite3.Error as e:
-            logging.error(f"Failed to edit task ID {task_id}: {e}")
-            messagebox.showerror("Error", f"Failed to edit task: {e}")
-
-    def toggle_task_completion(self, task_id, var):
-        completed = var.get()
+        today = date.today().isoformat()
+        # New tasks start at the column defaults of tasks.x / tasks.y.
+        self.write(lambda db: db.tasks.add(task_text, today),
+                   on_done=lambda task_id: self.task_board.show(Task(task_id, task_text, today, 50, 50, 0, 0, 0)),
+                   error_message="Failed to add task")
+        logging.debug("Added task: %s", task_text)
+        self.task_input.delete(0, tk.END)
+
+    def edit_task(self, task_id, new_text):
+        self.write(lambda db: db.tasks.update_text(task_id, new_text),
+                   on_done=lambda _: self.load_important_tasks(),
+                   error_message="Failed to edit task", key=("task_text", task_id))
+        logging.debug("Edited task ID %s to: %s", task_id, new_text)
+
+    def toggle_task_completion(self, task_id, completed):
         completed_time = datetime.now().isoformat() if completed else None
+        if completed:
+            # The board only shows open tasks.
+            self.task_board.remove(task_id)
+            self.selected_tasks.discard(task_id)
+            self.schedule_expiry(task_id, datetime.fromisoformat(completed_time) + COMPLETED_TASK_TTL)
+        self.write(lambda db: db.tasks.set_completed(task_id, completed, completed_time),
+                   on_done=lambda _: (self.load_completed_tasks(), self.load_important_tasks()),
+                   error_message="Failed to toggle completion", key=("task_completed", task_id))
+        logging.debug("Task ID %s marked as %s", task_id, 'completed' if completed else 'uncompleted')
+
+    def toggle_very_important(self, task_id, very_important):
+        self.write(lambda db: db.tasks.set_very_important(task_id, very_important),
+                   on_done=lambda _: self.load_important_tasks(),
+                   error_message="Failed to toggle very important", key=("very_important", task_id))
+        logging.debug("Task ID %s marked as %s", task_id, 'very important' if very_important else 'not very important')
+
+    def toggle_semi_important(self, task_id, semi_important):
+        self.write(lambda db: db.tasks.set_semi_important(task_id, semi_important),
+                   error_message="Failed to toggle semi important", key=("semi_important", task_id))
+        logging.debug("Task ID %s marked as %s", task_id, 'semi important' if semi_important else 'not semi important')
+
+    def load_expiry_schedule(self):
+        # The only full read of completion times; after this the heap is
+        # kept up to date as tasks are completed.
         try:
-            cursor.execute("UPDATE tasks SET completed = ?, completed_time = ? WHERE id = ?",
-                         (completed, completed_time, task_id))
-            conn.commit()
-            logging.info(f"Task ID {task_id} marked as {'completed' if completed else 'uncompleted'}")
-            self.load_tasks()
-            self.load_completed_tasks()
-            self.load_important_tasks()
-        except sqlite3.Error as e:
-            logging.error(f"Failed to toggle completion for task ID {task_id}: {e}")
-            messagebox.showerror("Error", f"Failed to toggle completion: {e}")
-
-    def toggle_very_important(self, task_id, var):
-        very_important = var.get()
-        try:
-            cursor.execute("UPDATE tasks SET very_important = ? WHERE id = ?", (very_important, task_id))
-            conn.commit()
-            logging.info(f"Task ID {task_id} marked as {'very important' if very_important else 'not very important'}")
-            self.load_important_tasks()
-        except sqlite3.Error as e:
-            logging.error(f"Failed to toggle very important for task ID {task_id} : {e}")
-            messagebox.showerror("Error", f"Failed to toggle very important: {e}")
-
-    def toggle_semi_important(self, task_id, var):
-        semi_important = var.get()
-        try:
-            cursor.execute("UPDATE tasks SET semi_important = ? WHERE id = ?", (semi_important, task_id))
-            conn.commit()
-            logging.info(f"Task ID {task_id} marked as {'semi important' if semi_important else 'not semi important'}")
-        except sqlite3.Error as e:
-            logging.error(f"Failed to toggle semi important for task ID {task_id}: {e}")
-            messagebox.showerror("Error", f"Failed to toggle semi important: {e}")
-
-    def check_completed_tasks(self):
-        try:
-            cursor.execute("SELECT id, completed_time FROM tasks WHERE completed = 1")
-            tasks = cursor.fetchall()
-            current_time = datetime.now()
-            for task_id, completed_time in tasks:
+            for task_id, completed_time in self.db.tasks.completion_times():
                 if completed_time:
-                    completed_dt = datetime.fromisoformat(completed_time)
-                    if current_time - completed_dt >= timedelta(hours=1):
-                        cursor.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
-                        conn.commit()
-                        logging.info(f"Deleted completed task ID {task_id} after 1 hour")
-            self.load_tasks()
-            self.load_completed_tasks()
-            self.load_important_tasks()
+                    heapq.heappush(self.expiry_heap, (datetime.fromisoformat(completed_time) + COMPLETED_TASK_TTL, task_id))
         except sqlite3.Error as e:
-            logging.error(f"Failed to check completed tasks: {e}")
-        self.root.after(60000, self.check_completed_tasks())  # Check every minute
+            logging.error("Failed to load completed task expiry times: %s", e)
+        self.arm_expiry()
+
+    def schedule_expiry(self, task_id, deadline):
+        heapq.heappush(self.expiry_heap, (deadline, task_id))
+        if self.expiry_heap[0] == (deadline, task_id):
+            self.arm_expiry()
+
+    def arm_expiry(self):
+        # One pending after() for the earliest deadline.
+        if self.expiry_job is not None:
+            self.root.after_cancel(self.expiry_job)
+            self.expiry_job = None
+        if self.expiry_heap:
+            delay = (self.expiry_heap[0][0] - datetime.now()).total_seconds()
+            self.expiry_job = self.root.after(max(0, int(delay * 1000)) + 1, self.expire_completed_tasks)
+
+    def expire_completed_tasks(self):
+        self.expiry_job = None
+        now = datetime.now()
+        expired = []
+        while self.expiry_heap and self.expiry_heap[0][0] <= now:
+            expired.append(heapq.heappop(self.expiry_heap)[1])
+        if expired:
+            # The delete re-checks completion, so a stale heap entry never
+            # removes a task that is no longer completed.
+            cutoff = (now - COMPLETED_TASK_TTL).isoformat()
+            self.write(lambda db: db.tasks.archive_expired(expired, cutoff),
+                       on_done=lambda _: self.load_completed_tasks(),
+                       error_message="Failed to delete completed tasks")
+            logging.info("Archiving %s completed tasks", len(expired))
+        self.arm_expiry()
+
+    def create_task_board(self):
+        # Widget cards look native; lightweight cards are plain canvas items
+        # and stay fast with thousands of tasks.
+        if self.lightweight_cards.get():
+            return task_cards.CanvasCardBoard(self.whiteboard, self)
+        return task_cards.WidgetCardBoard(self.whiteboard, self)
+
+    def switch_card_mode(self):
+        self.flush_task_positions()
+        self.selected_tasks.clear()
+        self.task_board.clear()
+        self.task_board = self.create_task_board()
+        self.load_tasks()
 
     def load_tasks(self):
-        for task_id, widgets in self.task_cards.items():
-            widgets["frame"].destroy()
-        self.task_cards.clear()
-        
+        if self.task_board is None:
+            return
         try:
-            cursor.execute("SELECT id, task_text, created_date, x, y, completed, very_important, semi_important FROM tasks WHERE created_date = ? AND completed = 0 ORDER BY id",
-                         (date.today().isoformat()))
-            tasks = cursor.fetchall()
-            logging.info(f"Loaded {len(tasks)} tasks for {date.today()}")
-            
-            for task_id, task_text, created_date, x, y, completed, very_important, semi_important in tasks:
-                card_frame = tk.Frame(self.whiteboard, bg="#FFFF99", bd=2, relief="raised")
-                card_window = self.whiteboard.create_window(x, y, window=card_frame, anchor="nw")
-                
-                text = tk.Text(card_frame, wrap=tk.WORD, width=20, height=3, bg="#FFFF99", font=("Helvetica", 10), bd=0)
-                text.insert(tk.END, task_text)
-                text.pack(padx=5, pady=5)
-                text.bind("<Double-1>", lambda e, tid=task_id, t=text: self.edit_task(tid, t))
-                
-                check_frame = tk.Frame(card_frame, bg="#FFFF99")
-                check_frame.pack(anchor="w", padx=5)
-                
-                check_var = tk.BooleanVar(value=bool(completed))
-                check = tk.Checkbutton(check_frame, variable=check_var, command=lambda tid=task_id, v=check_var: self.toggle_task_completion(tid, v), bg="#FFFF99")
-                check.pack(side=tk.LEFT, padx=2)
-                
-                very_important_var = tk.BooleanVar(value=bool(very_important))
-                very_important_check = tk.Checkbutton(check_frame, variable=very_important_var, command=lambda tid=task_id, v=very_important_var: self.toggle_very_important(tid, v), bg="#FFFF99", selectcolor="red")
-                very_important_check.pack(side=tk.LEFT, padx=2)
-                
-                semi_important_var = tk.BooleanVar(value=bool(semi_important))
-                semi_important_check = tk.Checkbutton(check_frame, variable=semi_important_var, command=lambda tid=task_id, v=semi_important_var: self.toggle_semi_important(tid, v), bg="#FFFF99", selectcolor="green")
-                semi_important_check.pack(side=tk.LEFT, padx=2)
-                
-                date_label = tk.Label(card_frame, text=f"Created: {created_date}", font=("Helvetica", 8), bg="#FFFF99")
-                date_label.pack(anchor="w", padx=5, pady=2)
-                
-                for widget in (card_frame, text, check_frame, check, very_important_check, semi_important_check, date_label):
-                    widget.bind("<Button-1>", lambda e, tid=task_id: self.start_task_drag(e, tid))
-                    widget.bind("<B1-Motion>", lambda e, tid=task_id: self.on_task_drag(e, tid))
-                    widget.bind("<ButtonRelease-1>", lambda e, tid=task_id: self.stop_task_drag(e, tid))
-                
-                self.task_cards[task_id] = {
-                    "frame": card_frame,
-                    "window": card_window,
-                    "text": text,
-                    "check_var": check_var,
-                    "very_important_var": very_important_var,
-                    "semi_important_var": semi_important_var
-                }
+            tasks = self.db.tasks.open_tasks(date.today().isoformat())
+            logging.debug("Loaded %s tasks for %s", len(tasks), date.today())
+            self.task_board.sync(tasks)
         except sqlite3.Error as e:
-            logging.error(f"Failed to load tasks: {e}")
+            logging.error("Failed to load tasks: %s", e)
             messagebox.showerror("Error", f"Failed to load tasks: {e}")
 
     def load_completed_tasks(self):
+        # Only the newest page is read; older archived tasks are fetched by
+        # on_completed_scroll as the user scrolls down.
+        if self.completed_tree is None:
+            return
+        self.reader.cancel("completed_page")
+        self.completed_loading = False
+        self.reader.submit("completed_tasks", lambda db: db.tasks.completed_tasks(limit=COMPLETED_PAGE_SIZE),
+                           self.show_completed_tasks, self.completed_tasks_failed)
+
+    def show_completed_tasks(self, tasks):
         for item in self.completed_tree.get_children():
             self.completed_tree.delete(item)
-        try:
-            cursor.execute("SELECT task_text, created_date, completed_time FROM tasks WHERE completed = 1 ORDER BY completed_time DESC")
-            tasks = cursor.fetchall()
-            for task_text, created_date, completed_time in tasks:
-                self.completed_tree.insert("", tk.END, values=(task_text, created_date, completed_time))
-            logging.info(f"Loaded {len(tasks)} completed tasks")
-        except sqlite3.Error as e:
-            logging.error(f"Failed to load completed tasks: {e}")
-            messagebox.showerror("Error", f"Failed to load completed tasks: {e}")
+        self.completed_last_key = None
+        self.append_completed_tasks(tasks)
+        logging.debug("Loaded %s completed tasks", len(tasks))
+
+    def append_completed_tasks(self, tasks):
+        for task in tasks:
+            self.completed_tree.insert("", tk.END, values=(task.task_text, task.created_date, task.completed_time))
+        if tasks:
+            self.completed_last_key = (tasks[-1].completed_time, tasks[-1].id)
+        self.completed_exhausted = len(tasks) < COMPLETED_PAGE_SIZE
+
+    def on_completed_scroll(self, first, last):
+        self.completed_scrollbar.set(first, last)
+        if float(last) > 0.9 and not self.completed_exhausted and not self.completed_loading:
+            self.completed_loading = True
+            after = self.completed_last_key
+            self.reader.submit("completed_page", lambda db: db.tasks.completed_tasks(after, COMPLETED_PAGE_SIZE),
+                               lambda tasks: self.show_older_completed_tasks(after, tasks),
+                               self.completed_tasks_failed)
+
+    def show_older_completed_tasks(self, after, tasks):
+        self.completed_loading = False
+        if after != self.completed_last_key:
+            return
+        self.append_completed_tasks(tasks)
+        logging.debug("Loaded %s archived tasks completed before %s", len(tasks), after[0])
+
+    def completed_tasks_failed(self, e):
+        self.completed_loading = False
+        logging.error("Failed to load completed tasks: %s", e)
 
     def load_important_tasks(self):
         for label in self.important_tasks_labels:
             label.config(text="")
         try:
-            cursor.execute("SELECT task_text FROM tasks WHERE created_date = ? AND very_important = 1 AND completed = 0 ORDER BY id DESC LIMIT 3",
-                         (date.today().isoformat(),))
-            tasks = cursor.fetchall()
-            for i, (task_text,) in enumerate(tasks):
+            tasks = self.db.tasks.important_tasks(date.today().isoformat(), len(self.important_tasks_labels))
+            for i, task_text in enumerate(tasks):
                 self.important_tasks_labels[i].config(text=f"{i+1}. {task_text}")
-            logging.info(f"Loaded {len(tasks)} important tasks for Tracker page")
+            logging.debug("Loaded %s important tasks for Tracker page", len(tasks))
         except sqlite3.Error as e:
-            logging.error(f"Failed to load important tasks: {e}")
+            logging.error("Failed to load important tasks: %s", e)
             messagebox.showerror("Error", f"Failed to load important tasks: {e}")
 
+    def select_task(self, task_id, selected):
+        if selected:
+            self.selected_tasks.add(task_id)
+        else:
+            self.selected_tasks.discard(task_id)
+        self.task_board.set_selected(task_id, selected)
+
+    def clear_task_selection(self):
+        for task_id in list(self.selected_tasks):
+            if task_id in self.task_board:
+                self.task_board.set_selected(task_id, False)
+        self.selected_tasks.clear()
+
     def start_task_drag(self, event, task_id):
+        self.task_drag_moved = False
+        if event.state & CONTROL_MASK:
+            # Ctrl+click adds or removes a card from the group that moves
+            # together.
+            self.select_task(task_id, task_id not in self.selected_tasks)
+            self.dragging_task = None
+            return
+        if task_id not in self.selected_tasks:
+            self.clear_task_selection()
         self.dragging_task = task_id
+        self.task_drag_delta = [0, 0]
         self.drag_data["x"] = event.x_root
         self.drag_data["y"] = event.y_root
 
     def on_task_drag(self, event, task_id):
         if self.dragging_task == task_id:
-            delta_x = event.x_root - self.drag_data["x"]
-            delta_y = event.y_root - self.drag_data["y"]
-            current_coords = self.whiteboard.coords(self.task_cards[task_id]["window"])
-            new_x = current_coords[0] + delta_x
-            new_y = current_coords[1] + delta_y
-            self.whiteboard.coords(self.task_cards[task_id]["window"], new_x, new_y)
+            self.task_drag_delta[0] += event.x_root - self.drag_data["x"]
+            self.task_drag_delta[1] += event.y_root - self.drag_data["y"]
             self.drag_data["x"] = event.x_root
             self.drag_data["y"] = event.y_root
+            if self.task_drag_job is None:
+                self.task_drag_job = self.root.after(DRAG_FRAME_MS, self.apply_task_drag)
+
+    def dragged_tasks(self):
+        return [task_id for task_id in self.selected_tasks | {self.dragging_task} if task_id in self.task_board]
+
+    def apply_task_drag(self):
+        self.task_drag_job = None
+        delta_x, delta_y = self.task_drag_delta
+        self.task_drag_delta = [0, 0]
+        if delta_x or delta_y:
+            self.task_drag_moved = True
+            for task_id in self.dragged_tasks():
+                self.task_board.move(task_id, delta_x, delta_y)
 
     def stop_task_drag(self, event, task_id):
         if self.dragging_task == task_id:
-            current_coords = self.whiteboard.coords(self.task_cards[task_id]["window"])
-            try:
-                cursor.execute("UPDATE tasks SET x = ?, y = ? WHERE id = ?", (current_coords[0], current_coords[1], task_id))
-                conn.commit()
-                logging.info(f"Updated position for task ID {task_id} to ({current_coords[0]}, {current_coords[1]})")
-            except sqlite3.Error as e:
-                logging.error(f"Failed to update task position for ID {task_id}: {e}")
+            if self.task_drag_job is not None:
+                self.root.after_cancel(self.task_drag_job)
+                self.apply_task_drag()
+            if self.task_drag_moved:
+                self.queue_task_positions(self.dragged_tasks())
             self.dragging_task = None
             self.drag_data["x"] = 0
             self.drag_data["y"] = 0
 
+    def queue_task_positions(self, task_ids):
+        for task_id in task_ids:
+            self.pending_positions[task_id] = self.task_board.position(task_id)
+        if self.position_job is not None:
+            self.root.after_cancel(self.position_job)
+        self.position_job = self.root.after(POSITION_DEBOUNCE_MS, self.flush_task_positions)
+
+    def flush_task_positions(self):
+        if self.position_job is not None:
+            self.root.after_cancel(self.position_job)
+            self.position_job = None
+        positions = [(task_id, x, y) for task_id, (x, y) in self.pending_positions.items()]
+        self.pending_positions.clear()
+        if positions:
+            self.write(lambda db: db.tasks.move_many(positions), error_message="Failed to update task positions")
+            logging.debug("Updated positions for %s tasks", len(positions))
+
     def create_overlay(self):
         if self.overlay:
             self.overlay.destroy()
         
         self.overlay = tk.Toplevel(self.root)
+        self.overlay_visible = False
+        self.overlay.bind("<Map>", lambda e: self.set_overlay_visible(e, True))
+        self.overlay.bind("<Unmap>", lambda e: self.set_overlay_visible(e, False))
         self.overlay_id = str(uuid.uuid4())
         self.overlay.overrideredirect(True)
         self.overlay.attributes("-alpha", 0.7)
@@ -732,7 +980,8 @@ class WorkTrackerApp:
         button_frame = tk.Frame(frame)
         button_frame.pack(pady=5)
         
-        self.overlay_pause_resume_button = tk.Button(button_frame, text="Pause", command=self.toggle_pause, bg="yellow", fg="black", width=6)
+        self.overlay_pause_resume_button = tk.Button(button_frame, text="Pause" if self.session_timer.running else "Resume",
+                                                     command=self.toggle_pause, bg="yellow", fg="black", width=6)
         self.overlay_pause_resume_button.pack(side=tk.LEFT, padx=2)
         
         stop_button = tk.Button(button_frame, text="Stop", command=lambda: self.toggle_timer(self.active_category), bg="red", fg="white", width=6)
@@ -743,6 +992,20 @@ class WorkTrackerApp:
             widget.bind("<B1-Motion>", self.on_drag)
             widget.bind("<ButtonRelease-1>", self.stop_drag)
 
+    def set_overlay_visible(self, event, visible):
+        # Children's events reach this binding too; only the Toplevel counts.
+        if event.widget is not self.overlay:
+            return
+        self.overlay_visible = visible
+        if visible:
+            self.show_elapsed(self.session_timer.seconds())
+
+    def destroy_overlay(self):
+        if self.overlay:
+            self.overlay.destroy()
+            self.overlay = None
+            self.overlay_visible = False
+
     def start_drag(self, event):
         if self.overlay:
             self.drag_data["x"] = event.x_root
@@ -764,43 +1027,18 @@ class WorkTrackerApp:
         self.drag_data["y"] = 0
         self.drag_data["widget"] = None
 
-    def update_event_time(self):
-        if self.event_running and self.overlay and not self.paused:
-            elapsed = int(time.time() - self.start_event_time + self.paused_time)
-            minutes = elapsed // 60
-            seconds = elapsed % 60
-            self.event_time_label.config(text=f"Time: {minutes:02d}:{seconds:02d}")
+    def log_cell_summary(self, item, column):
+        # column is "#1" for Date, then one per category, then Total.
+        date = self.log_row_dates.get(item)
+        index = int(column[1:]) - 2
+        if date is None or not 0 <= index < len(self.categories):
+            return None
+        return self.cell_summaries.get((date, self.categories[index]))
 
-    def show_tooltip(self, event):
-        if self.tooltip:
-            self.tooltip.destroy()
-        
-        item = self.log_tree.identify_row(event.y)
-        if not item:
-            return
-        
-        col = self.log_tree.identify_column(event.x)
-        col_name = self.log_tree.column(col)["id"]
-        if col_name == "Date" or col_name == "Total":
-            return
-        
-        values = self.log_tree.item(item)["values"]
-        date = values[0]
-        if (date, col_name) in self.outcomes:
-            outcome = self.outcomes.get((date, col_name), "No outcome")
-            tooltip_text = f"Outcome: {outcome}"
-            x, y = event.x_root + 10, event.y_root + 10
-            self.tooltip = tk.Toplevel(self.root)
-            self.tooltip.wm_overrideredirect(True)
-            self.tooltip.wm_geometry(f"+{x}+{y}")
-            label = tk.Label(self.tooltip, text=tooltip_text, bg="lightyellow", fg="black",
-                             borderwidth=1, relief="solid", padx=5, pady=5)
-            label.pack()
-
-    def hide_tooltip(self, event):
-        if self.tooltip:
-            self.tooltip.destroy()
-            self.tooltip = None
+    def summarize_log_row(self, date, logs, outcomes):
+        for name, (time_spent, completed) in logs.items():
+            self.cell_summaries[(date, name)] = (f"Outcome: {outcomes.get((date, name), 'No outcome')}\n"
+                                                 f"{time_spent // 60}m, {'completed' if completed else 'not completed'}")
 
     def toggle_expand(self, event):
         item = self.log_tree.identify_row(event.y)
@@ -809,31 +1047,31 @@ class WorkTrackerApp:
         
         date = self.log_tree.item(item)["values"][0]
         if self.expanded_rows.get(item, False):
+            self.reader.cancel(("expand", item))
             for child in self.log_tree.get_children(item):
                 self.log_tree.delete(child)
             self.expanded_rows[item] = False
         else:
-            try:
-                cursor.execute("""
-                    SELECT c.name, l.time_spent, l.completed, l.outcome
-                    FROM logs l
-                    JOIN categories c ON l.name = c.name
-                    WHERE l.date = ?
-                    ORDER BY c.name, l.id
-                """, (date,))
-                logs = cursor.fetchall()
-                
-                for i, (name, time_spent, completed, outcome) in enumerate(logs, 1):
-                    minutes = time_spent // 60
-                    status = "✓" if completed else "✗"
-                    outcome_text = outcome or "No outcome"
-                    row_data = [""] + [f"{i}. {outcome_text}" if cat == name else "" for cat in self.categories] + [f"{status} ({minutes}m)", ""]
-                    child = self.log_tree.insert(item, tk.END, values=row_data)
-                    self.log_tree.item(child, tags=("Completed" if completed else "NotCompleted",))
-                self.expanded_rows[item] = True
-            except sqlite3.Error as e:
-                logging.error(f"Failed to expand row: {e}")
-                messagebox.showerror("Error", f"Failed to expand row: {e}")
+            self.expanded_rows[item] = True
+            self.reader.submit(("expand", item), lambda db: db.logs.entries_for_date(date),
+                               lambda logs: self.show_expanded_row(item, logs),
+                               lambda e: self.expand_failed(item, e))
+
+    def show_expanded_row(self, item, logs):
+        if not self.log_tree.exists(item) or not self.expanded_rows.get(item):
+            return
+        for i, (name, time_spent, completed, outcome) in enumerate(logs, 1):
+            minutes = time_spent // 60
+            status = "✓" if completed else "✗"
+            outcome_text = outcome or "No outcome"
+            row_data = [""] + [f"{i}. {outcome_text}" if cat == name else "" for cat in self.categories] + [f"{status} ({minutes}m)", ""]
+            child = self.log_tree.insert(item, tk.END, values=row_data)
+            self.log_tree.item(child, tags=("Completed" if completed else "NotCompleted",))
+
+    def expand_failed(self, item, e):
+        self.expanded_rows[item] = False
+        logging.error("Failed to expand row: %s", e)
+        messagebox.showerror("Error", f"Failed to expand row: {e}")
 
     def show_row_details(self, event):
         item = self.log_tree.identify_row(event.y)
@@ -853,53 +1091,41 @@ class WorkTrackerApp:
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         text.configure(yscrollcommand=scrollbar.set)
         
-        try:
-            cursor.execute("""
-                SELECT c.name, l.time_spent, l.completed, l.outcome
-                FROM logs l
-                JOIN categories c ON l.name = c.name
-                WHERE l.date = ?
-                ORDER BY c.name, l.id
-            """, (date,))
-            logs = cursor.fetchall()
-            
-            total_points = 0
-            total_time = 0
-            completed_tasks = 0
-            category_times = {}
-            outcomes = []
-            
-            for name, time_spent, completed, outcome in logs:
-                minutes = time_spent // 60
-                total_time += minutes
-                total_points += minutes
-                if completed:
-                    total_points += 10
-                    completed_tasks += 1
-                category_times[name] = category_times.get(name, 0) + minutes
-                if outcome and outcome != "No outcome":
-                    outcomes.append(f"{name}: {outcome}")
-            
-            most_active = max(category_times.items(), key=lambda x: x[1], default=("None", 0))
-            
-            text.insert(tk.END, f"Insights for {date}\n\n")
-            text.insert(tk.END, f"Point Calculation:\n")
-            text.insert(tk.END, f"  Total Points: {total_points}\n")
-            text.insert(tk.END, f"  - {total_time} points from time spent (1 point/minute)\n")
-            text.insert(tk.END, f"  - {completed_tasks * 10} points from {completed_tasks} completed tasks (10 points each)\n\n")
-            text.insert(tk.END, f"Key Insights:\n")
-            text.insert(tk.END, f"  Total Time Spent: {total_time} minutes\n")
-            text.insert(tk.END, f"  Most Active Category: {most_active[0]} ({most_active[1]} minutes)\n")
-            text.insert(tk.END, f"  Completed Tasks: {completed_tasks}\n")
-            text.insert(tk.END, f"  Outcomes:\n")
-            for i, outcome in enumerate(outcomes, 1):
-                text.insert(tk.END, f"    {i}. {outcome}\n")
-            if not outcomes:
-                text.insert(tk.END, "    No outcomes recorded\n")
-            
-            text.config(state=tk.DISABLED)
-        except sqlite3.Error as e:
-            logging.error(f"Error fetching insights: {e}")
+        self.reader.submit(("details", date), lambda db: (db.logs.day_totals(date), db.logs.outcomes_logged(date)),
+                           lambda result: self.show_insights(text, date, *result),
+                           lambda e: self.insights_failed(text, e))
+
+    def show_insights(self, text, date, totals, logged_outcomes):
+        if not text.winfo_exists():
+            return
+        total_time = sum(minutes for _, minutes, _ in totals)
+        completed_tasks = sum(completed for _, _, completed in totals)
+        total_points = total_time + completed_tasks * 10
+        category_times = {name: minutes for name, minutes, _ in totals}
+        outcomes = [f"{name}: {outcome}" for name, outcome in logged_outcomes]
+        
+        most_active = max(category_times.items(), key=lambda x: x[1], default=("None", 0))
+        
+        text.insert(tk.END, f"Insights for {date}\n\n")
+        text.insert(tk.END, f"Point Calculation:\n")
+        text.insert(tk.END, f"  Total Points: {total_points}\n")
+        text.insert(tk.END, f"  - {total_time} points from time spent (1 point/minute)\n")
+        text.insert(tk.END, f"  - {completed_tasks * 10} points from {completed_tasks} completed tasks (10 points each)\n\n")
+        text.insert(tk.END, f"Key Insights:\n")
+        text.insert(tk.END, f"  Total Time Spent: {total_time} minutes\n")
+        text.insert(tk.END, f"  Most Active Category: {most_active[0]} ({most_active[1]} minutes)\n")
+        text.insert(tk.END, f"  Completed Tasks: {completed_tasks}\n")
+        text.insert(tk.END, f"  Outcomes:\n")
+        for i, outcome in enumerate(outcomes, 1):
+            text.insert(tk.END, f"    {i}. {outcome}\n")
+        if not outcomes:
+            text.insert(tk.END, "    No outcomes recorded\n")
+        
+        text.config(state=tk.DISABLED)
+
+    def insights_failed(self, text, e):
+        logging.error("Error fetching insights: %s", e)
+        if text.winfo_exists():
             text.insert(tk.END, f"Error fetching insights: {e}")
             text.config(state=tk.DISABLED)
 
@@ -923,17 +1149,15 @@ class WorkTrackerApp:
         self.year_var.set("")
         self.update_log_display()
 
-    def load_categories(self):
+    def load_categories(self, refresh_log=True):
         for frame in self.category_frames.values():
             frame.destroy()
         self.category_frames.clear()
         self.category_buttons.clear()
         
         try:
-            cursor.execute("SELECT name FROM categories ORDER BY name")
-            categories = cursor.fetchall()
-            self.categories = [cat[0] for cat in categories]
-            logging.info(f"Loaded categories: {self.categories}")
+            self.categories = self.db.logs.categories()
+            logging.debug("Loaded categories: %s", self.categories)
             
             for name in self.categories:
                 frame = tk.Frame(self.category_frame)
@@ -949,13 +1173,14 @@ class WorkTrackerApp:
                                        command=lambda c=name: self.delete_category(c))
                 delete_button.pack(side=tk.LEFT)
                 self.category_frames[name] = frame
-                if name == self.active_category and self.stopwatch_running:
+                if name == self.active_category and self.session_timer.active:
                     button.configure(bg="lightgreen")
-            self.update_log_display()
-            if not categories:
+            if refresh_log:
+                self.update_log_display()
+            if not self.categories:
                 messagebox.showwarning("Warning", "No categories found. Please add a category.")
         except sqlite3.Error as e:
-            logging.error(f"Failed to load categories: {e}")
+            logging.error("Failed to load categories: %s", e)
             messagebox.showerror("Error", f"Failed to load categories: {e}")
 
     def add_category(self):
@@ -963,15 +1188,14 @@ class WorkTrackerApp:
         if not name:
             messagebox.showerror("Error", "Category name cannot be empty!")
             return
-        try:
-            cursor.execute("INSERT INTO categories (name) VALUES (?)", (name,))
-            conn.commit()
-            logging.info(f"Added category '{name}'")
+        def added(_):
+            logging.info("Added category '%s'", name)
             self.new_category_entry.delete(0, tk.END)
             self.load_categories()
-        except sqlite3.IntegrityError:
-            logging.error(f"Failed to add category '{name}': Category already exists")
-            messagebox.showerror("Error", "Category already exists!")
+        def failed(e):
+            logging.error("Failed to add category '%s': %s", name, e)
+            messagebox.showerror("Error", "Category already exists!" if isinstance(e, sqlite3.IntegrityError) else f"Failed to add category: {e}")
+        self.writer.submit(lambda db: db.logs.add_category(name), added, failed)
 
     def edit_category(self, old_name):
         new_name = simpledialog.askstring("Edit Category", f"Enter new name for '{old_name}':",
@@ -979,152 +1203,169 @@ class WorkTrackerApp:
         if new_name and new_name.strip():
             new_name = new_name.strip()
             if new_name != old_name:
-                try:
-                    cursor.execute("UPDATE categories SET name = ? WHERE name = ?",
-                                  (new_name, old_name))
-                    cursor.execute("UPDATE logs SET name = ? WHERE name = ?",
-                                  (new_name, old_name))
+                def renamed(_):
                     if self.active_category == old_name:
                         self.active_category = new_name
-                    conn.commit()
-                    logging.info(f"Edited category from '{old_name}' to '{new_name}'")
-                    self.load_categories()
-                except sqlite3.Error:
-                    logging.error(f"Failed to edit category to '{new_name}': Category already exists")
+                        self.status_label.config(text=self.session_status())
+                        if self.overlay:
+                            self.overlay_label.config(text=f"Working on: {new_name}")
+                    logging.info("Edited category from '%s' to '%s'", old_name, new_name)
+                    self.load_categories(refresh_log=False)
+                    self.rename_log_column(old_name, new_name)
+                def failed(e):
+                    logging.error("Failed to edit category to '%s': %s", new_name, e)
                     messagebox.showerror("Error", "Category name already exists!")
+                self.writer.submit(lambda db: db.logs.rename_category(old_name, new_name), renamed, failed)
         elif new_name is not None:
             messagebox.showerror("Error", "Category name cannot be empty!")
 
     def delete_category(self, name):
-        logging.info(f"Attempting to delete category '{name}'")
+        logging.info("Attempting to delete category '%s'", name)
         if messagebox.askyesno("Confirm", f"Delete category '{name}' and its logs?"):
             try:
-                cursor.execute("SELECT name FROM categories WHERE name = ?", (name,))
-                if not cursor.fetchone():
-                    logging.error(f"Category '{name}' not found in database")
+                if not self.db.logs.category_exists(name):
+                    logging.error("Category '%s' not found in database", name)
                     messagebox.showerror("Error", f"Category '{name}' not found")
                     return
-                cursor.execute("DELETE FROM logs WHERE name = ?", (name,))
-                cursor.execute("DELETE FROM categories WHERE name = ?", (name,))
-                logging.info(f"Successfully deleted category '{name}' and its logs")
+                self.write(lambda db: db.logs.delete_category(name),
+                           on_done=lambda _: self.load_categories(),
+                           error_message="Failed to delete category")
+                logging.info("Deleting category '%s' and its logs", name)
                 if self.active_category == name:
-                    self.active_category = ""
-                    self.stopwatch_running = False
-                    self.status_label.config(text="Status: Idle")
-                    self.stopwatch_label.config(text="Time: 00:00")
-                    self.start_time = None
-                    if self.overlay:
-                        self.overlay.destroy()
-                        self.overlay = None
-                conn.commit()
-                self.load_categories()
+                    # The repository drops the category's active_session row.
+                    self.end_session()
             except sqlite3.Error as e:
-                logging.error(f"Failed to delete category '{name}': {e}")
+                logging.error("Failed to delete category '%s': %s", name, e)
                 messagebox.showerror("Error", f"Failed to delete category: {e}")
 
     def toggle_timer(self, category):
-        logging.info(f"Toggling timer for category '{category}'")
-        if self.active_category == category:
-            elapsed = int(self.paused_time if self.paused else time.time() - self.start_time + self.paused_time)
-            self.stopwatch_running = False
-            self.status_label.config(text="Status: Idle")
-            self.stopwatch_label.config(text="Time: 00:00")
-            self.category_buttons[category].configure(bg="SystemButtonFace")
-            self.active_category = ""
-            self.start_time = None
-            self.paused_time = 0
-            self.paused = False
-            self.pause_resume_button.config(text="Pause", state=tk.DISABLED)
-            if self.overlay:
-                self.overlay.destroy()
-                self.overlay = None
-            outcome = simpledialog.askstring("Outcome", f"What was the outcome for '{category}'?",
+        logging.debug("Toggling timer for category '%s'", category)
+        if self.active_category:
+            previous = self.active_category
+            elapsed = self.end_session()
+            outcome = simpledialog.askstring("Outcome", f"What was the outcome for '{previous}'?",
                                            parent=self.root)
             outcome = outcome.strip() if outcome else ""
-            try:
-                cursor.execute("""
-                    INSERT INTO logs (name, date, time_spent, completed, outcome)
-                    VALUES (?, ?, ?, ?, ?)
-                """, (category, date.today().isoformat(), elapsed, 1, outcome))
-                conn.commit()
-                logging.info(f"Logged time for '{category}': {elapsed} seconds, outcome: {outcome}")
-                self.update_log_display()
-                self.update_outcome_display()
-            except sqlite3.Error as e:
-                logging.error(f"Failed to log time for '{category}': {e}")
-                messagebox.showerror("Error", f"Failed to log time: {e}")
+            self.save_log(previous, elapsed, outcome)
+            if previous == category:
+                return
+        now = time.time()
+        self.write(lambda db: db.sessions.start(category, now), error_message=f"Failed to start the timer for '{category}'")
+        self.begin_session(category)
+
+    def begin_session(self, category, elapsed=0, running=True):
+        self.active_category = category
+        self.session_timer.start(elapsed, running)
+        self.status_label.config(text=self.session_status())
+        self.category_buttons[category].configure(bg="lightgreen")
+        self.pause_resume_button.config(text="Pause" if running else "Resume", state=tk.NORMAL)
+        self.create_overlay()
+
+    def end_session(self):
+        # Stops the timer and resets the display; returns the seconds tracked.
+        elapsed = self.session_timer.stop()
+        if self.active_category in self.category_buttons:
+            self.category_buttons[self.active_category].configure(bg="SystemButtonFace")
+        self.active_category = ""
+        self.status_label.config(text="Status: Idle")
+        self.stopwatch_label.config(text="Time: 00:00")
+        self.pause_resume_button.config(text="Pause", state=tk.DISABLED)
+        self.destroy_overlay()
+        return elapsed
+
+    def restore_session(self):
+        # Picks up a session the command line started, or one a previous run
+        # left behind. A clean exit saves the session paused; a running row
+        # with a checkpoint belonged to a GUI that crashed, so the time after
+        # its last checkpoint is not counted and it also comes back paused.
+        # begin_session checkpoints at once, making the row this GUI's.
+        try:
+            session = self.db.sessions.current()
+        except sqlite3.Error as e:
+            logging.error("Failed to load the active session: %s", e)
+            return
+        if session is None or session.category not in self.category_buttons:
+            return
+        if session.checkpointed_at is not None and session.resumed_at is not None:
+            elapsed, running = session.accumulated, False
+            logging.info("Restored '%s' paused at its last checkpoint (%s seconds)", session.category, elapsed)
         else:
-            if self.active_category:
-                elapsed = int(self.paused_time if self.paused else time.time() - self.start_time + self.paused_time)
-                outcome = simpledialog.askstring("Outcome", f"What was the outcome for '{self.active_category}'?",
-                                               parent=self.root)
-                outcome = outcome.strip() if outcome else ""
-                try:
-                    cursor.execute("""
-                        INSERT INTO logs (name, date, time_spent, completed, outcome)
-                        VALUES (?, ?, ?, ?, ?)
-                    """, (self.active_category, date.today().isoformat(), elapsed, 1, outcome))
-                    conn.commit()
-                    logging.info(f"Logged time for '{self.active_category}': {elapsed} seconds, outcome: {outcome}")
-                    self.category_buttons[self.active_category].configure(bg="SystemButtonFace")
-                    if self.overlay:
-                        self.overlay.destroy()
-                except sqlite3.Error as e:
-                    logging.error(f"Failed to log time for '{self.active_category}': {e}")
-                    messagebox.showerror("Error", f"Failed to log time: {e}")
-            self.active_category = category
-            self.start_time = time.time()
-            self.stopwatch_running = True
-            self.paused = False
-            self.paused_time = 0
-            self.status_label.config(text=f"Status: Tracking {category}")
-            self.category_buttons[category].configure(bg="lightgreen")
-            self.pause_resume_button.config(state=tk.NORMAL)
-            self.create_overlay()
-            self.update_log_display()
+            elapsed, running = session.elapsed(time.time()), session.resumed_at is not None
+        self.begin_session(session.category, elapsed, running)
+
+    def session_status(self):
+        if self.session_timer.running:
+            return f"Status: Tracking {self.active_category}"
+        return f"Status: Paused ({self.active_category})"
+
+    def show_elapsed(self, seconds):
+        text = f"Time: {seconds // 60:02d}:{seconds % 60:02d}"
+        self.stopwatch_label.config(text=text)
+        # A hidden overlay is brought up to date when it is mapped again.
+        if self.overlay_visible:
+            self.overlay_time.config(text=text)
+
+    def checkpoint_session(self, elapsed, running):
+        category, now = self.active_category, time.time()
+        self.write(lambda db: db.sessions.checkpoint(category, elapsed, running, now),
+                   error_message="Failed to save the running timer", key=("session_checkpoint", category))
+
+    def save_log(self, category, elapsed, outcome):
+        today = date.today().isoformat()
+        def saved(logged):
+            if not logged:
+                # Stopped from the command line meanwhile, which logged it;
+                # pick up whatever is running now.
+                logging.info("Timer for '%s' was already stopped elsewhere; not logged again", category)
+                if not self.session_timer.active:
+                    self.restore_session()
+                return
+            logging.info("Logged time for '%s': %s seconds, outcome: %s", category, elapsed, outcome)
+            self.refresh_log_date(today)
+            self.update_outcome_display()
+        self.write(lambda db: db.sessions.finish(category, today, elapsed, outcome),
+                   on_done=saved, error_message=f"Failed to log time for '{category}'")
 
     def toggle_pause(self):
-        if self.stopwatch_running and self.active_category:
-            if not self.paused:
-                self.paused = True
-                self.paused_time += int(time.time() - self.start_time)
-                self.status_label.config(text=f"Status: Paused ({self.active_category})")
-                self.pause_resume_button.config(text="Resume")
-                if self.overlay:
-                    self.overlay_pause_resume_button.config(text="Resume")
-                    self.overlay_time.config(text=f"Time: {self.paused_time // 60:02d}:{self.paused_time % 60:02d}")
-            else:
-                self.paused = False
-                self.start_time = time.time()
-                self.status_label.config(text=f"Status: Tracking {self.active_category}")
-                self.pause_resume_button.config(text="Pause")
-                if self.overlay:
-                    self.overlay_pause_resume_button.config(text="Pause")
+        if not self.session_timer.active:
+            return
+        if self.session_timer.running:
+            self.session_timer.pause()
+        else:
+            self.session_timer.resume()
+        label = "Pause" if self.session_timer.running else "Resume"
+        self.status_label.config(text=self.session_status())
+        self.pause_resume_button.config(text=label)
+        if self.overlay:
+            self.overlay_pause_resume_button.config(text=label)
 
     def update_outcome_display(self):
         current_date = date.today() + timedelta(days=self.day_offset)
         prev_date = current_date - timedelta(days=1)
-        
+        self.reader.submit("outcomes",
+                           lambda db: (db.logs.outcomes_for_date(current_date.isoformat()),
+                                       db.logs.outcomes_for_date(prev_date.isoformat())),
+                           lambda result: self.show_outcomes(current_date, prev_date, *result),
+                           self.outcomes_failed)
+
+    def show_outcomes(self, current_date, prev_date, current_outcomes, prev_outcomes):
         self.outcome_text_left.delete(1.0, tk.END)
         self.outcome_text_right.delete(1.0, tk.END)
         
-        try:
-            cursor.execute("SELECT name, outcome FROM logs WHERE date = ?", (current_date.isoformat(),))
-            current_outcomes = cursor.fetchall()
-            cursor.execute("SELECT name, outcome FROM logs WHERE date = ?", (prev_date.isoformat(),))
-            prev_outcomes = cursor.fetchall()
-            
-            for i, (name, outcome) in enumerate(current_outcomes[:5], 1):
-                self.outcome_text_left.insert(tk.END, f"{i}. {name}: {outcome or 'No outcome'}\n")
-            for i, (name, outcome) in enumerate(prev_outcomes[:5], 1):
-                self.outcome_text_right.insert(tk.END, f"{i}. {name}: {outcome or 'No outcome'}\n")
-            
-            self.outcome_text_left.insert(tk.END, f"\nDate: {current_date}")
-            self.outcome_text_right.insert(tk.END, f"\nDate: {prev_date}")
-        except sqlite3.Error as e:
-            logging.error(f"Failed to update outcome display: {e}")
-            self.outcome_text_left.insert(tk.END, f"Error: {e}")
-            self.outcome_text_right.insert(tk.END, f"Error: {e}")
+        for i, (name, outcome) in enumerate(current_outcomes, 1):
+            self.outcome_text_left.insert(tk.END, f"{i}. {name}: {outcome or 'No outcome'}\n")
+        for i, (name, outcome) in enumerate(prev_outcomes, 1):
+            self.outcome_text_right.insert(tk.END, f"{i}. {name}: {outcome or 'No outcome'}\n")
+        
+        self.outcome_text_left.insert(tk.END, f"\nDate: {current_date}")
+        self.outcome_text_right.insert(tk.END, f"\nDate: {prev_date}")
+
+    def outcomes_failed(self, e):
+        logging.error("Failed to update outcome display: %s", e)
+        self.outcome_text_left.delete(1.0, tk.END)
+        self.outcome_text_right.delete(1.0, tk.END)
+        self.outcome_text_left.insert(tk.END, f"Error: {e}")
+        self.outcome_text_right.insert(tk.END, f"Error: {e}")
 
     def prev_day(self):
         self.day_offset -= 1
@@ -1134,94 +1375,170 @@ class WorkTrackerApp:
         self.day_offset += 1
         self.update_outcome_display()
 
-    def update_stopwatch(self):
-        if self.stopwatch_running and self.start_time:
-            if not self.paused:
-                elapsed = int(time.time() - self.start_time + self.paused_time)
-                minutes = elapsed // 60
-                seconds = elapsed % 60
-                time_str = f"Time: {minutes:02d}:{seconds:02d}"
-                self.stopwatch_label.config(text=time_str)
-                if self.overlay:
-                    self.overlay_time.config(text=time_str)
+    def configure_log_columns(self):
+        columns = ["Date"] + self.categories + ["Total"]
+        self.log_tree["columns"] = columns
+        self.log_tree.heading("Date", text="Date")
+        self.log_tree.column("Date", width=100, anchor="center")
+        for cat in self.categories:
+            self.log_tree.heading(cat, text=cat[:10])
+            self.log_tree.column(cat, width=100, anchor="center")
+        self.log_tree.heading("Total", text="Total")
+        self.log_tree.column("Total", width=80, anchor="center")
+
+    def format_log_row(self, date, logs):
+        row_data = [date]
+        total_minutes = 0
+        completed_any = False
+        for cat in self.categories:
+            if cat in logs:
+                time_spent, completed = logs[cat]
+                minutes = time_spent // 60
+                total_minutes += minutes
+                completed_any = completed_any or bool(completed)
+                status = "✓" if completed else "✗"
+                row_data.append(f"{status} ({minutes}m)")
             else:
-                minutes = self.paused_time // 60
-                seconds = self.paused_time % 60
-                time_str = f"Time: {minutes:02d}:{seconds:02d}"
-                self.stopwatch_label.config(text=time_str)
-                if self.overlay:
-                    self.overlay_time.config(text=time_str)
-        self.root.after(1000, self.update_stopwatch)
+                row_data.append("✗ (0m)")
+        row_data.append(f"{total_minutes}m")
+        return row_data, ("Completed" if completed_any else "NotCompleted",)
 
     def update_log_display(self, search_date=None):
+        # Without a search only the newest page of dates is loaded; older
+        # pages are fetched by on_log_scroll as the user scrolls down.
+        limit = None if search_date else LOG_PAGE_SIZE
+        self.reader.cancel("log_page")
+        self.log_loading = False
+        self.log_grid_pending = True
+        self.reader.submit("log_grid",
+                           lambda db: (db.logs.categories(), *db.logs.grid(search_date, limit=limit)),
+                           lambda result: self.show_log_grid(search_date, limit, *result),
+                           self.log_grid_failed)
+
+    def show_log_grid(self, search_date, limit, categories, rows, outcomes):
         for row in self.log_tree.get_children():
             self.log_tree.delete(row)
-        self.outcomes.clear()
         self.expanded_rows.clear()
-        
+        self.log_rows.clear()
+        self.log_row_dates.clear()
+        self.cell_summaries.clear()
+        self.log_tooltip.reset()
+        self.log_search_date = search_date
+        self.log_oldest_date = None
+        self.categories = categories
+        logging.debug("Updating log display with categories: %s", self.categories)
+        self.configure_log_columns()
+        self.append_log_rows(rows, outcomes, limit)
+        # Rows patched while this snapshot was being read may be newer than
+        # it, so they are re-applied on top.
+        self.log_grid_pending = False
+        for log_date in self.log_refreshed_dates:
+            self.refresh_log_date(log_date)
+        self.log_refreshed_dates.clear()
+
+    def log_grid_failed(self, e):
+        self.log_grid_pending = False
+        logging.error("Failed to update log display: %s", e)
+        messagebox.showerror("Error", f"Failed to update log display: {e}")
+
+    def append_log_rows(self, rows, outcomes, limit):
+        for date, logs in rows:
+            row_data, tags = self.format_log_row(date, logs)
+            item = self.log_tree.insert("", tk.END, values=row_data, tags=tags)
+            self.expanded_rows[item] = False
+            self.log_rows[date] = item
+            self.log_row_dates[item] = date
+            self.summarize_log_row(date, logs, outcomes)
+        if rows:
+            self.log_oldest_date = rows[-1][0]
+        self.log_exhausted = not limit or len(rows) < limit
+
+    def on_log_scroll(self, first, last):
+        self.log_scrollbar.set(first, last)
+        self.log_tooltip.reset()
+        if float(last) > 0.9 and not self.log_exhausted and not self.log_loading and not self.log_grid_pending:
+            self.log_loading = True
+            before = self.log_oldest_date
+            self.reader.submit("log_page", lambda db: db.logs.grid(before=before, limit=LOG_PAGE_SIZE),
+                               lambda result: self.show_older_log_rows(before, *result),
+                               self.older_log_rows_failed)
+
+    def show_older_log_rows(self, before, rows, outcomes):
+        self.log_loading = False
+        if before != self.log_oldest_date:
+            return
+        self.append_log_rows(rows, outcomes, LOG_PAGE_SIZE)
+        logging.debug("Loaded %s older log dates before %s", len(rows), before)
+
+    def older_log_rows_failed(self, e):
+        self.log_loading = False
+        logging.error("Failed to load older log rows: %s", e)
+
+    def refresh_log_date(self, log_date):
+        # Re-aggregates a single date and patches its row in place instead of
+        # rebuilding the whole grid.
+        if self.log_grid_pending:
+            self.log_refreshed_dates.add(log_date)
+        if self.log_search_date and self.log_search_date != log_date:
+            return
         try:
-            cursor.execute("SELECT name FROM categories ORDER BY name")
-            self.categories = [row[0] for row in cursor.fetchall()]
-            logging.info(f"Updating log display with categories: {self.categories}")
-            
-            columns = ["Date"] + self.categories + ["Total"]
-            self.log_tree["columns"] = columns
-            self.log_tree.heading("Date", text="Date")
-            self.log_tree.column("Date", width=100, anchor="center")
-            for cat in self.categories:
-                self.log_tree.heading(cat, text=cat[:10])
-                self.log_tree.column(cat, width=100, anchor="center")
-            self.log_tree.heading("Total", text="Total")
-            self.log_tree.column("Total", width=80, anchor="center")
-            
-            date_clause = "WHERE l.date = ?" if search_date else ""
-            params = [search_date] if search_date else []
-            cursor.execute(f"SELECT DISTINCT date FROM logs {date_clause} ORDER BY date DESC", params)
-            dates = [row[0] for row in cursor.fetchall()]
-            
-            for date in dates:
-                cursor.execute("""
-                    SELECT c.name, SUM(l.time_spent), MAX(l.completed)
-                    FROM logs l
-                    JOIN categories c ON l.name = c.name
-                    WHERE l.date = ?
-                    GROUP BY c.name
-                """, (date,))
-                logs = {row[0]: (row[1], row[2]) for row in cursor.fetchall()}
-                
-                cursor.execute("""
-                    SELECT c.name, l.outcome
-                    FROM logs l
-                    JOIN categories c ON l.name = c.name
-                    WHERE l.date = ?
-                    ORDER BY l.id
-                """, (date,))
-                for name, outcome in cursor.fetchall():
-                    self.outcomes[(date, name)] = outcome or "No outcome"
-                
-                row_data = [date]
-                total_minutes = 0
-                for cat in self.categories:
-                    if cat in logs:
-                        time_spent, completed = logs[cat]
-                        minutes = time_spent // 60
-                        total_minutes += minutes
-                        status = "✓" if completed else "✗"
-                        row_data.append(f"{status} ({minutes}m)")
-                    else:
-                        row_data.append("✗ (0m)")
-                row_data.append(f"{total_minutes}m")
-                item = self.log_tree.insert("", tk.END, values=row_data)
-                self.log_tree.item(item, tags=("Completed" if any(logs.get(cat, (0, 0))[1] for cat in logs) else "NotCompleted",))
-                self.expanded_rows[item] = False
+            rows, outcomes = self.db.logs.grid(log_date)
         except sqlite3.Error as e:
-            logging.error(f"Failed to update log display: {e}")
+            logging.error("Failed to refresh log row for %s: %s", log_date, e)
             messagebox.showerror("Error", f"Failed to update log display: {e}")
+            return
+        item = self.log_rows.get(log_date)
+        if not rows or (not item and not self.log_exhausted and log_date < self.log_oldest_date):
+            # Dates beyond the loaded pages are picked up when scrolled to.
+            return
+        self.summarize_log_row(log_date, rows[0][1], outcomes)
+        self.log_tooltip.reset()
+        row_data, tags = self.format_log_row(log_date, rows[0][1])
+        if item:
+            for child in self.log_tree.get_children(item):
+                self.log_tree.delete(child)
+            self.log_tree.item(item, values=row_data, tags=tags)
+        else:
+            index = 0
+            for index, other in enumerate(self.log_tree.get_children()):
+                if str(self.log_tree.item(other)["values"][0]) < log_date:
+                    break
+            else:
+                index = len(self.log_rows)
+            item = self.log_tree.insert("", index, values=row_data, tags=tags)
+            self.log_rows[log_date] = item
+            self.log_row_dates[item] = log_date
+        self.expanded_rows[item] = False
+
+    def rename_log_column(self, old_name, new_name):
+        # A rename that keeps the category's sort position only needs new
+        # column ids and headings; row values are positional and stay valid.
+        old_categories = self.categories
+        self.categories = self.db.logs.categories()
+        if self.categories != [new_name if cat == old_name else cat for cat in old_categories]:
+            self.update_log_display(self.log_search_date)
+            return
+        self.configure_log_columns()
+        for key in [key for key in self.cell_summaries if key[1] == old_name]:
+            self.cell_summaries[(key[0], new_name)] = self.cell_summaries.pop(key)
 
 if __name__ == "__main__":
+    configure_logging()
+    db_path = get_db_path()
+    db = open_database(db_path)
+    writer = WriteBehind(db_path, DURABILITY)
+    reader = ReadExecutor(db_path)
     root = tk.Tk()
-    app = WorkTrackerApp(root)
+    app = WorkTrackerApp(root, db, writer, reader)
     try:
         root.mainloop()
     finally:
-        conn.close()
\ No newline at end of file
+        # Closing the writer commits everything still queued. A running
+        # timer is saved paused, so neither the next start nor the command
+        # line counts the time the window was closed.
+        app.flush_task_positions()
+        if app.session_timer.active:
+            app.checkpoint_session(app.session_timer.seconds(), False)
+        reader.close()
+        writer.close()
+        db.close()
\ No newline at end of file
@@ -0,0 +1,130 @@
+import itertools
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from storage import Database, DEFAULT_DURABILITY
+
+
+class WriteBehind:
+    # Runs database writes on a worker thread with its own connection.
+    #
+    # submit() takes an operation `op(db)` that uses the worker's Database
+    # repositories. Operations that arrive within `batch_window` seconds of
+    # each other are committed together in one transaction. Passing a `key`
+    # coalesces writes: a pending operation with the same key is dropped and
+    # the new one queued behind everything submitted so far, so only the
+    # latest position/flag/text for a task is written, and never ahead of
+    # a write it was submitted after.
+    #
+    # Results never touch Tk from the worker thread. on_done(result) and
+    # on_error(exc) callbacks are queued and run by drain(), which the UI
+    # calls from its main loop via root.after.
+
+    def __init__(self, path, durability=DEFAULT_DURABILITY, batch_window=0.05):
+        self.path = path
+        self.durability = durability
+        self.batch_window = batch_window
+        self.pending = OrderedDict()
+        self.in_flight = 0
+        self.closing = False
+        self.counter = itertools.count()
+        self.cond = threading.Condition()
+        self.results = queue.SimpleQueue()
+        self.ready = threading.Event()
+        self.startup_error = None
+        self.thread = threading.Thread(target=self.run, name="write-behind", daemon=True)
+        self.thread.start()
+        self.ready.wait()
+        if self.startup_error:
+            raise self.startup_error
+
+    def submit(self, op, on_done=None, on_error=None, key=None):
+        with self.cond:
+            if self.closing:
+                raise RuntimeError("WriteBehind is closed")
+            if key is None:
+                key = ("op", next(self.counter))
+            self.pending.pop(key, None)
+            self.pending[key] = (op, on_done, on_error)
+            self.cond.notify_all()
+
+    def run(self):
+        try:
+            db = Database(self.path, self.durability)
+        except sqlite3.Error as e:
+            self.startup_error = e
+            self.ready.set()
+            return
+        self.ready.set()
+        while True:
+            with self.cond:
+                while not self.pending and not self.closing:
+                    self.cond.wait()
+                if not self.pending:
+                    break
+                closing = self.closing
+            if not closing:
+                # Give a burst of UI events the chance to land in one batch.
+                time.sleep(self.batch_window)
+            with self.cond:
+                batch = list(self.pending.values())
+                self.pending.clear()
+                self.in_flight = len(batch)
+            self.apply(db, batch)
+            with self.cond:
+                self.in_flight = 0
+                self.cond.notify_all()
+        db.close()
+
+    def apply(self, db, batch):
+        results = []
+        try:
+            with db.transaction():
+                for op, on_done, on_error in batch:
+                    results.append((on_done, op(db)))
+        except Exception:
+            # One bad write must not take the rest of the batch with it:
+            # replay each operation in its own transaction to isolate it.
+            for op, on_done, on_error in batch:
+                try:
+                    with db.transaction():
+                        result = op(db)
+                except Exception as e:
+                    logging.error("Background write failed: %s", e)
+                    self.results.put((on_error, e))
+                else:
+                    self.results.put((on_done, result))
+            return
+        logging.debug("Committed %s background writes", len(batch))
+        for on_done, result in results:
+            self.results.put((on_done, result))
+
+    def drain(self):
+        # Runs queued callbacks on the calling (UI) thread.
+        while True:
+            try:
+                callback, value = self.results.get_nowait()
+            except queue.Empty:
+                return
+            if callback:
+                callback(value)
+
+    def flush(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.cond:
+            while self.pending or self.in_flight:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self.cond.wait(remaining)
+        return True
+
+    def close(self):
+        with self.cond:
+            self.closing = True
+            self.cond.notify_all()
+        self.thread.join()